@@ -6,7 +6,6 @@ A Point of Sale system for coffee shops
 import flet as ft
 from config import *
 
-# Import database module to initialize database
 import database_new
 
 # Import page modules
@@ -16,6 +15,9 @@ from pages.dashboard import create_dashboard
 
 def main(page: ft.Page):
     """Main application entry point"""
+
+    # Create tables and default data (no-op after the first call)
+    database_new.init()
     
     # Page configuration
     page.title = "Coffeestry System"
@@ -0,0 +1,43 @@
+import json
+import os
+from functools import lru_cache
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Flet's assets_dir: pre-resized images, built by build_assets.py
+ASSETS_DIR = os.path.join(APP_DIR, "assets")
+MANIFEST_PATH = os.path.join(ASSETS_DIR, "manifest.json")
+# Device pixels per logical pixel to pick images for. Flet doesn't report it, so assume a standard
+# screen; set COFFEESTRY_PIXEL_RATIO=2 on a HiDPI one (the logo then needs its full-size original)
+PIXEL_RATIO = float(os.environ.get("COFFEESTRY_PIXEL_RATIO", "1"))
+
+
+@lru_cache(maxsize=None)
+def load_manifest():
+    """assets/manifest.json, or an empty manifest if the assets were never built"""
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"images": {}}
+
+
+def contain(width, height, box_width, box_height):
+    """The size ImageFit.CONTAIN draws a width x height image at inside a box (never upscaled here)"""
+    scale = min(box_width / width, box_height / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def image_src(name, width, height, ratio=PIXEL_RATIO):
+    """src for source/<name> shown in a width x height box: the smallest pre-resized variant that fills it at ratio.
+
+    Falls back to the full-size original (by absolute path, as relative
+    paths resolve against assets_dir) if no variant is big enough.
+    """
+    image = load_manifest()["images"].get(name)
+    if image is not None:
+        source = image["source"]
+        needed = contain(source["width"], source["height"], width * ratio, height * ratio)
+        for variant in sorted(image["variants"], key=lambda v: v["width"] * v["height"]):
+            if variant["width"] >= needed[0] and variant["height"] >= needed[1]:
+                return variant["file"]
+    return os.path.join(APP_DIR, "source", name)
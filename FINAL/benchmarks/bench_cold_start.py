@@ -0,0 +1,66 @@
+"""
+Benchmark: schema setup cost at application start
+==================================================
+Times database.init_db() with a cold connection pool against a scratch
+database, first when every migration has to run (fresh install) and then
+when the schema is already current (every later start), which should cost
+a single PRAGMA user_version read. Also times a bare `import database` in a
+fresh interpreter, which no longer touches the database at all.
+
+Run with: python benchmarks/bench_cold_start.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import shutil
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import database
+from connection_pool import close_pool
+
+
+def time_init(path):
+    close_pool(path)  # start from a cold pool, like a fresh process
+    start = time.perf_counter()
+    database.init_db()
+    return time.perf_counter() - start
+
+
+def time_import():
+    probe = "import time; s = time.perf_counter(); import database; print(time.perf_counter() - s)"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=APP_DIR, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    temp_dir = tempfile.mkdtemp()
+    original_path = database.DB_PATH
+    try:
+        fresh = []
+        for i in range(runs):
+            database.DB_PATH = os.path.join(temp_dir, f"fresh_{i}.db")
+            fresh.append(time_init(database.DB_PATH))
+
+        database.DB_PATH = os.path.join(temp_dir, "fresh_0.db")
+        current = [time_init(database.DB_PATH) for _ in range(runs)]
+
+        imports = [time_import() for _ in range(min(runs, 10))]
+
+        for label, samples in (("fresh install", fresh), ("schema current", current), ("import only", imports)):
+            samples.sort()
+            print(f"{label:<16} median {samples[len(samples) // 2] * 1000:8.3f} ms   "
+                  f"max {samples[-1] * 1000:8.3f} ms")
+    finally:
+        close_pool(database.DB_PATH)
+        database.DB_PATH = original_path
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
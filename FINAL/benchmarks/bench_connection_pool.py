@@ -0,0 +1,70 @@
+"""
+Benchmark: open/close per call vs pooled connections
+=====================================================
+Runs a typical short database.py style operation (one SELECT by key) many
+times against a scratch database, first opening a fresh sqlite3 connection
+per call (the old get_connection) and then through ConnectionPool.
+
+Run with: python benchmarks/bench_connection_pool.py [iterations]
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import shutil
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_pool import ConnectionPool
+
+
+def setup_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT, category TEXT, price REAL)")
+    conn.executemany("INSERT INTO products (name, category, price) VALUES (?, ?, ?)",
+                     [(f"Product {i}", "Coffee", 100.0 + i) for i in range(200)])
+    conn.commit()
+    conn.close()
+
+
+def run_unpooled(path, iterations):
+    for i in range(iterations):
+        conn = sqlite3.connect(path)
+        conn.execute("SELECT id, name, category, price FROM products WHERE id = ?", (i % 200 + 1,)).fetchone()
+        conn.close()
+
+
+def run_pooled(pool, iterations):
+    for i in range(iterations):
+        conn = pool.acquire()
+        conn.execute("SELECT id, name, category, price FROM products WHERE id = ?", (i % 200 + 1,)).fetchone()
+        conn.close()
+
+
+def timed(label, fn, iterations):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {iterations / elapsed:>12,.0f} ops/sec  ({elapsed:.3f}s)")
+    return elapsed
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, "bench.db")
+        setup_db(path)
+        pool = ConnectionPool(path)
+        before = timed("unpooled", lambda: run_unpooled(path, iterations), iterations)
+        after = timed("pooled", lambda: run_pooled(pool, iterations), iterations)
+        print(f"speedup      {before / after:>12.1f}x")
+        pool.close_all()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
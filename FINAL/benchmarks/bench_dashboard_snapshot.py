@@ -0,0 +1,100 @@
+"""
+Benchmark: superadmin dashboard load
+=====================================
+Seeds a scratch database with 1M orders (spread over the last year) and times
+loading the dashboard data:
+  * the twelve individual analytics calls sa_dashboard() used to make
+  * one get_platform_snapshot() read transaction
+
+Run with: python benchmarks/bench_dashboard_snapshot.py [orders] [repeats]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import shutil
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from connection_pool import close_pool
+
+MENU = [("Espresso", "Coffee", 90.0), ("Latte", "Coffee", 160.0), ("Croissant", "Pastry", 85.0),
+        ("Matcha Latte", "Tea", 160.0), ("Club Sandwich", "Sandwiches", 180.0)]
+SEED_CHUNK = 50000
+
+
+def seed_orders(count, seed=42):
+    rng = random.Random(seed)
+    now = datetime.now()
+    for start in range(0, count, SEED_CHUNK):
+        orders = []
+        for i in range(start, min(start + SEED_CHUNK, count)):
+            items = [{"name": n, "category": c, "price": p, "quantity": rng.randint(1, 3)}
+                     for n, c, p in rng.sample(MENU, rng.randint(1, 3))]
+            orders.append({
+                "customer_name": f"Customer {i}",
+                "order_type": rng.choice(["Dine in", "Take out"]),
+                "total": sum(item["price"] * item["quantity"] for item in items),
+                "items": items,
+                "business_owner_id": rng.randint(1, 20),
+                "status": rng.choice(["pending", "confirmed", "completed", "cancelled"]),
+                "payment_status": rng.choice(["paid", "paid", "paid", "unpaid"]),
+                "order_date": (now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))).strftime("%Y-%m-%d %H:%M:%S"),
+            })
+        database.save_orders(orders)
+
+
+def individual_calls():
+    database.get_total_business_owners()
+    database.get_total_customers()
+    database.get_total_sales()
+    database.get_total_orders()
+    database.get_total_products()
+    database.get_sales_by_date(7)
+    database.get_customers_by_date(7)
+    database.get_orders_by_date(7)
+    database.get_top_business_owners(5)
+    database.get_order_status_distribution()
+    database.get_monthly_revenue(6)
+    database.get_top_selling_products(5)
+
+
+def snapshot():
+    database.get_platform_snapshot(days=7, months=6, top_n=5)
+
+
+def timed(label, fn, repeats):
+    fn()  # warm the pools and page cache
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<28} {elapsed * 1000:>8.2f} ms per dashboard load")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    temp_dir = tempfile.mkdtemp()
+    original_path = database.DB_PATH
+    try:
+        database.DB_PATH = os.path.join(temp_dir, "dashboard.db")
+        database.init()
+        start = time.perf_counter()
+        seed_orders(count)
+        print(f"seeded {count:,} orders in {time.perf_counter() - start:.1f}s")
+
+        timed("12 individual calls", individual_calls, repeats)
+        timed("get_platform_snapshot()", snapshot, repeats)
+    finally:
+        close_pool(database.DB_PATH)
+        database.DB_PATH = original_path
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: SUM over REAL pesos vs INTEGER centavos
+===================================================
+Builds two copies of an orders table in a scratch database, one with totals
+as REAL pesos (the schema before migration 7) and one as INTEGER centavos,
+and times the aggregates the analytics run:
+  * SUM(total) over every paid order
+  * SUM(total) per business owner
+  * SUM(total) per day
+Also reports each table's size on disk (integers of a few bytes vs 8-byte
+floats) and how far the REAL sum drifts from the exact amount.
+
+Run with: python benchmarks/bench_money_sums.py [orders] [repeats]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import shutil
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from money import from_cents
+
+QUERIES = [
+    ("total", "SELECT SUM(total) FROM {table} WHERE payment_status = 'paid'"),
+    ("per owner", "SELECT business_owner_id, SUM(total) FROM {table} WHERE payment_status = 'paid' GROUP BY business_owner_id"),
+    ("per day", "SELECT DATE(order_date), SUM(total) FROM {table} WHERE payment_status = 'paid' GROUP BY 1"),
+]
+
+
+def build(conn, count, seed=42):
+    rng = random.Random(seed)
+    now = datetime.now()
+    rows = []
+    for _ in range(count):
+        cents = rng.randint(50, 250) * 5 + rng.choice((0, 25, 50, 75, 99))
+        rows.append((cents, rng.randint(1, 20), rng.choice(["paid", "paid", "paid", "unpaid"]),
+                     (now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))).strftime("%Y-%m-%d %H:%M:%S")))
+    for table, money_type in (("orders_real", "REAL"), ("orders_int", "INTEGER")):
+        conn.execute(f"""
+            CREATE TABLE {table} (
+                id INTEGER PRIMARY KEY, total {money_type} NOT NULL, business_owner_id INTEGER,
+                payment_status TEXT, order_date TIMESTAMP
+            )
+        """)
+    conn.executemany("INSERT INTO orders_real (total, business_owner_id, payment_status, order_date) VALUES (?, ?, ?, ?)",
+                     [(from_cents(cents), *rest) for cents, *rest in rows])
+    conn.executemany("INSERT INTO orders_int (total, business_owner_id, payment_status, order_date) VALUES (?, ?, ?, ?)",
+                     rows)
+    conn.commit()
+    return sum(cents for cents, _, status, _ in rows if status == "paid")
+
+
+def table_sizes(conn):
+    """{table: bytes} from the dbstat virtual table, or {} if SQLite was built without it"""
+    try:
+        return dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+    except sqlite3.OperationalError:
+        return {}
+
+
+def timed(conn, sql, repeats):
+    conn.execute(sql).fetchall()  # warm the page cache
+    start = time.perf_counter()
+    for _ in range(repeats):
+        conn.execute(sql).fetchall()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    temp_dir = tempfile.mkdtemp()
+    try:
+        conn = sqlite3.connect(os.path.join(temp_dir, "money.db"))
+        print(f"Building {count} orders...")
+        exact_cents = build(conn, count)
+
+        print(f"{'query':<12} {'REAL ms':>10} {'INTEGER ms':>12} {'speedup':>9}")
+        for label, sql in QUERIES:
+            real_ms = timed(conn, sql.format(table="orders_real"), repeats)
+            int_ms = timed(conn, sql.format(table="orders_int"), repeats)
+            print(f"{label:<12} {real_ms:>10.2f} {int_ms:>12.2f} {real_ms / int_ms:>8.2f}x")
+
+        sizes = table_sizes(conn)
+        if sizes:
+            print(f"table size:  REAL {sizes['orders_real'] / 2**20:.1f} MiB, INTEGER {sizes['orders_int'] / 2**20:.1f} MiB")
+
+        real_sum = conn.execute(QUERIES[0][1].format(table="orders_real")).fetchone()[0]
+        int_sum = conn.execute(QUERIES[0][1].format(table="orders_int")).fetchone()[0]
+        print(f"exact paid total: {from_cents(exact_cents):,.2f}")
+        print(f"REAL SUM drift:   {real_sum - from_cents(exact_cents):+.10f} pesos")
+        print(f"INTEGER SUM:      {'exact' if int_sum == exact_cents else 'WRONG'}")
+        conn.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
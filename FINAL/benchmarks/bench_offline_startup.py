@@ -0,0 +1,77 @@
+"""
+Benchmark: app startup with the network disabled
+================================================
+Starts fresh interpreters with every socket connect and DNS lookup made to
+fail, then does what main() does before first paint, flet aside: import
+main.py's startup modules, resolve the home screen logo and read it.
+Reports the median time, whether anything reached for the network, and
+how much image data the logo costs at each pixel ratio before and after
+the asset pipeline (bytes on disk and pixels to decode).
+
+Run with: python benchmarks/bench_offline_startup.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import assets
+from build_assets import SCALES
+from test_assets import png_size
+from test_import_budget import main_startup_imports
+
+PROBE = """
+import socket, sys, time
+attempts = []
+def offline(*args, **kwargs):
+    attempts.append(args)
+    raise OSError("network disabled")
+socket.socket.connect = socket.create_connection = socket.getaddrinfo = offline
+
+start = time.perf_counter()
+for module in sys.argv[1:]:
+    __import__(module)
+import assets
+src = assets.image_src("logo.png", 400, 300)
+with open(src if src.startswith("/") else f"{assets.ASSETS_DIR}/{src}", "rb") as f:
+    f.read()
+print(time.perf_counter() - start, len(attempts))
+"""
+
+
+def image_cost(src):
+    path = src if os.path.isabs(src) else os.path.join(assets.ASSETS_DIR, src)
+    width, height = png_size(path)
+    return os.path.getsize(path), width * height
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    modules = main_startup_imports()
+    samples, attempts = [], 0
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", PROBE, *modules], cwd=APP_DIR,
+                                capture_output=True, text=True, check=True)
+        elapsed, tried = result.stdout.split()
+        samples.append(float(elapsed))
+        attempts += int(tried)
+    samples.sort()
+    print(f"offline startup (imports, logo): median {samples[len(samples) // 2] * 1000:.1f} ms, "
+          f"max {samples[-1] * 1000:.1f} ms over {runs} runs")
+    print(f"network attempts: {attempts}")
+
+    original = image_cost(os.path.join(APP_DIR, "source", "logo.png"))
+    print(f"{'logo':<30} {'bytes':>8} {'pixels':>8}")
+    print(f"{'source/logo.png':<30} {original[0]:>8} {original[1]:>8}")
+    for ratio in SCALES:
+        src = assets.image_src("logo.png", 400, 300, ratio=ratio)
+        variant = image_cost(src)
+        print(f"{f'x{ratio}: {os.path.relpath(src, APP_DIR) if os.path.isabs(src) else src}':<30} "
+              f"{variant[0]:>8} {variant[1]:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: order persistence throughput
+========================================
+Writes orders with 1-4 line items into a scratch database:
+  * per-order save_order() calls (one BEGIN IMMEDIATE transaction each)
+  * the bulk save_orders() import API, 100k orders by default
+
+Reports orders/sec and total rows/sec (order headers + order_items).
+
+Run with: python benchmarks/bench_order_writes.py [bulk_orders] [single_orders]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import shutil
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from connection_pool import close_pool
+
+MENU = [("Espresso", "Coffee", 90.0), ("Latte", "Coffee", 160.0), ("Croissant", "Pastry", 85.0),
+        ("Matcha Latte", "Tea", 160.0), ("Club Sandwich", "Sandwiches", 180.0)]
+
+
+def make_orders(count, seed=42):
+    rng = random.Random(seed)
+    orders = []
+    for i in range(count):
+        items = [{"name": n, "category": c, "price": p, "quantity": rng.randint(1, 3)}
+                 for n, c, p in rng.sample(MENU, rng.randint(1, 4))]
+        orders.append({
+            "customer_name": f"Customer {i}",
+            "order_type": rng.choice(["Dine in", "Take out"]),
+            "total": sum(item["price"] * item["quantity"] for item in items),
+            "items": items,
+            "business_owner_id": rng.randint(1, 20),
+            "order_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00",
+        })
+    return orders
+
+
+def report(label, orders, elapsed):
+    rows = len(orders) + sum(len(o["items"]) for o in orders)
+    print(f"{label:<22} {len(orders):>8} orders  {len(orders) / elapsed:>10,.0f} orders/sec  "
+          f"{rows / elapsed:>10,.0f} rows/sec")
+
+
+def main():
+    bulk_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    single_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    temp_dir = tempfile.mkdtemp()
+    original_path = database.DB_PATH
+    try:
+        database.DB_PATH = os.path.join(temp_dir, "orders.db")
+        database.init()
+
+        orders = make_orders(single_count)
+        start = time.perf_counter()
+        for o in orders:
+            database.save_order(o["customer_name"], o["order_type"], o["total"], o["items"],
+                                business_owner_id=o["business_owner_id"])
+        report("save_order (each)", orders, time.perf_counter() - start)
+
+        orders = make_orders(bulk_count, seed=7)
+        start = time.perf_counter()
+        database.save_orders(orders)
+        report("save_orders (bulk)", orders, time.perf_counter() - start)
+    finally:
+        close_pool(database.DB_PATH)
+        database.DB_PATH = original_path
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: product DataTable re-rendering
+==========================================
+Builds POS-style product rows (name, category badge, price, qty stepper and
+add-to-cart button) for a 2,000-item menu and replays a series of search
+filters two ways:
+  * rebuilding every matching row on each filter (the old build_product_rows)
+  * KeyedRowCache.arrange(): rows built once, filters toggle visibility and
+    move matches to the top
+
+For each filter it reports the controls created and an estimate of the bytes
+Flet sends. New or moved rows count as "add" commands carrying every
+attribute of their control subtree (the JSON Flet serializes). Rows that only
+change visibility count as a "set" command. Requires flet.
+
+Run with: python benchmarks/bench_product_rows.py [products]
+"""
+
+import difflib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import flet as ft
+
+from bench_product_search import make_catalog
+from product_search import ProductSearchIndex
+from row_cache import KeyedRowCache
+
+FILTERS = ["", "c", "ca", "car", "caramel", "caramel l", "caramel latte", "caramel", "", "mocha", ""]
+
+
+def build_row(product):
+    qty_text = ft.Text(value="1", size=14, width=35, text_align=ft.TextAlign.CENTER)
+    return ft.DataRow(cells=[
+        ft.DataCell(ft.Text(product[1], weight=ft.FontWeight.W_500)),
+        ft.DataCell(ft.Container(content=ft.Text(product[2], size=12), bgcolor="#8D6E63",
+                                 padding=ft.padding.symmetric(horizontal=10, vertical=3), border_radius=12)),
+        ft.DataCell(ft.Text(f"₱{product[3]:.2f}", weight=ft.FontWeight.W_500)),
+        ft.DataCell(ft.Row([
+            ft.IconButton(ft.Icons.REMOVE_CIRCLE_OUTLINE, on_click=lambda e: None, icon_size=20),
+            qty_text,
+            ft.IconButton(ft.Icons.ADD_CIRCLE_OUTLINE, on_click=lambda e: None, icon_size=20),
+            ft.Container(width=10),
+            ft.Container(content=ft.IconButton(ft.Icons.ADD_SHOPPING_CART_ROUNDED, icon_size=22,
+                                               on_click=lambda e: None, tooltip="Add to Cart"),
+                         bgcolor="#4CAF50", border_radius=8, padding=2),
+        ], alignment=ft.MainAxisAlignment.CENTER, spacing=0)),
+    ])
+
+
+def subtree(control):
+    yield control
+    for child in control._get_children():
+        yield from subtree(child)
+
+
+def add_bytes(control):
+    """Approximate JSON size of the "add" commands for a control subtree"""
+    total = 0
+    for c in subtree(control):
+        c.before_update()
+        attrs = {name: value[0] if isinstance(value, tuple) else value
+                 for name, value in getattr(c, "_Control__attrs", {}).items()}
+        total += len(json.dumps({"t": c._get_control_name(), "a": attrs}, default=str))
+    return total
+
+
+def set_visible_bytes(row):
+    return len(json.dumps({"n": "set", "v": [str(id(row))], "a": {"visible": str(bool(row.visible)).lower()}}))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    catalog = make_catalog(count)
+    index = ProductSearchIndex(catalog)
+    row_size = {}
+
+    def sized(row):
+        if id(row) not in row_size:
+            row_size[id(row)] = (sum(1 for _ in subtree(row)), add_bytes(row))
+        return row_size[id(row)]
+
+    print(f"{'filter':<16} {'hits':>5} | {'rebuild: controls':>17} {'bytes':>10} | {'cache: controls':>15} {'bytes':>10}")
+    cache = KeyedRowCache(build_row, key=lambda product: product)
+    previous = []
+    visibility = {}
+    seen = set()
+    totals = [0, 0, 0, 0]
+    for query in FILTERS:
+        matches = index.search(query)
+
+        rebuilt = [build_row(product) for product in matches]
+        rebuild_controls = sum(sized(row)[0] for row in rebuilt)
+        rebuild_bytes = sum(sized(row)[1] for row in rebuilt)
+
+        rows = cache.arrange(catalog, matches)
+        cache_controls = sum(sized(row)[0] for row in rows if id(row) not in seen)
+        seen.update(id(row) for row in rows)
+        # Flet diffs the child list: rows in inserted/replaced runs are re-sent in full
+        ops = difflib.SequenceMatcher(None, [id(r) for r in previous], [id(r) for r in rows], autojunk=False)
+        resent = {id(rows[j]) for tag, _, _, j1, j2 in ops.get_opcodes() if tag in ("insert", "replace")
+                  for j in range(j1, j2)}
+        cache_bytes = sum(sized(row)[1] for row in rows if id(row) in resent)
+        cache_bytes += sum(set_visible_bytes(row) for row in rows
+                           if id(row) not in resent and visibility.get(id(row)) != row.visible)
+        visibility = {id(row): row.visible for row in rows}
+        previous = rows
+
+        totals = [totals[0] + rebuild_controls, totals[1] + rebuild_bytes, totals[2] + cache_controls, totals[3] + cache_bytes]
+        print(f"{query!r:<16} {len(matches):>5} | {rebuild_controls:>17,} {rebuild_bytes:>10,} | "
+              f"{cache_controls:>15,} {cache_bytes:>10,}")
+    print(f"{'total':<16} {'':>5} | {totals[0]:>17,} {totals[1]:>10,} | {totals[2]:>15,} {totals[3]:>10,}")
+
+
+if __name__ == "__main__":
+    main()
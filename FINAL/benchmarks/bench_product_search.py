@@ -0,0 +1,78 @@
+"""
+Benchmark: product search
+==========================
+Builds a synthetic catalog (10k products by default) and compares the old
+linear `query in name.lower()` filter with ProductSearchIndex lookups:
+prefix, whole word, multi-word, one-typo and category-scoped queries, plus
+the cost of an incremental update.
+
+Run with: python benchmarks/bench_product_search.py [products] [repeats]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from product_search import ProductSearchIndex
+
+ADJECTIVES = ["Iced", "Hot", "Salted", "Vanilla", "Caramel", "Hazelnut", "Spanish", "Dark", "Honey",
+              "Toasted", "Coconut", "Ube", "Pandan", "Strawberry", "Mint", "Cinnamon", "Brown Sugar"]
+BASES = ["Latte", "Mocha", "Cappuccino", "Americano", "Cold Brew", "Macchiato", "Frappe", "Matcha",
+         "Chai", "Smoothie", "Cheesecake", "Croissant", "Muffin", "Brownie", "Sandwich", "Waffle"]
+CATEGORIES = ["Coffee", "Tea", "Cold Drinks", "Smoothies", "Pastries", "Sandwiches", "Desserts", "Specialty"]
+QUERIES = [
+    ("prefix", "carame", None),
+    ("word", "latte", None),
+    ("two words", "iced mocha", None),
+    ("typo", "capuccino", None),
+    ("category", "brown", "Desserts"),
+]
+
+
+def make_catalog(count, seed=42):
+    rng = random.Random(seed)
+    return [(i, f"{rng.choice(ADJECTIVES)} {rng.choice(BASES)} {i}", rng.choice(CATEGORIES),
+             float(rng.randint(60, 250))) for i in range(1, count + 1)]
+
+
+def linear_filter(catalog, query, category):
+    """The filter_products loop this index replaces"""
+    query = query.lower()
+    return [p for p in catalog if query in p[1].lower() and (category is None or p[2] == category)]
+
+
+def per_call_us(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    catalog = make_catalog(count)
+
+    start = time.perf_counter()
+    index = ProductSearchIndex(catalog)
+    print(f"built index over {count:,} products in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"{'query':<12} {'linear scan':>14} {'index':>12} {'index top 20':>14} {'hits':>7}")
+    for label, query, category in QUERIES:
+        linear = per_call_us(lambda: linear_filter(catalog, query, category), repeats)
+        full = per_call_us(lambda: index.search(query, category), repeats)
+        top = per_call_us(lambda: index.search(query, category, limit=20), repeats)
+        hits = len(index.search(query, category))
+        print(f"{label:<12} {linear:>11.1f} µs {full:>9.1f} µs {top:>11.1f} µs {hits:>7}")
+
+    product = catalog[count // 2]
+    renamed = (product[0], "Hojicha Latte", product[2], product[3])
+    update = per_call_us(lambda: (index.update(renamed), index.update(product)), repeats) / 2
+    print(f"incremental update: {update:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
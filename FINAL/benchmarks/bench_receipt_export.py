@@ -0,0 +1,109 @@
+"""
+Benchmark: bulk receipt export for a date range
+===============================================
+Seeds a scratch database with one owner's orders and exports a year of
+receipts, reporting receipts/sec and the exporting process's peak traced
+memory (tracemalloc) for:
+  * streaming the orders out of iter_orders_for_receipts() as Receipts
+  * a ZIP export with a stub renderer (~3 KB per receipt): the fetch, pickle
+    and archive pipeline on its own, in-process and with a process pool
+  * the real ZIP and single-PDF exports, if reportlab is installed
+Peak memory should stay roughly the same whatever the order count.
+
+Run with: python benchmarks/bench_receipt_export.py [orders] [processes]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from connection_pool import close_pool
+from receipts import receipt_from_order, export_receipts_zip, export_receipts_pdf
+
+try:
+    import reportlab
+except ImportError:
+    reportlab = None
+
+MENU = [("Espresso", "Coffee", 90.0), ("Latte", "Coffee", 160.0), ("Croissant", "Pastry", 85.0),
+        ("Matcha Latte", "Tea", 160.0), ("Club Sandwich", "Sandwiches", 180.0)]
+
+
+def make_orders(count, seed=42):
+    rng = random.Random(seed)
+    for i in range(count):
+        items = [{"name": n, "category": c, "price": p, "quantity": rng.randint(1, 3)}
+                 for n, c, p in rng.sample(MENU, rng.randint(1, 4))]
+        yield {
+            "customer_name": f"Customer {i}",
+            "order_type": rng.choice(["Dine in", "Take out"]),
+            "total": sum(item["price"] * item["quantity"] for item in items),
+            "items": items,
+            "business_owner_id": 1,
+            "order_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(8, 20):02d}:00:00",
+        }
+
+
+def stub_render(receipt):
+    """About the size of a receipt PDF, without ReportLab"""
+    return (repr(receipt) * 8)[:3000].encode()
+
+
+def receipts():
+    return (receipt_from_order(order, items)
+            for order, items in database.iter_orders_for_receipts(1, "2025-01-01", "2025-12-31"))
+
+
+def measure(label, run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<28} {count:>8} {count / elapsed:>12,.0f} {peak / 2**20:>10.1f}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 2)
+    temp_dir = tempfile.mkdtemp()
+    original_path = database.DB_PATH
+    database.DB_PATH = os.path.join(temp_dir, "export.db")
+    try:
+        print(f"Seeding {count} orders...")
+        database.save_orders(make_orders(count))
+        out = lambda name: os.path.join(temp_dir, name)
+
+        runs = [
+            ("stream receipts", lambda: sum(1 for _ in receipts())),
+            ("zip, stub, in-process", lambda: export_receipts_zip(receipts(), out("stub0.zip"), 0, stub_render)),
+            (f"zip, stub, {processes} processes",
+             lambda: export_receipts_zip(receipts(), out("stub.zip"), processes, stub_render)),
+        ]
+        if reportlab is not None:
+            runs += [
+                (f"zip, PDF, {processes} processes", lambda: export_receipts_zip(receipts(), out("pdf.zip"), processes)),
+                ("one PDF", lambda: export_receipts_pdf(receipts(), out("all.pdf"))),
+            ]
+        else:
+            print("reportlab is not installed: skipping the real PDF exports")
+
+        print(f"{'export':<28} {'receipts':>8} {'receipts/s':>12} {'peak MiB':>10}")
+        for label, run in runs:
+            measure(label, run)
+    finally:
+        close_pool(database.DB_PATH)
+        database.DB_PATH = original_path
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
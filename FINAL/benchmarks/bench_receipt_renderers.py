@@ -0,0 +1,81 @@
+"""
+Benchmark: receipt renderers and printer sinks
+==============================================
+Renders the same receipts with every renderer in receipts.RENDERERS and
+reports microseconds per receipt, receipts/sec and bytes per receipt (the
+PDF renderer only if reportlab is installed). Then sends ESC/POS receipts
+through each printer sink: a file per receipt, a spool directory, and a
+raw socket to a local FakePrinter.
+
+Run with: python benchmarks/bench_receipt_renderers.py [receipts] [items_per_receipt]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from printers import FileSink, SpoolSink, SocketSink, FakePrinter
+from receipts import Receipt, RENDERERS, get_renderer, receipt_filename
+
+MENU = [("Espresso", 90.0), ("Latte", 160.0), ("Caramel Macchiato", 175.5), ("Croissant", 85.0),
+        ("Club Sandwich", 180.0), ("Matcha Latte", 160.0)]
+
+
+def make_receipts(count, items):
+    lines = tuple({"name": name, "category": "Menu", "price": price, "quantity": 1 + i % 3}
+                  for i, (name, price) in enumerate((MENU * items)[:items]))
+    total = sum(line["price"] * line["quantity"] for line in lines)
+    return [Receipt(i, f"Customer {i}", "Dine in", "Cash", total, lines, "2025-12-05 22:40:25")
+            for i in range(1, count + 1)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    items = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    batch = make_receipts(count, items)
+
+    print(f"{count} receipts, {items} items each")
+    print(f"{'renderer':<10} {'us/receipt':>11} {'receipts/s':>12} {'bytes':>8}")
+    for name in RENDERERS:
+        try:
+            renderer = get_renderer(name)
+            renderer.render(batch[0])  # warm up (imports, cached styles)
+        except ImportError as e:
+            print(f"{name:<10} skipped: {e}")
+            continue
+        runs = batch if name != "pdf" else batch[:max(1, count // 20)]
+        start = time.perf_counter()
+        sizes = [len(renderer.render(receipt)) for receipt in runs]
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} {elapsed / len(runs) * 1e6:>11.1f} {len(runs) / elapsed:>12,.0f} "
+              f"{sum(sizes) // len(sizes):>8}")
+
+    renderer = get_renderer("escpos")
+    temp_dir = tempfile.mkdtemp()
+    printer = FakePrinter().start()
+    try:
+        sinks = [
+            ("file", FileSink(os.path.join(temp_dir, "files"))),
+            ("spool", SpoolSink(os.path.join(temp_dir, "spool"))),
+            ("socket", SocketSink(printer.host, printer.port)),
+        ]
+        print(f"\n{'escpos to':<10} {'us/receipt':>11} {'receipts/s':>12}")
+        for name, sink in sinks:
+            start = time.perf_counter()
+            for receipt in batch:
+                sink.send(renderer.render(receipt), receipt_filename(receipt.order_id, renderer.extension))
+            if name == "socket":
+                printer.wait_for(count, timeout=60)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<10} {elapsed / count * 1e6:>11.1f} {count / elapsed:>12,.0f}")
+    finally:
+        printer.stop()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
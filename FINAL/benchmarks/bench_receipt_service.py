@@ -0,0 +1,131 @@
+"""
+Benchmark: receipt PDFs on the UI thread vs the background ReceiptService
+========================================================================
+First queues a burst of receipts on ReceiptService with a stub renderer
+(writes a few bytes), with worker threads and with a process pool, and
+reports the service's own overhead: how fast submit() queues jobs (how
+long the UI thread is blocked) and how fast the on_done callbacks come back
+(with a process pool, that includes spawning its processes).
+
+Then, if reportlab is installed, renders the burst as PDFs four ways and
+reports how long the caller is blocked and how long until every PDF is on disk:
+  * inline, rebuilding the styles for every receipt (the old save handler)
+  * inline, with the cached styles
+  * ReceiptService with worker threads
+  * ReceiptService with worker threads handing off to a process pool
+
+Run with: python benchmarks/bench_receipt_service.py [receipts] [processes]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import receipts
+from receipts import Receipt, ReceiptService, render_pdf
+
+try:
+    import reportlab
+except ImportError:
+    reportlab = None
+
+ITEMS = tuple(
+    {"name": name, "category": "Coffee", "price": price, "quantity": qty}
+    for name, price, qty in [("Latte", 160.0, 2), ("Americano", 120.0, 1), ("Mocha", 175.5, 3),
+                             ("Croissant", 95.0, 2), ("Cheesecake", 145.25, 1)]
+)
+
+
+def make_receipts(count):
+    return [Receipt(i, f"Customer {i}", "Dine in", "Cash", 1234.75, ITEMS, "2025-12-05 22:40:25")
+            for i in range(1, count + 1)]
+
+
+def stub_render(receipt, filepath):
+    """Stand-in renderer (module level so a process pool can pickle it)"""
+    with open(filepath, "w") as f:
+        f.write(f"receipt {receipt.order_id}")
+    return filepath
+
+
+def run_stub(batch, folder, workers, processes):
+    """(seconds in submit(), seconds until the last on_done callback) for the burst"""
+    service = ReceiptService(render=stub_render, workers=workers, processes=processes)
+    done = []
+    start = time.perf_counter()
+    futures = [service.submit(receipt, folder, on_done=lambda future: done.append(time.perf_counter()),
+                              filename=f"{receipt.order_id}.txt")
+               for receipt in batch]
+    queued = time.perf_counter() - start
+    for future in futures:
+        future.result()
+    service.close()
+    assert len(done) == len(batch)
+    return queued, max(done) - start
+
+
+def run_inline(batch, folder, cached):
+    start = time.perf_counter()
+    for receipt in batch:
+        if not cached:
+            receipts._pdf_kit.cache_clear()
+        render_pdf(receipt, os.path.join(folder, f"{receipt.order_id}.pdf"))
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def run_service(batch, folder, workers, processes):
+    service = ReceiptService(workers=workers, processes=processes)
+    start = time.perf_counter()
+    futures = [service.submit(receipt, folder, filename=f"{receipt.order_id}.pdf") for receipt in batch]
+    blocked = time.perf_counter() - start
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    service.close()
+    return blocked, elapsed
+
+
+def in_scratch_folder(run):
+    folder = tempfile.mkdtemp()
+    try:
+        return run(folder)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 2)
+    batch = make_receipts(count)
+
+    print(f"{count} receipts, stub renderer")
+    print(f"{'mode':<30} {'UI blocked ms':>14} {'queued/s':>11} {'callbacks/s':>12}")
+    for label, workers, procs in [("service, 2 threads", 2, 0), (f"service, {processes} processes", processes, processes)]:
+        queued, called_back = in_scratch_folder(lambda folder: run_stub(batch, folder, workers, procs))
+        print(f"{label:<30} {queued * 1000:>14.1f} {count / queued:>11,.0f} {count / called_back:>12,.0f}")
+
+    if reportlab is None:
+        print("reportlab is not installed: skipping the PDF renders")
+        return
+    render_pdf(batch[0], os.path.join(tempfile.gettempdir(), "warmup_receipt.pdf"))  # import reportlab once
+
+    runs = [
+        ("inline, styles per receipt", lambda folder: run_inline(batch, folder, cached=False)),
+        ("inline, cached styles", lambda folder: run_inline(batch, folder, cached=True)),
+        ("service, 2 threads", lambda folder: run_service(batch, folder, 2, 0)),
+        (f"service, {processes} processes", lambda folder: run_service(batch, folder, processes, processes)),
+    ]
+    print(f"\n{count} receipts, PDF")
+    print(f"{'mode':<30} {'UI blocked ms':>14} {'all done s':>11} {'receipts/s':>11}")
+    for label, run in runs:
+        blocked, elapsed = in_scratch_folder(run)
+        print(f"{label:<30} {blocked * 1000:>14.1f} {elapsed:>11.2f} {count / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
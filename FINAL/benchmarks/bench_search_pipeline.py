@@ -0,0 +1,63 @@
+"""
+Benchmark: search-as-you-type on the POS product grid
+======================================================
+Replays typing "caramel latte" (one keystroke every 80 ms by default) against
+a 10k-product ProductSearchIndex and compares:
+  * searching and re-rendering on every keystroke (the old on_change wiring)
+  * DebouncedSearch: coalesced keystrokes, stale results dropped, renders
+    skipped when the matching products did not change
+
+Rendering is simulated by building the row dicts the DataTable is fed with.
+Reports searches, renders and keystroke-to-screen latency.
+
+Run with: python benchmarks/bench_search_pipeline.py [products] [ms_per_keystroke]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_product_search import make_catalog
+from product_search import ProductSearchIndex
+from search_pipeline import DebouncedSearch
+
+TYPED = "caramel latte"
+
+
+def render(matches):
+    return [{"id": p[0], "name": p[1], "category": p[2], "price": p[3]} for p in matches]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    gap = (int(sys.argv[2]) if len(sys.argv) > 2 else 80) / 1000
+    index = ProductSearchIndex(make_catalog(count))
+    queries = [TYPED[:i] for i in range(1, len(TYPED) + 1)]
+
+    renders = 0
+    latencies = []
+    for query in queries:
+        pressed = time.perf_counter()
+        render(index.search(query))
+        renders += 1
+        latencies.append(time.perf_counter() - pressed)
+        time.sleep(max(0.0, gap - latencies[-1]))
+    latencies.sort()
+    print(f"{'every keystroke':<18} searches={len(queries):>3} renders={renders:>3}  "
+          f"p50={latencies[len(latencies) // 2] * 1000:6.2f} ms  max={latencies[-1] * 1000:6.2f} ms")
+
+    search = DebouncedSearch(index.search, render, key=lambda matches: tuple(p[0] for p in matches))
+    for query in queries:
+        search.submit(query)
+        time.sleep(gap)
+    time.sleep(search.delay * 2)
+    stats = search.latency_stats()
+    print(f"{'DebouncedSearch':<18} searches={search.stats['searches']:>3} renders={search.stats['renders']:>3}  "
+          f"p50={stats['p50_ms']:6.2f} ms  max={stats['max_ms']:6.2f} ms  (includes {search.delay * 1000:.0f} ms debounce)")
+
+
+if __name__ == "__main__":
+    main()
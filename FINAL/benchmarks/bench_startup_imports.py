@@ -0,0 +1,72 @@
+"""
+Benchmark: import-time profile of starting the app
+==================================================
+Runs a fresh interpreter with `-X importtime` over everything main.py
+imports at module level (flet aside: it's the UI toolkit itself, and may
+not be installed) and reports:
+  * the cumulative cost of each of main.py's imports
+  * the slowest modules underneath them
+  * the median total against STARTUP_BUDGET from test_import_budget.py
+  * what the modules main.py now loads on first use would add to startup
+
+Run with: python benchmarks/bench_startup_imports.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from test_import_budget import STARTUP_BUDGET, main_startup_imports
+
+# The modules main.py gets through lazy_import()
+LAZY_MODULES = ["receipts", "receipt_store", "random", "string"]
+
+
+def importtime(modules):
+    """[(self_us, cumulative_us, depth, name)] for importing modules in a fresh interpreter"""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=APP_DIR, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def total_ms(rows):
+    return sum(cumulative for _, cumulative, depth, _ in rows if depth == 0) / 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    modules = main_startup_imports()
+    profiles = [importtime(modules) for _ in range(runs)]
+    profiles.sort(key=total_ms)
+    median = profiles[len(profiles) // 2]
+
+    print(f"main.py imports at startup: {', '.join(modules)}")
+    print(f"\n{'import':<20} {'cumulative ms':>14}")
+    for _, cumulative, depth, name in median:
+        if depth == 0 and name in modules:
+            print(f"{name:<20} {cumulative / 1000:>14.2f}")
+
+    print(f"\n{'slowest modules':<32} {'self ms':>8}")
+    for self_us, _, _, name in sorted(median, reverse=True)[:10]:
+        print(f"{name:<32} {self_us / 1000:>8.2f}")
+
+    startup = total_ms(median)
+    print(f"\nall imports (interpreter and app): median {startup:.1f} ms over {runs} runs "
+          f"(budget {STARTUP_BUDGET * 1000:.0f} ms) {'OK' if startup < STARTUP_BUDGET * 1000 else 'OVER BUDGET'}")
+    deferred = sorted((total_ms(importtime(modules + LAZY_MODULES)) for _ in range(runs)))[runs // 2]
+    print(f"with the lazy modules imported up front: {deferred:.1f} ms (+{deferred - startup:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: switching dashboard tabs, rebuilt on every click vs kept by ViewRouter
+=================================================================================
+Each stand-in tab runs the queries its main.py layout runs and builds a
+tree of plain objects (one per row and cell, in place of Flet controls).
+Clicking through the tabs the way the sidebar did before calls the layout
+every time; with ViewRouter each tab is built on its first visit and
+put back afterwards. Reports ms per switch, queries per switch and
+objects built, plus one write that makes a tab stale.
+
+Flet itself isn't involved, so the rebuild numbers leave out the control
+diff Flet sends the client, which keeping the view also avoids.
+
+Run with: python benchmarks/bench_view_router.py [switches] [business_owner_id]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_products, get_orders_with_items, get_customers_for_business, get_order_counts_for_business
+from router import ViewRouter
+
+TABS = ["/pos", "/products", "/orders", "/customers", "/customer-orders"]
+
+
+class Control:
+    def __init__(self, *controls, **props):
+        self.controls = list(controls)
+        self.props = props
+
+
+class Page:
+    def __init__(self):
+        self.route = "/"
+        self.on_route_change = None
+
+    def go(self, route):
+        self.route = route
+        self.on_route_change(type("RouteChange", (), {"route": route}))
+
+    def update(self):
+        pass
+
+
+def make_tabs(container, owner_id, counts):
+    def table(rows):
+        counts["queries"] += 1
+        counts["controls"] += len(rows) * 8
+        return Control(*(Control(*(Control(value=value) for value in row), Control(icon="edit")) for row in rows))
+
+    def pos():
+        container.content = Control(table(get_products(owner_id)), Control(hint_text="Enter customer name"))
+
+    def products():
+        container.content = table(get_products(owner_id))
+
+    def orders():
+        container.content = table(get_orders_with_items(owner_id, limit=50)[0])
+
+    def customers():
+        container.content = table(get_customers_for_business(owner_id, limit=50))
+
+    def customer_orders():
+        counts["queries"] += 1
+        stats = get_order_counts_for_business(owner_id)
+        container.content = Control(Control(value=sum(stats.values())), table(get_orders_with_items(owner_id, limit=50)[0]))
+
+    return dict(zip(TABS, [pos, products, orders, customers, customer_orders]))
+
+
+def run(switches, owner_id, routed):
+    container = type("Container", (), {"content": None})()
+    counts = {"queries": 0, "controls": 0}
+    tabs = make_tabs(container, owner_id, counts)
+    views = ViewRouter(Page(), container, tabs, depends={"/pos": {"products"}, "/products": {"products"}})
+    start = time.perf_counter()
+    if routed:
+        views.attach(TABS[0])
+    for i in range(switches):
+        route = TABS[i % len(TABS)]
+        if routed:
+            views.go(route)
+            if i == switches // 2:
+                views.changed("products")  # e.g. a price edit: the POS and Products tabs rebuild once
+        else:
+            tabs[route]()
+    return time.perf_counter() - start, counts, views.stats
+
+
+def main():
+    switches = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    owner_id = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    print(f"{switches} tab switches for business owner {owner_id}")
+    print(f"{'':<20} {'ms/switch':>10} {'queries':>8} {'objects built':>14}")
+    for label, routed in (("rebuilt every click", False), ("ViewRouter", True)):
+        elapsed, counts, stats = run(switches, owner_id, routed)
+        print(f"{label:<20} {elapsed / switches * 1000:>10.3f} {counts['queries']:>8} {counts['controls']:>14}")
+        if routed:
+            print(f"  views built {stats['built']}, reused {stats['reused']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Asset pipeline: pre-resize images into assets/
+==============================================
+Writes the images the app shows, resized to the boxes they're shown in at
+each pixel ratio in SCALES, into assets/ (the Flet assets_dir), and records
+them in assets/manifest.json, which assets.py reads at startup. A box that
+needs the full source resolution gets no variant: the original serves it.
+
+Needs Pillow (installed with reportlab).
+
+Run with: python build_assets.py
+"""
+
+import hashlib
+import json
+import os
+
+from assets import APP_DIR, ASSETS_DIR, MANIFEST_PATH, contain
+
+SOURCE_DIR = os.path.join(APP_DIR, "source")
+
+# Source image -> the (width, height) boxes the app shows it in (ImageFit.CONTAIN), in logical pixels
+IMAGES = {
+    "logo.png": [(400, 300)],   # home screen
+}
+# Device pixel ratios to build each box for
+SCALES = (1, 2)
+
+
+def _describe(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return {"file": os.path.relpath(path, ASSETS_DIR).replace(os.sep, "/"),
+            "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def build_images():
+    from PIL import Image
+
+    manifest = {}
+    os.makedirs(os.path.join(ASSETS_DIR, "images"), exist_ok=True)
+    for name, boxes in IMAGES.items():
+        src = os.path.join(SOURCE_DIR, name)
+        with Image.open(src) as image:
+            width, height = image.size
+            stem = os.path.splitext(name)[0]
+            variants = []
+            sizes = {contain(width, height, box_width * scale, box_height * scale)
+                     for box_width, box_height in boxes for scale in SCALES}
+            for size in sorted(sizes - {(width, height)}):
+                path = os.path.join(ASSETS_DIR, "images", f"{stem}_{size[0]}x{size[1]}.png")
+                image.resize(size, Image.LANCZOS).save(path, optimize=True)
+                variants.append({"width": size[0], "height": size[1], **_describe(path)})
+                print(f"{name} {width}x{height} -> {variants[-1]['file']} ({variants[-1]['bytes']} bytes)")
+        manifest[name] = {"source": {"width": width, "height": height, "bytes": os.path.getsize(src)},
+                          "variants": variants}
+    return manifest
+
+
+def main():
+    manifest = {"images": build_images()}
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Wrote {os.path.relpath(MANIFEST_PATH, APP_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import json
+
+from money import to_cents, from_cents
+
+
+class CartError(ValueError):
+    """A cart that can't become an order (empty, unknown product, stale price) or bad cart input"""
+
+
+class CartLine:
+    """One product in a cart. Prices are integer centavos, so totals never drift."""
+
+    __slots__ = ("product_id", "name", "category", "unit_cents", "quantity")
+
+    def __init__(self, product_id, name, category, unit_cents, quantity):
+        self.product_id = product_id
+        self.name = name
+        self.category = category
+        self.unit_cents = unit_cents
+        self.quantity = quantity
+
+    @property
+    def price(self):
+        return from_cents(self.unit_cents)
+
+    @property
+    def line_cents(self):
+        return self.unit_cents * self.quantity
+
+    @property
+    def line_total(self):
+        return from_cents(self.line_cents)
+
+    def as_item(self):
+        """The line as an order item dict, the shape save_order()/place_customer_order() take"""
+        return {"id": self.product_id, "name": self.name, "category": self.category,
+                "price": self.price, "quantity": self.quantity}
+
+    def _key(self):
+        return (self.product_id, self.name, self.category, self.unit_cents, self.quantity)
+
+    def __eq__(self, other):
+        return isinstance(other, CartLine) and self._key() == other._key()
+
+    def __repr__(self):
+        return f"CartLine({self.product_id!r}, {self.name!r}, {self.category!r}, {self.unit_cents}, {self.quantity})"
+
+
+class Cart:
+    """A cart shared by the staff POS and the customer portal.
+
+    Lines are keyed by product id (O(1) lookup) and the total is kept in
+    integer centavos, adjusted by the changed line only. Mutators return the
+    line they touched so a UI can redraw just that row. to_order() is the
+    only way out to the database: it re-checks every line against the
+    current catalog and returns (total, items) for save_order() or
+    place_customer_order().
+    """
+
+    def __init__(self, lines=()):
+        self._lines = {}    # product id -> CartLine, in the order first added
+        self.total_cents = 0
+        for line in lines:
+            self._put(CartLine(line.product_id, line.name, line.category, line.unit_cents, line.quantity))
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __iter__(self):
+        return iter(self._lines.values())
+
+    def __contains__(self, product_id):
+        return product_id in self._lines
+
+    def __eq__(self, other):
+        return isinstance(other, Cart) and list(self._lines.values()) == list(other._lines.values())
+
+    def __repr__(self):
+        return f"Cart({list(self._lines.values())!r})"
+
+    @property
+    def total(self):
+        """Total in pesos"""
+        return from_cents(self.total_cents)
+
+    @property
+    def quantity(self):
+        """Number of units across all lines"""
+        return sum(line.quantity for line in self._lines.values())
+
+    def get(self, product_id):
+        return self._lines.get(product_id)
+
+    def _put(self, line):
+        _check_quantity(line.quantity)
+        existing = self._lines.get(line.product_id)
+        if existing is None:
+            self._lines[line.product_id] = line
+            self.total_cents += line.line_cents
+            return line, True
+        if existing.unit_cents != line.unit_cents:
+            raise CartError(f"{line.name} is in the cart at two prices")
+        existing.quantity += line.quantity
+        self.total_cents += line.line_cents
+        return existing, False
+
+    def add(self, product, quantity=1):
+        """Add quantity of a product (a dict with id, name, category, price); returns (line, created)"""
+        return self._put(CartLine(product["id"], product["name"], product["category"],
+                                  to_cents(product["price"]), quantity))
+
+    def set_quantity(self, product_id, quantity):
+        """Set a line's quantity; 0 removes it. Returns the line, or None if it was removed"""
+        if quantity == 0:
+            self.remove(product_id)
+            return None
+        _check_quantity(quantity)
+        line = self._lines[product_id]
+        self.total_cents += line.unit_cents * (quantity - line.quantity)
+        line.quantity = quantity
+        return line
+
+    def remove(self, product_id):
+        """Drop a line and return it (None if the product isn't in the cart)"""
+        line = self._lines.pop(product_id, None)
+        if line is not None:
+            self.total_cents -= line.line_cents
+        return line
+
+    def clear(self):
+        self._lines.clear()
+        self.total_cents = 0
+
+    def copy(self):
+        return Cart(self._lines.values())
+
+    def merge(self, other):
+        """Add every line of another cart to this one (e.g. joining two tabs); returns self"""
+        for line in other:
+            self._put(CartLine(line.product_id, line.name, line.category, line.unit_cents, line.quantity))
+        return self
+
+    def split(self, quantities):
+        """Move {product id: quantity} out of this cart into a new one (e.g. splitting a bill)"""
+        for product_id, quantity in quantities.items():
+            line = self._lines.get(product_id)
+            if line is None:
+                raise CartError(f"product {product_id} is not in the cart")
+            _check_quantity(quantity)
+            if quantity > line.quantity:
+                raise CartError(f"only {line.quantity} x {line.name} in the cart")
+        other = Cart()
+        for product_id, quantity in quantities.items():
+            line = self._lines[product_id]
+            other._put(CartLine(product_id, line.name, line.category, line.unit_cents, quantity))
+            self.set_quantity(product_id, line.quantity - quantity)
+        return other
+
+    def items(self):
+        """The lines as order item dicts, e.g. for receipts"""
+        return [line.as_item() for line in self._lines.values()]
+
+    # ============ SERIALIZATION ============
+
+    def to_dict(self):
+        return {"lines": [[line.product_id, line.name, line.category, line.unit_cents, line.quantity]
+                          for line in self._lines.values()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        try:
+            lines = [CartLine(*fields) for fields in data["lines"]]
+        except (KeyError, TypeError) as e:
+            raise CartError(f"not a saved cart: {e}") from None
+        for line in lines:
+            if not isinstance(line.unit_cents, int) or line.unit_cents < 0:
+                raise CartError(f"bad price for {line.name!r}: {line.unit_cents!r}")
+        return cls(lines)
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text):
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise CartError(f"not a saved cart: {e}") from None
+        return cls.from_dict(data)
+
+    # ============ CHECKOUT ============
+
+    def problems(self, catalog):
+        """Lines that don't match the catalog: [(line, reason)], reason being 'unavailable' or 'price'"""
+        products = {product["id"]: product for product in catalog}
+        found = []
+        for line in self._lines.values():
+            product = products.get(line.product_id)
+            if product is None:
+                found.append((line, "unavailable"))
+            elif to_cents(product["price"]) != line.unit_cents:
+                found.append((line, "price"))
+        return found
+
+    def reprice(self, catalog):
+        """Bring the cart in line with the catalog: new prices, unavailable products dropped.
+
+        Returns the problems that were fixed, as problems() reports them.
+        """
+        products = {product["id"]: product for product in catalog}
+        found = self.problems(products.values())
+        for line, reason in found:
+            if reason == "unavailable":
+                self.remove(line.product_id)
+            else:
+                new_cents = to_cents(products[line.product_id]["price"])
+                self.total_cents += (new_cents - line.unit_cents) * line.quantity
+                line.unit_cents = new_cents
+        return found
+
+    def to_order(self, catalog):
+        """(total, items) for save_order()/place_customer_order(), checked against the current catalog.
+
+        Raises CartError if the cart is empty or any line's product was
+        removed or repriced since it was added (see reprice()).
+        """
+        if not self._lines:
+            raise CartError("the cart is empty")
+        found = self.problems(catalog)
+        if found:
+            raise CartError("; ".join(
+                f"{line.name} is no longer available" if reason == "unavailable" else f"the price of {line.name} changed"
+                for line, reason in found))
+        return self.total, self.items()
+
+
+def _check_quantity(quantity):
+    if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity <= 0:
+        raise CartError(f"quantity must be a positive whole number, not {quantity!r}")
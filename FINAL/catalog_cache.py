@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Owners' catalogs kept in memory at once (least recently used are evicted first)
+DEFAULT_MAX_OWNERS = 64
+# Seconds before a cached catalog is reloaded anyway, to pick up writes made
+# outside this process (another till, a script editing the database file)
+DEFAULT_TTL = 300.0
+
+
+class CatalogCache:
+    """Product catalog cache keyed by owner, with TTL, LRU eviction and version-based invalidation.
+
+    Every owner has a version number that invalidate() bumps. A loaded catalog
+    is only stored if the owner's version did not change while it was being
+    read, so a load racing with a product edit can never cache stale rows.
+    """
+
+    def __init__(self, max_owners=DEFAULT_MAX_OWNERS, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_owners = max_owners
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()   # owner -> (version, expires_at, products)
+        self._versions = {}
+        self._generation = 0            # bumped by invalidate_all()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _version(self, owner):
+        return (self._generation, self._versions.get(owner, 0))
+
+    def get(self, owner, load):
+        """Return owner's catalog, calling load() on a miss"""
+        with self._lock:
+            version = self._version(owner)
+            entry = self._entries.get(owner)
+            if entry is not None and entry[0] == version and entry[1] > self._clock():
+                self._entries.move_to_end(owner)
+                self.stats["hits"] += 1
+                return list(entry[2])
+            self.stats["misses"] += 1
+
+        products = load()
+
+        with self._lock:
+            if self._version(owner) == version:
+                self._entries[owner] = (version, self._clock() + self.ttl, tuple(products))
+                self._entries.move_to_end(owner)
+                while len(self._entries) > self.max_owners:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+        return list(products)
+
+    def invalidate(self, *owners):
+        """Drop the cached catalogs of the given owners"""
+        with self._lock:
+            for owner in owners:
+                self._versions[owner] = self._versions.get(owner, 0) + 1
+                self._entries.pop(owner, None)
+            self.stats["invalidations"] += 1
+
+    def invalidate_all(self):
+        """Drop every cached catalog, e.g. after a product edit whose owner is unknown"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.stats["invalidations"] += 1
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
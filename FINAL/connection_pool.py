@@ -0,0 +1,224 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Number of idle connections kept open per database file
+DEFAULT_POOL_SIZE = 5
+# Connections idle longer than this (seconds) are pinged before being handed out
+HEALTH_CHECK_INTERVAL = 30.0
+# Seconds sqlite waits on a locked database before raising "database is locked"
+BUSY_TIMEOUT = 5.0
+
+# PRAGMA profiles applied to every new connection. All of them use WAL so the
+# superadmin analytics readers and the single order writer don't block each other.
+PRAGMA_PROFILES = {
+    # Counter default: survives power loss, still lets readers run during writes
+    "pos-durable": (
+        ("journal_mode", "WAL"),
+        ("synchronous", "FULL"),
+        ("cache_size", -8000),        # ~8 MB page cache
+        ("mmap_size", 67108864),      # 64 MB
+        ("temp_store", "MEMORY"),
+    ),
+    # Faster commits; a power cut may lose the last few transactions but never corrupts
+    "pos-fast": (
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("cache_size", -16000),       # ~16 MB page cache
+        ("mmap_size", 268435456),     # 256 MB
+        ("temp_store", "MEMORY"),
+    ),
+    # Dashboard/report queries: big cache, refuses writes
+    "analytics-readonly": (
+        ("journal_mode", "WAL"),
+        ("cache_size", -64000),       # ~64 MB page cache
+        ("mmap_size", 268435456),
+        ("temp_store", "MEMORY"),
+        ("query_only", "ON"),
+    ),
+}
+DEFAULT_PROFILE = "pos-durable"
+
+
+def apply_pragmas(conn, profile=DEFAULT_PROFILE):
+    """Apply a named PRAGMA profile to a connection"""
+    try:
+        pragmas = PRAGMA_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown PRAGMA profile: {profile!r}") from None
+    for name, value in pragmas:
+        conn.execute(f"PRAGMA {name} = {value}").fetchall()
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to its pool instead of closing it"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = None
+        self._checked_out = False
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._pool is None:
+            super().close()
+        else:
+            self._pool.release(self)
+
+    def force_close(self):
+        """Really close the underlying sqlite connection"""
+        self._pool = None
+        self._checked_out = False
+        super().close()
+
+
+class ConnectionPool:
+    """A small pool of long-lived sqlite connections for one database file.
+
+    Connections are handed out one thread at a time, so they are opened with
+    check_same_thread=False and can be reused by whichever Flet handler thread
+    asks next. Up to `size` idle connections are kept; extra connections
+    opened under load are closed when released.
+    """
+
+    def __init__(self, db_path, size=DEFAULT_POOL_SIZE, health_check_interval=HEALTH_CHECK_INTERVAL,
+                 row_factory=None, timeout=BUSY_TIMEOUT, profile=DEFAULT_PROFILE):
+        if profile is not None and profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown PRAGMA profile: {profile!r}")
+        self.db_path = db_path
+        self.profile = profile
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.row_factory = row_factory
+        self.timeout = timeout
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                               factory=PooledConnection, check_same_thread=False)
+        if self.profile is not None:
+            apply_pragmas(conn, self.profile)
+        self.stats["created"] += 1
+        return conn
+
+    def _is_healthy(self, conn):
+        """Ping connections that have been idle for a while"""
+        if time.monotonic() - conn._last_used < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self):
+        """Check a connection out of the pool (opening a new one if none are idle)"""
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = self._connect()
+                break
+            if self._is_healthy(conn):
+                self.stats["reused"] += 1
+                break
+            self.stats["discarded"] += 1
+            try:
+                conn.force_close()
+            except sqlite3.Error:
+                pass
+        conn.row_factory = self.row_factory
+        conn._pool = self
+        conn._checked_out = True
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any uncommitted work"""
+        if not conn._checked_out:
+            return
+        conn._checked_out = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self.stats["discarded"] += 1
+            conn.force_close()
+            return
+        conn._last_used = time.monotonic()
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.force_close()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that commits on success, rolls back on error and releases the connection"""
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Like connection(), but takes the write lock up front with BEGIN IMMEDIATE"""
+        conn = self.acquire()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        """Close every idle connection (checked-out connections are closed on release)"""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._closed = True
+        for conn in idle:
+            conn.force_close()
+
+    def idle_count(self):
+        with self._lock:
+            return len(self._idle)
+
+
+# ============ POOL REGISTRY ============
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path, profile=DEFAULT_PROFILE, **options):
+    """Return the shared pool for a database file and PRAGMA profile, creating it on first use"""
+    key = (db_path, profile)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(db_path, profile=profile, **options)
+                _pools[key] = pool
+    return pool
+
+
+def close_pool(db_path):
+    """Close and forget every pool for a database file"""
+    with _pools_lock:
+        pools = [_pools.pop(key) for key in list(_pools) if key[0] == db_path]
+    for pool in pools:
+        pool.close_all()
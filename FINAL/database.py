@@ -1,11 +1,26 @@
 import sqlite3
 import os
+import re
 import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from connection_pool import get_pool
+from catalog_cache import CatalogCache
+from product_search import ProductSearchIndex
+from migrations import run_migrations
+from money import to_cents, from_cents
 
 # Always resolve DB path relative to this file, not the working directory
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "coffeestry.db")
-print("Database path:", DB_PATH)
+
+# PRAGMA profile for the POS connections ("pos-durable", "pos-fast"); see connection_pool.PRAGMA_PROFILES
+PRAGMA_PROFILE = os.environ.get("COFFEESTRY_DB_PROFILE", "pos-durable")
+# Profile for the superadmin dashboard's read-only connections
+ANALYTICS_PROFILE = "analytics-readonly"
 
 # ============ PASSWORD HASHING FUNCTIONS ============
 
@@ -18,26 +33,43 @@ def verify_password(password, hashed_password):
     return hash_password(password) == hashed_password
 
 def get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    return conn
+    """Check out a pooled connection; conn.close() hands it back to the pool"""
+    init()
+    return get_pool(DB_PATH, PRAGMA_PROFILE).acquire()
+
+def get_read_connection():
+    """Check out a read-only analytics connection (never blocks the order writer under WAL)"""
+    init()
+    return get_pool(DB_PATH, ANALYTICS_PROFILE).acquire()
+
+def _read_analytics(query, *args):
+    """Run one analytics query function on a read-only connection"""
+    conn = get_read_connection()
+    try:
+        return query(conn.cursor(), *args)
+    finally:
+        conn.close()
 
-def create_table():
-    conn = get_connection()
-    cursor = conn.cursor()
+def connection():
+    """Context manager over a pooled connection (commits on success, rolls back on error)"""
+    init()
+    return get_pool(DB_PATH, PRAGMA_PROFILE).connection()
 
-    # Check if users table exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-    table_exists = cursor.fetchone()
+def write_transaction():
+    """Context manager for one BEGIN IMMEDIATE ... COMMIT write transaction"""
+    init()
+    return get_pool(DB_PATH, PRAGMA_PROFILE).transaction()
+
+# ============ SCHEMA SETUP ============
+
+def _create_users_schema(cursor):
+    """Create the users table, upgrading older layouts in place"""
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='users'")
+    table_row = cursor.fetchone()
     
-    if table_exists:
-        # Check if the table has old constraint by trying to insert a customer role
-        try:
-            cursor.execute("INSERT INTO users (username, password, role) VALUES ('__test_constraint__', 'test', 'customer')")
-            # If successful, delete the test row and continue
-            cursor.execute("DELETE FROM users WHERE username = '__test_constraint__'")
-            conn.commit()
-        except sqlite3.IntegrityError:
-            # Old constraint exists - need to recreate table
+    if table_row:
+        # Old CHECK constraint without the newer roles - need to recreate table
+        if "'customer'" not in table_row[0] or "'superadmin'" not in table_row[0]:
             print("Migrating users table to support new roles...")
             
             # Backup existing data
@@ -66,7 +98,6 @@ def create_table():
                     cursor.execute("INSERT INTO users (id, username, password, role) VALUES (?, ?, ?, ?)", user)
                 except:
                     pass
-            conn.commit()
             print("Migration completed!")
         
         # Check if business_owner_id column exists
@@ -90,13 +121,11 @@ def create_table():
                 FOREIGN KEY (business_owner_id) REFERENCES users(id)
             )
         """)
-    conn.commit()
-    conn.close()
 
-def add_default_users():
-    conn = get_connection()
-    cursor = conn.cursor()
+    # Customer lists are filtered by owner and role, newest first
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_owner_role_created ON users (business_owner_id, role, created_at)")
 
+def _seed_default_users(cursor):
     # Default users including superadmin (passwords are hashed)
     users = [
         ("superadmin", hash_password("superadmin123"), "superadmin", None),
@@ -104,20 +133,11 @@ def add_default_users():
         ("staff", hash_password("staff123"), "staff", None)
     ]
 
-    for username, password, role, business_owner_id in users:
-        try:
-            cursor.execute("INSERT INTO users (username, password, role, business_owner_id) VALUES (?, ?, ?, ?)",
-                           (username, password, role, business_owner_id))
-        except sqlite3.IntegrityError:
-            pass  # Ignore duplicates if already added
+    # Ignore duplicates if already added
+    cursor.executemany("INSERT OR IGNORE INTO users (username, password, role, business_owner_id) VALUES (?, ?, ?, ?)",
+                       users)
 
-    conn.commit()
-    conn.close()
-
-def create_products_table():
-    conn = get_connection()
-    cursor = conn.cursor()
-    
+def _create_products_schema(cursor):
     # Check if products table exists
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='products'")
     table_exists = cursor.fetchone()
@@ -141,18 +161,11 @@ def create_products_table():
                 FOREIGN KEY (business_owner_id) REFERENCES users(id)
             )
         """)
-    
-    conn.commit()
-    conn.close()
 
-def add_default_products():
-    """Default products are no longer added - each business owner has their own products"""
-    pass  # Each business owner manages their own products
+    # Covering index for a business owner's catalog (id is the rowid, so it comes for free)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_owner ON products (business_owner_id, name, category, price)")
 
-def create_orders_table():
-    conn = get_connection()
-    cursor = conn.cursor()
-    
+def _create_orders_schema(cursor):
     # Check if orders table exists
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='orders'")
     table_exists = cursor.fetchone()
@@ -198,29 +211,592 @@ def create_orders_table():
             FOREIGN KEY (order_id) REFERENCES orders(id)
         )
     """)
+
+    # Indexes for the per-business order screens, customer history and sales totals
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_owner_date ON orders (business_owner_id, order_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_owner_status_date ON orders (business_owner_id, status, order_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_owner_payment_total ON orders (business_owner_id, payment_status, total)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_customer_date ON orders (customer_id, order_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_payment_date ON orders (payment_status, order_date, total)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items (order_id)")
+
+def create_table():
+    conn = get_connection()
+    _create_users_schema(conn.cursor())
     conn.commit()
     conn.close()
 
-def get_products(business_owner_id=None):
+def add_default_users():
+    conn = get_connection()
+    _seed_default_users(conn.cursor())
+    conn.commit()
+    conn.close()
+
+def create_products_table():
+    conn = get_connection()
+    _create_products_schema(conn.cursor())
+    conn.commit()
+    conn.close()
+
+def add_default_products():
+    """Default products are no longer added - each business owner has their own products"""
+    pass  # Each business owner manages their own products
+
+def create_orders_table():
+    conn = get_connection()
+    _create_orders_schema(conn.cursor())
+    conn.commit()
+    conn.close()
+
+# ============ SALES ROLLUPS ============
+# daily_sales holds order counts and revenue per day, business owner, status
+# and payment status; daily_product_sales holds units and revenue per day,
+# owner, payment status and product. Triggers on orders/order_items keep
+# them current on every write path (save_order, place_customer_order,
+# mark_order_paid, cancel_order, status changes and deletes), so the
+# dashboard analytics read a few hundred rollup rows instead of every order.
+# Orders without an owner are filed under business_owner_id 0.
+
+ORDER_ROLLUP_SELECT = """
+    SELECT DATE(order_date), COALESCE(business_owner_id, 0), COALESCE(status, 'pending'),
+           COALESCE(payment_status, 'unpaid'), COUNT(*), SUM(total)
+    FROM orders
+    GROUP BY 1, 2, 3, 4
+"""
+
+PRODUCT_ROLLUP_SELECT = """
+    SELECT DATE(o.order_date), COALESCE(o.business_owner_id, 0), COALESCE(o.payment_status, 'unpaid'),
+           oi.product_name, oi.category, SUM(oi.quantity), SUM(oi.price * oi.quantity)
+    FROM order_items oi
+    JOIN orders o ON oi.order_id = o.id
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+def _order_rollup_sql(ref, sign):
+    """Trigger statement adding (sign=1) or removing (sign=-1) one order row's contribution"""
+    return f"""
+        INSERT INTO daily_sales (day, business_owner_id, status, payment_status, order_count, revenue)
+        VALUES (DATE({ref}.order_date), COALESCE({ref}.business_owner_id, 0), COALESCE({ref}.status, 'pending'),
+                COALESCE({ref}.payment_status, 'unpaid'), {sign}, {sign} * {ref}.total)
+        ON CONFLICT (day, business_owner_id, status, payment_status) DO UPDATE SET
+            order_count = order_count + excluded.order_count,
+            revenue = revenue + excluded.revenue;
+    """
+
+def _order_items_rollup_sql(ref, sign):
+    """Trigger statement adding/removing all items of the order `ref` under that order's keys"""
+    return f"""
+        INSERT INTO daily_product_sales (day, business_owner_id, payment_status, product_name, category, units, revenue)
+        SELECT DATE({ref}.order_date), COALESCE({ref}.business_owner_id, 0), COALESCE({ref}.payment_status, 'unpaid'),
+               product_name, category, {sign} * quantity, {sign} * price * quantity
+        FROM order_items WHERE order_id = {ref}.id
+        ON CONFLICT (day, business_owner_id, payment_status, product_name, category) DO UPDATE SET
+            units = units + excluded.units,
+            revenue = revenue + excluded.revenue;
+    """
+
+def _item_rollup_sql(ref, sign):
+    """Trigger statement adding/removing one order_items row under its order's keys"""
+    return f"""
+        INSERT INTO daily_product_sales (day, business_owner_id, payment_status, product_name, category, units, revenue)
+        SELECT DATE(o.order_date), COALESCE(o.business_owner_id, 0), COALESCE(o.payment_status, 'unpaid'),
+               {ref}.product_name, {ref}.category, {sign} * {ref}.quantity, {sign} * {ref}.price * {ref}.quantity
+        FROM orders o WHERE o.id = {ref}.order_id
+        ON CONFLICT (day, business_owner_id, payment_status, product_name, category) DO UPDATE SET
+            units = units + excluded.units,
+            revenue = revenue + excluded.revenue;
+    """
+
+# Drop rollup rows that an update or delete brought back to zero
+_PRUNE_ROLLUPS_SQL = """
+        DELETE FROM daily_sales WHERE order_count = 0;
+        DELETE FROM daily_product_sales WHERE units = 0;
+"""
+
+def _create_sales_rollups(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_sales (
+            day TEXT NOT NULL,
+            business_owner_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            payment_status TEXT NOT NULL,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, business_owner_id, status, payment_status)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_product_sales (
+            day TEXT NOT NULL,
+            business_owner_id INTEGER NOT NULL,
+            payment_status TEXT NOT NULL,
+            product_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            units INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, business_owner_id, payment_status, product_name, category)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_sales_payment_day ON daily_sales (payment_status, day)")
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_orders_insert AFTER INSERT ON orders BEGIN
+            {_order_rollup_sql("NEW", 1)}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_orders_update
+        AFTER UPDATE OF order_date, business_owner_id, status, payment_status, total ON orders BEGIN
+            {_order_rollup_sql("OLD", -1)}
+            {_order_rollup_sql("NEW", 1)}
+            {_order_items_rollup_sql("OLD", -1)}
+            {_order_items_rollup_sql("NEW", 1)}
+            {_PRUNE_ROLLUPS_SQL}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_orders_delete AFTER DELETE ON orders BEGIN
+            {_order_rollup_sql("OLD", -1)}
+            {_order_items_rollup_sql("OLD", -1)}
+            {_PRUNE_ROLLUPS_SQL}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_items_insert AFTER INSERT ON order_items BEGIN
+            {_item_rollup_sql("NEW", 1)}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_items_update AFTER UPDATE ON order_items BEGIN
+            {_item_rollup_sql("OLD", -1)}
+            {_item_rollup_sql("NEW", 1)}
+            {_PRUNE_ROLLUPS_SQL}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_items_delete AFTER DELETE ON order_items BEGIN
+            {_item_rollup_sql("OLD", -1)}
+            {_PRUNE_ROLLUPS_SQL}
+        END
+    """)
+
+def _fill_sales_rollups(cursor):
+    """Recompute both rollup tables from orders/order_items"""
+    cursor.execute("DELETE FROM daily_sales")
+    cursor.execute("DELETE FROM daily_product_sales")
+    cursor.execute("INSERT INTO daily_sales (day, business_owner_id, status, payment_status, order_count, revenue)"
+                   + ORDER_ROLLUP_SELECT)
+    cursor.execute("INSERT INTO daily_product_sales (day, business_owner_id, payment_status, product_name, category, units, revenue)"
+                   + PRODUCT_ROLLUP_SELECT)
+
+def rebuild_sales_rollups():
+    """Throw away and recompute the sales rollups"""
+    with write_transaction() as conn:
+        _fill_sales_rollups(conn.cursor())
+
+def _rollup_diff(table, stored_rows, expected_rows):
+    stored = {row[:-2]: row[-2:] for row in stored_rows}
+    expected = {row[:-2]: row[-2:] for row in expected_rows}
+    diffs = []
+    for key in sorted(stored.keys() | expected.keys(), key=str):
+        have = stored.get(key, (0, 0))
+        want = expected.get(key, (0, 0))
+        # Counts and revenue (integer centavos) must match exactly
+        if have != want:
+            diffs.append((table, key, have, want))
+    return diffs
+
+def check_sales_rollups(repair=False):
+    """Diff the rollups against a fresh aggregate of orders; returns the mismatches.
+
+    Each mismatch is (table, key, stored (count, revenue), expected (count, revenue)),
+    revenue in centavos.
+    With repair=True the rollups are rebuilt when anything differs.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    # One read transaction so the orders and the rollups are compared at the same instant
+    cursor.execute("BEGIN")
+    diffs = _rollup_diff(
+        "daily_sales",
+        cursor.execute("SELECT day, business_owner_id, status, payment_status, order_count, revenue FROM daily_sales").fetchall(),
+        cursor.execute(ORDER_ROLLUP_SELECT).fetchall(),
+    ) + _rollup_diff(
+        "daily_product_sales",
+        cursor.execute("SELECT day, business_owner_id, payment_status, product_name, category, units, revenue FROM daily_product_sales").fetchall(),
+        cursor.execute(PRODUCT_ROLLUP_SELECT).fetchall(),
+    )
+    conn.rollback()
+    conn.close()
+    if diffs and repair:
+        rebuild_sales_rollups()
+    return diffs
+
+# ============ ORDER SEARCH INDEX ============
+# order_search is an FTS5 table with one row per order (rowid = order id)
+# holding the customer name and the names of the products on the order.
+# Triggers keep it in step with orders and order_items.
+
+# Product names of one order as a single searchable string
+_ORDER_PRODUCTS_SQL = "(SELECT group_concat(product_name, ', ') FROM order_items WHERE order_id = {order_id})"
+
+def _create_order_search(cursor):
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS order_search USING fts5(
+            customer_name, product_names,
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_search_orders_insert AFTER INSERT ON orders BEGIN
+            INSERT INTO order_search (rowid, customer_name, product_names)
+            VALUES (NEW.id, COALESCE(NEW.customer_name, ''), '');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_search_orders_update AFTER UPDATE OF customer_name ON orders BEGIN
+            UPDATE order_search SET customer_name = COALESCE(NEW.customer_name, '') WHERE rowid = NEW.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_search_orders_delete AFTER DELETE ON orders BEGIN
+            DELETE FROM order_search WHERE rowid = OLD.id;
+        END
+    """)
+    for event, ref in (("INSERT", "NEW"), ("UPDATE OF product_name, order_id", "NEW"), ("DELETE", "OLD")):
+        name = event.split()[0].lower()
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_search_items_{name} AFTER {event} ON order_items BEGIN
+                UPDATE order_search SET product_names = COALESCE({_ORDER_PRODUCTS_SQL.format(order_id=ref + ".order_id")}, '')
+                WHERE rowid = {ref}.order_id;
+            END
+        """)
+    # An item moved to another order must also leave its old order's entry
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_search_items_move AFTER UPDATE OF order_id ON order_items
+        WHEN OLD.order_id IS NOT NEW.order_id BEGIN
+            UPDATE order_search SET product_names = COALESCE({_ORDER_PRODUCTS_SQL.format(order_id="OLD.order_id")}, '')
+            WHERE rowid = OLD.order_id;
+        END
+    """)
+
+def _fill_order_search(cursor):
+    cursor.execute("DELETE FROM order_search")
+    cursor.execute(f"""
+        INSERT INTO order_search (rowid, customer_name, product_names)
+        SELECT o.id, COALESCE(o.customer_name, ''), COALESCE({_ORDER_PRODUCTS_SQL.format(order_id="o.id")}, '')
+        FROM orders o
+    """)
+
+def rebuild_order_search():
+    """Throw away and rebuild the order search index"""
+    with write_transaction() as conn:
+        _fill_order_search(conn.cursor())
+
+# ============ SCHEMA MIGRATIONS ============
+# Applied once each, in order; PRAGMA user_version records the last one applied.
+# Never edit a migration that has shipped - append a new one instead.
+
+def _migration_1_base_schema(conn):
+    """Tables, legacy column upgrades and hot-query indexes"""
+    cursor = conn.cursor()
+    _create_users_schema(cursor)
+    _create_products_schema(cursor)
+    _create_orders_schema(cursor)
+
+def _migration_2_default_users(conn):
+    """Seed the superadmin/owner/staff accounts once"""
+    _seed_default_users(conn.cursor())
+
+def _migration_3_paging_indexes(conn):
+    """Indexes for the unfiltered newest-first order and user lists"""
+    cursor = conn.cursor()
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_date ON orders (order_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_created ON users (created_at)")
+
+def _migration_4_sales_rollups(conn):
+    """daily_sales / daily_product_sales rollups, their triggers and a backfill"""
+    cursor = conn.cursor()
+    _create_sales_rollups(cursor)
+    _fill_sales_rollups(cursor)
+
+def _migration_5_rollup_covering_indexes(conn):
+    """Covering indexes so the dashboard snapshot never touches the rollup tables themselves"""
+    cursor = conn.cursor()
+    cursor.execute("DROP INDEX IF EXISTS idx_daily_sales_payment_day")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_sales_payment_day ON daily_sales (payment_status, day, revenue, order_count)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_sales_payment_owner ON daily_sales (payment_status, business_owner_id, revenue, order_count)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_sales_status ON daily_sales (status, order_count)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_product_sales_payment_product ON daily_product_sales (payment_status, product_name, units, revenue)")
+
+def _migration_6_order_search(conn):
+    """FTS5 order search over customer and product names, its triggers and a backfill"""
+    cursor = conn.cursor()
+    _create_order_search(cursor)
+    _fill_order_search(cursor)
+
+# Migration 7 rebuilds these tables with their money columns as INTEGER
+# centavos: (table, CREATE statement for the replacement, columns, money columns)
+_INTEGER_MONEY_TABLES = [
+    ("products", """
+        CREATE TABLE products_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            business_owner_id INTEGER,
+            FOREIGN KEY (business_owner_id) REFERENCES users(id)
+        )
+    """, ("id", "name", "category", "price", "business_owner_id"), ("price",)),
+    ("orders", """
+        CREATE TABLE orders_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_name TEXT,
+            customer_id INTEGER,
+            business_owner_id INTEGER,
+            order_type TEXT,
+            total INTEGER NOT NULL,
+            status TEXT DEFAULT 'pending' CHECK(status IN ('pending', 'confirmed', 'completed', 'cancelled')),
+            payment_status TEXT DEFAULT 'unpaid' CHECK(payment_status IN ('unpaid', 'paid')),
+            order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (customer_id) REFERENCES users(id),
+            FOREIGN KEY (business_owner_id) REFERENCES users(id)
+        )
+    """, ("id", "customer_name", "customer_id", "business_owner_id", "order_type", "total", "status",
+          "payment_status", "order_date"), ("total",)),
+    ("order_items", """
+        CREATE TABLE order_items_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            product_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            quantity INTEGER NOT NULL,
+            FOREIGN KEY (order_id) REFERENCES orders(id)
+        )
+    """, ("id", "order_id", "product_name", "category", "price", "quantity"), ("price",)),
+]
+
+def _rebuild_with_cents(cursor, table, create_sql, columns, money_columns):
+    """Copy table into its replacement with money_columns converted to centavos, then swap them"""
+    cursor.execute(create_sql)
+    select = ", ".join(f"CAST(ROUND({column} * 100) AS INTEGER)" if column in money_columns else column
+                       for column in columns)
+    cursor.execute(f"INSERT INTO {table}_new ({', '.join(columns)}) SELECT {select} FROM {table}")
+    # Keep AUTOINCREMENT's high-water mark so ids of deleted rows are never handed out again
+    sequence = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    if sequence is not None:
+        cursor.execute("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+        cursor.execute(f"INSERT INTO sqlite_sequence (name, seq) SELECT ?, MAX(?, COALESCE(MAX(id), 0)) FROM {table}",
+                       (table, sequence[0]))
+
+def _migration_7_integer_money(conn):
+    """Prices, totals and rollup revenue as INTEGER centavos instead of REAL pesos"""
+    cursor = conn.cursor()
+    # The rollup and search triggers reference these tables; they are recreated below
+    triggers = cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type = 'trigger' AND tbl_name IN ('products', 'orders', 'order_items')
+    """).fetchall()
+    for (name,) in triggers:
+        cursor.execute(f"DROP TRIGGER {name}")
+    for table, create_sql, columns, money_columns in _INTEGER_MONEY_TABLES:
+        _rebuild_with_cents(cursor, table, create_sql, columns, money_columns)
+    # Indexes went with the old tables; these are the ones migrations 1 and 3 created
+    _create_products_schema(cursor)
+    _create_orders_schema(cursor)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_date ON orders (order_date)")
+
+    # The rollups are derived data: recreate them with INTEGER revenue and refill
+    cursor.execute("DROP TABLE daily_sales")
+    cursor.execute("DROP TABLE daily_product_sales")
+    cursor.execute("""
+        CREATE TABLE daily_sales (
+            day TEXT NOT NULL,
+            business_owner_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            payment_status TEXT NOT NULL,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            revenue INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, business_owner_id, status, payment_status)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE daily_product_sales (
+            day TEXT NOT NULL,
+            business_owner_id INTEGER NOT NULL,
+            payment_status TEXT NOT NULL,
+            product_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            units INTEGER NOT NULL DEFAULT 0,
+            revenue INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, business_owner_id, payment_status, product_name, category)
+        ) WITHOUT ROWID
+    """)
+    _migration_5_rollup_covering_indexes(conn)
+    _create_sales_rollups(cursor)   # tables and indexes exist by now, so this only adds the triggers
+    _fill_sales_rollups(cursor)
+    # Order ids are unchanged, so the search index only needs its triggers back
+    _create_order_search(cursor)
+
+def _migration_8_receipt_artifacts(conn):
+    # Index of the receipts in the content-addressed store (see receipt_store.py)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS receipt_artifacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            format TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            blob_sha256 TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            print_count INTEGER NOT NULL DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_printed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (order_id, format, content_hash)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_receipt_artifacts_blob ON receipt_artifacts (blob_sha256)")
+
+MIGRATIONS = [
+    (1, _migration_1_base_schema),
+    (2, _migration_2_default_users),
+    (3, _migration_3_paging_indexes),
+    (4, _migration_4_sales_rollups),
+    (5, _migration_5_rollup_covering_indexes),
+    (6, _migration_6_order_search),
+    (7, _migration_7_integer_money),
+    (8, _migration_8_receipt_artifacts),
+]
+
+def init_db():
+    """Bring the schema up to date; a single PRAGMA read when it already is"""
+    conn = get_pool(DB_PATH, PRAGMA_PROFILE).acquire()
+    try:
+        return run_migrations(conn, MIGRATIONS)
+    finally:
+        conn.close()
+
+# ============ LAZY INITIALIZATION ============
+# Importing this module touches nothing on disk; the first connection request
+# (or an explicit init() at app start) runs the migrations once per DB_PATH.
+
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
+def init():
+    """Initialize the database on first use (safe to call repeatedly and from any thread)"""
+    if DB_PATH in _initialized_paths:
+        return
+    with _init_lock:
+        if DB_PATH in _initialized_paths:
+            return
+        print("Database path:", DB_PATH)
+        init_db()
+        _initialized_paths.add(DB_PATH)
+
+# ============ KEYSET PAGINATION ============
+# List functions accept limit/after to page newest-first: pass the (date, id) of
+# the last row you got as `after` to fetch the next page. Default is every row.
+
+def _keyset(date_column, id_column, after, nullable=False):
+    """Extra WHERE condition and params for the page after `after` in (date DESC, id DESC) order"""
+    if after is None:
+        return "", ()
+    date, row_id = after
+    if not nullable:
+        return f" AND ({date_column}, {id_column}) < (?, ?)", (date, row_id)
+    # Rows with a NULL date (accounts created before the column existed) sort last
+    if date is None:
+        return f" AND {date_column} IS NULL AND {id_column} < ?", (row_id,)
+    return f" AND (({date_column}, {id_column}) < (?, ?) OR {date_column} IS NULL)", (date, row_id)
+
+def _limit(limit):
+    return -1 if limit is None else limit
+
+# ============ PRODUCT CATALOG CACHE ============
+# Catalogs are cached per (database file, owner); the None owner is the
+# unscoped all-products listing. Every product write below invalidates.
+
+catalog_cache = CatalogCache()
+
+def _load_products(business_owner_id):
     conn = get_connection()
     cursor = conn.cursor()
     if business_owner_id is not None:
-        cursor.execute("SELECT id, name, category, price FROM products WHERE business_owner_id = ?", (business_owner_id,))
+        cursor.execute("SELECT id, name, category, price / 100.0 FROM products WHERE business_owner_id = ?", (business_owner_id,))
     else:
-        cursor.execute("SELECT id, name, category, price FROM products")
-    products = cursor.fetchall()  # list of tuples (id, name, category, price)
+        cursor.execute("SELECT id, name, category, price / 100.0 FROM products")
+    products = cursor.fetchall()  # list of tuples (id, name, category, price in pesos)
     conn.close()
     return products
 
+def _invalidate_catalog(business_owner_id, patch=None):
+    """Invalidate cached catalogs after a product write; patch(index) updates the search indexes in place"""
+    if business_owner_id is None:
+        catalog_cache.invalidate_all()
+        with _search_lock:
+            _search_indexes.clear()
+        return
+    catalog_cache.invalidate((DB_PATH, business_owner_id), (DB_PATH, None))
+    with _search_lock:
+        for key in ((DB_PATH, business_owner_id), (DB_PATH, None)):
+            entry = _search_indexes.get(key)
+            if entry is not None and patch is not None:
+                patch(entry[1])
+            elif entry is not None:
+                del _search_indexes[key]
+
+def get_products(business_owner_id=None):
+    return catalog_cache.get((DB_PATH, business_owner_id), lambda: _load_products(business_owner_id))
+
+# ============ PRODUCT SEARCH ============
+# One ProductSearchIndex per (database file, owner), patched in place by the
+# product writes above and rebuilt after the catalog cache's TTL. Builds and
+# patches share a lock so a write can't slip between a build's read and its
+# registration.
+
+_search_indexes = OrderedDict()   # (DB_PATH, owner) -> (expires_at, ProductSearchIndex)
+_search_lock = threading.Lock()
+
+def get_product_index(business_owner_id=None):
+    """Return the owner's product search index, building it on first use"""
+    key = (DB_PATH, business_owner_id)
+    with _search_lock:
+        entry = _search_indexes.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            entry = (time.monotonic() + catalog_cache.ttl, ProductSearchIndex(_load_products(business_owner_id)))
+            _search_indexes[key] = entry
+            while len(_search_indexes) > catalog_cache.max_owners:
+                _search_indexes.popitem(last=False)
+        _search_indexes.move_to_end(key)
+        return entry[1]
+
+def search_products(business_owner_id, query, category=None, limit=None):
+    """Ranked product search (word prefixes, one-typo tolerance) within an owner's catalog"""
+    index = get_product_index(business_owner_id)
+    with _search_lock:
+        return index.search(query, category, limit)
+
+def get_product_categories(business_owner_id=None):
+    """Category facets for an owner's catalog: {category: product count}"""
+    index = get_product_index(business_owner_id)
+    with _search_lock:
+        return index.categories()
+
 def add_product(name, category, price, business_owner_id=None):
     conn = get_connection()
     cursor = conn.cursor()
+    cents = to_cents(price)
     cursor.execute(
         "INSERT INTO products (name, category, price, business_owner_id) VALUES (?, ?, ?, ?)",
-        (name, category, price, business_owner_id)
+        (name, category, cents, business_owner_id)
     )
+    product = (cursor.lastrowid, name, category, from_cents(cents))
     conn.commit()
     conn.close()
+    _invalidate_catalog(business_owner_id, lambda index: index.add(product))
 
 def delete_product(product_id, business_owner_id=None):
     conn = get_connection()
@@ -229,8 +805,11 @@ def delete_product(product_id, business_owner_id=None):
         cursor.execute("DELETE FROM products WHERE id=? AND business_owner_id = ?", (product_id, business_owner_id))
     else:
         cursor.execute("DELETE FROM products WHERE id=?", (product_id,))
+    deleted = cursor.rowcount > 0
     conn.commit()
     conn.close()
+    if deleted:
+        _invalidate_catalog(business_owner_id, lambda index: index.remove(product_id))
 
 def register_user(username, password, role="staff", business_owner_id=None):
     """Register a new user in the database with hashed password"""
@@ -263,44 +842,74 @@ def update_product(product_id, name, category, price, business_owner_id=None):
     """Update an existing product"""
     conn = get_connection()
     cursor = conn.cursor()
+    cents = to_cents(price)
     if business_owner_id is not None:
         cursor.execute("UPDATE products SET name=?, category=?, price=? WHERE id=? AND business_owner_id = ?",
-                       (name, category, price, product_id, business_owner_id))
+                       (name, category, cents, product_id, business_owner_id))
     else:
         cursor.execute("UPDATE products SET name=?, category=?, price=? WHERE id=?",
-                       (name, category, price, product_id))
+                       (name, category, cents, product_id))
+    updated = cursor.rowcount > 0
     conn.commit()
     conn.close()
+    if updated:
+        _invalidate_catalog(business_owner_id, lambda index: index.update((product_id, name, category, from_cents(cents))))
 
-def save_order(customer_name, order_type, total, items, customer_id=None, business_owner_id=None):
-    """Save an order with its items"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
+def _insert_order(cursor, customer_name, customer_id, business_owner_id, order_type, total,
+                  status, payment_status, items, order_date=None):
+    """Insert an order header and all of its items; returns the new order id (amounts in pesos)"""
     cursor.execute(
         """
-        INSERT INTO orders (customer_name, customer_id, business_owner_id, order_type, total, status, payment_status)
-        VALUES (?, ?, ?, ?, ?, 'confirmed', 'paid')
+        INSERT INTO orders (customer_name, customer_id, business_owner_id, order_type, total, status, payment_status, order_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
         """,
-        (customer_name, customer_id, business_owner_id, order_type, total)
+        (customer_name, customer_id, business_owner_id, order_type, to_cents(total), status, payment_status, order_date)
     )
     order_id = cursor.lastrowid
-    
-    for item in items:
-        cursor.execute("""
-            INSERT INTO order_items (order_id, product_name, category, price, quantity)
-            VALUES (?, ?, ?, ?, ?)
-        """, (order_id, item["name"], item["category"], item["price"], item["quantity"]))
-    
-    conn.commit()
-    conn.close()
+    cursor.executemany("""
+        INSERT INTO order_items (order_id, product_name, category, price, quantity)
+        VALUES (?, ?, ?, ?, ?)
+    """, [(order_id, item["name"], item["category"], to_cents(item["price"]), item["quantity"]) for item in items])
     return order_id
 
-def get_all_orders():
-    """Get all orders with their items"""
+def save_order(customer_name, order_type, total, items, customer_id=None, business_owner_id=None):
+    """Save an order with its items"""
+    with write_transaction() as conn:
+        return _insert_order(conn.cursor(), customer_name, customer_id, business_owner_id, order_type, total,
+                             'confirmed', 'paid', items)
+
+def save_orders(orders, chunk_size=1000):
+    """Bulk-save orders (e.g. imported historical sales) and return their ids.
+
+    Each order is a dict with customer_name, order_type, total and items, and
+    optionally customer_id, business_owner_id, status, payment_status and
+    order_date. Orders are written in transactions of chunk_size orders.
+    """
+    order_ids = []
+    orders = list(orders)
+    for start in range(0, len(orders), chunk_size):
+        with write_transaction() as conn:
+            cursor = conn.cursor()
+            for order in orders[start:start + chunk_size]:
+                order_ids.append(_insert_order(
+                    cursor, order["customer_name"], order.get("customer_id"), order.get("business_owner_id"),
+                    order["order_type"], order["total"], order.get("status", 'confirmed'),
+                    order.get("payment_status", 'paid'), order["items"], order.get("order_date"),
+                ))
+    return order_ids
+
+def get_all_orders(limit=None, after=None):
+    """Get all orders, newest first (keyset-paged by (order_date, id))"""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT id, customer_name, order_type, total, order_date, status, payment_status FROM orders ORDER BY order_date DESC")
+    page_sql, page_params = _keyset("order_date", "id", after)
+    cursor.execute(f"""
+        SELECT id, customer_name, order_type, total / 100.0, order_date, status, payment_status
+        FROM orders
+        WHERE 1 = 1{page_sql}
+        ORDER BY order_date DESC, id DESC
+        LIMIT ?
+    """, (*page_params, _limit(limit)))
     orders = cursor.fetchall()
     conn.close()
     return orders
@@ -309,68 +918,297 @@ def get_order_items(order_id):
     """Get items for a specific order"""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT product_name, category, price, quantity FROM order_items WHERE order_id=?", (order_id,))
+    cursor.execute("SELECT product_name, category, price / 100.0, quantity FROM order_items WHERE order_id=?", (order_id,))
     items = cursor.fetchall()
     conn.close()
     return items
 
-# ============ SUPERADMIN FUNCTIONS ============
-
-def get_all_business_owners():
-    """Get all business owners (owner and staff roles)"""
+def get_order_items_bulk(order_ids):
+    """Get items for many orders in one query: {order_id: [(product_name, category, price, quantity), ...]}"""
+    order_ids = list(order_ids)
+    grouped = {order_id: [] for order_id in order_ids}
+    if not order_ids:
+        return grouped
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT id, username, password, role, created_at FROM users WHERE role IN ('owner', 'staff') ORDER BY created_at DESC")
-    users = cursor.fetchall()
+    # The ids travel as one JSON parameter, so any number of orders is still a single statement
+    cursor.execute("""
+        SELECT order_id, product_name, category, price / 100.0, quantity
+        FROM order_items
+        WHERE order_id IN (SELECT value FROM json_each(?))
+        ORDER BY order_id, id
+    """, (json.dumps(order_ids),))
+    for order_id, product_name, category, price, quantity in cursor.fetchall():
+        grouped[order_id].append((product_name, category, price, quantity))
     conn.close()
-    return users
+    return grouped
 
-def get_total_business_owners():
-    """Get count of business owners"""
+def get_orders_with_items(business_owner_id, status=None, limit=None, after=None):
+    """Get a business owner's orders and their items in one query.
+
+    Returns (orders, items_by_order) where orders has the same rows as
+    get_orders_for_business() and items_by_order maps order id to its items.
+    limit/after page over orders (not item rows) like the other list functions.
+    """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM users WHERE role IN ('owner', 'staff')")
-    count = cursor.fetchone()[0]
+    page_sql, page_params = _keyset("order_date", "id", after)
+    cursor.execute(f"""
+        WITH page AS (
+            SELECT id, customer_name, order_type, total, status, payment_status, order_date, customer_id
+            FROM orders
+            WHERE business_owner_id = ? AND (? IS NULL OR status = ?){page_sql}
+            ORDER BY order_date DESC, id DESC
+            LIMIT ?
+        )
+        SELECT p.id, p.customer_name, p.order_type, p.total / 100.0, p.status, p.payment_status, p.order_date, u.username,
+               oi.product_name, oi.category, oi.price / 100.0, oi.quantity
+        FROM page p
+        LEFT JOIN users u ON p.customer_id = u.id
+        LEFT JOIN order_items oi ON oi.order_id = p.id
+        ORDER BY p.order_date DESC, p.id DESC, oi.id
+    """, (business_owner_id, status, status, *page_params, _limit(limit)))
+    orders = []
+    items_by_order = {}
+    for row in cursor.fetchall():
+        order_id = row[0]
+        if order_id not in items_by_order:
+            orders.append(row[:8])
+            items_by_order[order_id] = []
+        if row[8] is not None:
+            items_by_order[order_id].append(row[8:])
     conn.close()
-    return count
+    return orders, items_by_order
+
+def iter_orders_for_receipts(business_owner_id, start_date, end_date, batch_size=500):
+    """Yield (order, items) for every non-cancelled order dated start_date..end_date ('YYYY-MM-DD', inclusive), oldest first.
+
+    order is (id, customer_name, order_type, total, order_date, payment_status)
+    and items are (product_name, category, price, quantity) tuples. Orders
+    and their items come batch_size orders per query, keyset-paged by
+    (order_date, id) on a freshly checked-out connection each time, so an
+    export of any size neither loads everything nor holds a read open.
+    A None business_owner_id exports every owner's orders.
+    """
+    owner_sql, owner_params = ("business_owner_id = ? AND ", (business_owner_id,)) if business_owner_id is not None else ("", ())
+    page_sql, page_params = "", ()
+    while True:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            WITH page AS (
+                SELECT id, customer_name, order_type, total, order_date, payment_status
+                FROM orders
+                WHERE {owner_sql}order_date >= ? AND order_date < DATE(?, '+1 day')
+                  AND status != 'cancelled'{page_sql}
+                ORDER BY order_date, id
+                LIMIT ?
+            )
+            SELECT p.id, p.customer_name, p.order_type, p.total / 100.0, p.order_date, p.payment_status,
+                   oi.product_name, oi.category, oi.price / 100.0, oi.quantity
+            FROM page p
+            LEFT JOIN order_items oi ON oi.order_id = p.id
+            ORDER BY p.order_date, p.id, oi.id
+        """, (*owner_params, start_date, end_date, *page_params, batch_size))
+        rows = cursor.fetchall()
+        conn.close()
+        if not rows:
+            return
+        order, items = None, []
+        for row in rows:
+            if order is None or row[0] != order[0]:
+                if order is not None:
+                    yield order, items
+                order, items = row[:6], []
+            if row[6] is not None:
+                items.append(row[6:])
+        yield order, items
+        page_sql, page_params = " AND (order_date, id) > (?, ?)", (order[4], order[0])
+
+# ============ RECEIPT ARTIFACTS ============
+# One row per stored receipt: which order, in what format, rendered from
+# which content (content_hash) into which bytes (blob_sha256).
+
+def get_receipt_artifact(order_id, fmt, content_hash):
+    """The stored receipt for this content: (blob_sha256, size), or None if there isn't one"""
+    conn = get_connection()
+    row = conn.execute("""
+        SELECT blob_sha256, size FROM receipt_artifacts
+        WHERE order_id = ? AND format = ? AND content_hash = ?
+    """, (order_id, fmt, content_hash)).fetchone()
+    conn.close()
+    return row
+
+def count_receipt_reprint(order_id, fmt, content_hash):
+    """Count a re-print served from the stored bytes (a re-render is counted by record_receipt_artifact)"""
+    with write_transaction() as conn:
+        conn.execute("""
+            UPDATE receipt_artifacts SET print_count = print_count + 1, last_printed_at = CURRENT_TIMESTAMP
+            WHERE order_id = ? AND format = ? AND content_hash = ?
+        """, (order_id, fmt, content_hash))
+
+def record_receipt_artifact(order_id, fmt, content_hash, blob_sha256, size):
+    """Index a newly rendered receipt; returns the blob it replaced for the same content, if any.
+
+    Re-rendering content that's already indexed (its blob went missing, or
+    two workers rendered it at once) points the row at the newest bytes.
+    """
+    with write_transaction() as conn:
+        previous = conn.execute(
+            "SELECT blob_sha256 FROM receipt_artifacts WHERE order_id = ? AND format = ? AND content_hash = ?",
+            (order_id, fmt, content_hash)).fetchone()
+        conn.execute("""
+            INSERT INTO receipt_artifacts (order_id, format, content_hash, blob_sha256, size)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (order_id, format, content_hash) DO UPDATE SET
+                blob_sha256 = excluded.blob_sha256, size = excluded.size,
+                print_count = print_count + 1, last_printed_at = CURRENT_TIMESTAMP
+        """, (order_id, fmt, content_hash, blob_sha256, size))
+    return previous[0] if previous else None
 
-def get_total_customers():
-    """Get count of all customers"""
+def count_blob_references(blob_sha256):
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'customer'")
-    count = cursor.fetchone()[0]
+    count = conn.execute("SELECT COUNT(*) FROM receipt_artifacts WHERE blob_sha256 = ?", (blob_sha256,)).fetchone()[0]
     conn.close()
     return count
 
-def get_total_sales():
-    """Get total sales amount"""
+def get_receipt_artifacts(order_id):
+    """Stored receipts for an order, newest first: (format, content_hash, blob_sha256, size, print_count, created_at, last_printed_at)"""
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT format, content_hash, blob_sha256, size, print_count, created_at, last_printed_at
+        FROM receipt_artifacts
+        WHERE order_id = ?
+        ORDER BY id DESC
+    """, (order_id,)).fetchall()
+    conn.close()
+    return rows
+
+def get_order_counts_for_business(business_owner_id):
+    """Get {status: count} for a business owner's orders without loading them"""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT COALESCE(SUM(total), 0) FROM orders WHERE payment_status = 'paid'")
-    total = cursor.fetchone()[0]
+    cursor.execute("SELECT status, COUNT(*) FROM orders WHERE business_owner_id = ? GROUP BY status", (business_owner_id,))
+    counts = dict(cursor.fetchall())
     conn.close()
-    return total
+    return counts
+
+# Marks around matched words in search_orders() highlights
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+_ORDER_NUMBER_RE = re.compile(r"#?(\d+)")
+
+def _order_search_query(query):
+    """Turn what the user typed into an FTS5 query: every word, as a prefix"""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+def search_orders(business_owner_id, query, limit=20, after=None):
+    """Search orders by customer name, product name or order number, newest first.
+
+    Rows are get_all_orders() rows plus highlighted customer and product
+    names (matches wrapped in HIGHLIGHT_START/HIGHLIGHT_END), keyset-paged
+    by (order_date, id). business_owner_id=None searches every order.
+    A query that is an order number ("123" or "#123") puts that order first
+    on the first page and leaves it out of every page's text matches, so a
+    page never has more than limit rows and the order is never repeated.
+    """
+    fts_query = _order_search_query(query)
+    if not fts_query:
+        return []
+    owner_sql, owner_params = ("", ()) if business_owner_id is None else (" AND o.business_owner_id = ?", (business_owner_id,))
+    page_sql, page_params = _keyset("o.order_date", "o.id", after)
+    conn = get_connection()
+    cursor = conn.cursor()
 
-def get_sales_by_date(days=7):
-    """Get sales data for the last N days"""
+    exact, exact_sql, exact_params = None, "", ()
+    number = _ORDER_NUMBER_RE.fullmatch(query.strip())
+    if number:
+        order_id = int(number.group(1))
+        exact_sql, exact_params = " AND o.id != ?", (order_id,)
+        if after is None:
+            cursor.execute(f"""
+                SELECT o.id, o.customer_name, o.order_type, o.total / 100.0, o.order_date, o.status, o.payment_status,
+                       COALESCE(o.customer_name, ''), COALESCE({_ORDER_PRODUCTS_SQL.format(order_id="o.id")}, '')
+                FROM orders o
+                WHERE o.id = ?{owner_sql}
+            """, (order_id, *owner_params))
+            exact = cursor.fetchone()
+    if exact is not None and limit is not None:
+        limit -= 1
+
+    cursor.execute(f"""
+        SELECT o.id, o.customer_name, o.order_type, o.total / 100.0, o.order_date, o.status, o.payment_status,
+               highlight(order_search, 0, ?, ?), highlight(order_search, 1, ?, ?)
+        FROM order_search
+        JOIN orders o ON o.id = order_search.rowid
+        WHERE order_search MATCH ?{owner_sql}{exact_sql}{page_sql}
+        ORDER BY o.order_date DESC, o.id DESC
+        LIMIT ?
+    """, (HIGHLIGHT_START, HIGHLIGHT_END, HIGHLIGHT_START, HIGHLIGHT_END, fts_query,
+          *owner_params, *exact_params, *page_params, _limit(limit)))
+    orders = cursor.fetchall()
+    conn.close()
+    return orders if exact is None else [exact] + orders
+
+# ============ SUPERADMIN FUNCTIONS ============
+
+def get_all_business_owners(limit=None, after=None):
+    """Get all business owners (owner and staff roles), keyset-paged by (created_at, id)"""
     conn = get_connection()
     cursor = conn.cursor()
+    page_sql, page_params = _keyset("created_at", "id", after, nullable=True)
+    cursor.execute(f"""
+        SELECT id, username, password, role, created_at
+        FROM users
+        WHERE role IN ('owner', 'staff'){page_sql}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """, (*page_params, _limit(limit)))
+    users = cursor.fetchall()
+    conn.close()
+    return users
+
+def _total_business_owners(cursor):
+    cursor.execute("SELECT COUNT(*) FROM users WHERE role IN ('owner', 'staff')")
+    return cursor.fetchone()[0]
+
+def get_total_business_owners():
+    """Get count of business owners"""
+    return _read_analytics(_total_business_owners)
+
+def _total_customers(cursor):
+    cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'customer'")
+    return cursor.fetchone()[0]
+
+def get_total_customers():
+    """Get count of all customers"""
+    return _read_analytics(_total_customers)
+
+def _total_sales(cursor):
+    cursor.execute("SELECT COALESCE(SUM(revenue), 0) / 100.0 FROM daily_sales WHERE payment_status = 'paid'")
+    return cursor.fetchone()[0]
+
+def get_total_sales():
+    """Get total sales amount"""
+    return _read_analytics(_total_sales)
+
+def _sales_by_date(cursor, days=7):
     cursor.execute("""
-        SELECT DATE(order_date) as date, SUM(total) as total_sales
-        FROM orders 
-        WHERE payment_status = 'paid' AND order_date >= date('now', ?)
-        GROUP BY DATE(order_date)
+        SELECT day as date, SUM(revenue) / 100.0 as total_sales
+        FROM daily_sales
+        WHERE payment_status = 'paid' AND day >= date('now', ?)
+        GROUP BY day
         ORDER BY date ASC
     """, (f'-{days} days',))
-    sales = cursor.fetchall()
-    conn.close()
-    return sales
+    return cursor.fetchall()
 
-def get_customers_by_date(days=7):
-    """Get new customers count for the last N days"""
-    conn = get_connection()
-    cursor = conn.cursor()
+def get_sales_by_date(days=7):
+    """Get sales data for the last N days"""
+    return _read_analytics(_sales_by_date, days)
+
+def _customers_by_date(cursor, days=7):
     cursor.execute("""
         SELECT DATE(created_at) as date, COUNT(*) as count
         FROM users 
@@ -378,9 +1216,11 @@ def get_customers_by_date(days=7):
         GROUP BY DATE(created_at)
         ORDER BY date ASC
     """, (f'-{days} days',))
-    customers = cursor.fetchall()
-    conn.close()
-    return customers
+    return cursor.fetchall()
+
+def get_customers_by_date(days=7):
+    """Get new customers count for the last N days"""
+    return _read_analytics(_customers_by_date, days)
 
 def delete_user(user_id):
     """Delete a user"""
@@ -440,26 +1280,35 @@ def create_customer(username, password, business_owner_id):
         conn.close()
         return False, f"Error: {str(e)}"
 
-def get_customers_for_business(business_owner_id):
-    """Get all customers for a specific business owner"""
+def get_customers_for_business(business_owner_id, limit=None, after=None):
+    """Get all customers for a specific business owner, keyset-paged by (created_at, id)"""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT id, username, password, created_at FROM users WHERE role='customer' AND business_owner_id=? ORDER BY created_at DESC", (business_owner_id,))
+    page_sql, page_params = _keyset("created_at", "id", after, nullable=True)
+    cursor.execute(f"""
+        SELECT id, username, password, created_at
+        FROM users
+        WHERE role='customer' AND business_owner_id=?{page_sql}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """, (business_owner_id, *page_params, _limit(limit)))
     customers = cursor.fetchall()
     conn.close()
     return customers
 
-def get_orders_for_business(business_owner_id):
-    """Get all orders for a business owner"""
+def get_orders_for_business(business_owner_id, limit=None, after=None):
+    """Get all orders for a business owner, keyset-paged by (order_date, id)"""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT o.id, o.customer_name, o.order_type, o.total, o.status, o.payment_status, o.order_date, u.username
+    page_sql, page_params = _keyset("o.order_date", "o.id", after)
+    cursor.execute(f"""
+        SELECT o.id, o.customer_name, o.order_type, o.total / 100.0, o.status, o.payment_status, o.order_date, u.username
         FROM orders o
         LEFT JOIN users u ON o.customer_id = u.id
-        WHERE o.business_owner_id = ?
-        ORDER BY o.order_date DESC
-    """, (business_owner_id,))
+        WHERE o.business_owner_id = ?{page_sql}
+        ORDER BY o.order_date DESC, o.id DESC
+        LIMIT ?
+    """, (business_owner_id, *page_params, _limit(limit)))
     orders = cursor.fetchall()
     conn.close()
     return orders
@@ -469,7 +1318,7 @@ def get_pending_orders_for_business(business_owner_id):
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT o.id, o.customer_name, o.order_type, o.total, o.status, o.payment_status, o.order_date, u.username
+        SELECT o.id, o.customer_name, o.order_type, o.total / 100.0, o.status, o.payment_status, o.order_date, u.username
         FROM orders o
         LEFT JOIN users u ON o.customer_id = u.id
         WHERE o.business_owner_id = ? AND o.status = 'pending'
@@ -515,7 +1364,7 @@ def get_business_sales(business_owner_id):
     """Get total sales for a business owner"""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT COALESCE(SUM(total), 0) FROM orders WHERE business_owner_id = ? AND payment_status = 'paid'", (business_owner_id,))
+    cursor.execute("SELECT COALESCE(SUM(total), 0) / 100.0 FROM orders WHERE business_owner_id = ? AND payment_status = 'paid'", (business_owner_id,))
     total = cursor.fetchone()[0]
     conn.close()
     return total
@@ -538,17 +1387,14 @@ def delete_customer(customer_id, business_owner_id=None):
 
 def get_products_for_customer(business_owner_id):
     """Get products for a specific business owner"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, name, category, price FROM products WHERE business_owner_id = ?", (business_owner_id,))
-    products = cursor.fetchall()
-    conn.close()
-    return products
+    return get_products(business_owner_id)
 
 def seed_default_products_for_owner(owner_id):
     """Seed a comprehensive default coffee-shop product catalog for an owner (skips if products already exist)"""
     conn = get_connection()
     cursor = conn.cursor()
+    # Check and insert under one write lock so a double click can't seed twice
+    cursor.execute("BEGIN IMMEDIATE")
     cursor.execute("SELECT COUNT(*) FROM products WHERE business_owner_id = ?", (owner_id,))
     if cursor.fetchone()[0] > 0:
         conn.close()
@@ -627,13 +1473,13 @@ def seed_default_products_for_owner(owner_id):
         ("Taro Milk Tea", "Specialty", 165.00),
     ]
 
-    for name, category, price in default_products:
-        cursor.execute(
-            "INSERT INTO products (name, category, price, business_owner_id) VALUES (?, ?, ?, ?)",
-            (name, category, price, owner_id),
-        )
+    cursor.executemany(
+        "INSERT INTO products (name, category, price, business_owner_id) VALUES (?, ?, ?, ?)",
+        [(name, category, to_cents(price), owner_id) for name, category, price in default_products],
+    )
     conn.commit()
     conn.close()
+    _invalidate_catalog(owner_id)
     return True, f"{len(default_products)} default products added successfully!"
 
 def get_best_sellers(business_owner_id=None, limit=3):
@@ -642,7 +1488,7 @@ def get_best_sellers(business_owner_id=None, limit=3):
     cursor = conn.cursor()
     if business_owner_id:
         cursor.execute("""
-            SELECT oi.product_name, oi.category, oi.price, SUM(oi.quantity) as total_sold
+            SELECT oi.product_name, oi.category, oi.price / 100.0, SUM(oi.quantity) as total_sold
             FROM order_items oi
             JOIN orders o ON oi.order_id = o.id
             WHERE o.business_owner_id = ? AND oi.category = 'Coffee'
@@ -652,7 +1498,7 @@ def get_best_sellers(business_owner_id=None, limit=3):
         """, (business_owner_id, limit))
     else:
         cursor.execute("""
-            SELECT oi.product_name, oi.category, oi.price, SUM(oi.quantity) as total_sold
+            SELECT oi.product_name, oi.category, oi.price / 100.0, SUM(oi.quantity) as total_sold
             FROM order_items oi
             WHERE oi.category = 'Coffee'
             GROUP BY oi.product_name
@@ -665,35 +1511,22 @@ def get_best_sellers(business_owner_id=None, limit=3):
 
 def place_customer_order(customer_id, customer_name, business_owner_id, order_type, total, items):
     """Place an order as a customer"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO orders (customer_name, customer_id, business_owner_id, order_type, total, status, payment_status)
-        VALUES (?, ?, ?, ?, ?, 'pending', 'unpaid')
-    """, (customer_name, customer_id, business_owner_id, order_type, total))
-    order_id = cursor.lastrowid
-    
-    for item in items:
-        cursor.execute("""
-            INSERT INTO order_items (order_id, product_name, category, price, quantity)
-            VALUES (?, ?, ?, ?, ?)
-        """, (order_id, item["name"], item["category"], item["price"], item["quantity"]))
-    
-    conn.commit()
-    conn.close()
-    return order_id
+    with write_transaction() as conn:
+        return _insert_order(conn.cursor(), customer_name, customer_id, business_owner_id, order_type, total,
+                             'pending', 'unpaid', items)
 
-def get_customer_orders(customer_id):
-    """Get order history for a customer"""
+def get_customer_orders(customer_id, limit=None, after=None):
+    """Get order history for a customer, keyset-paged by (order_date, id)"""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id, customer_name, order_type, total, status, payment_status, order_date
+    page_sql, page_params = _keyset("order_date", "id", after)
+    cursor.execute(f"""
+        SELECT id, customer_name, order_type, total / 100.0, status, payment_status, order_date
         FROM orders
-        WHERE customer_id = ?
-        ORDER BY order_date DESC
-    """, (customer_id,))
+        WHERE customer_id = ?{page_sql}
+        ORDER BY order_date DESC, id DESC
+        LIMIT ?
+    """, (customer_id, *page_params, _limit(limit)))
     orders = cursor.fetchall()
     conn.close()
     return orders
@@ -719,105 +1552,135 @@ def login_user(username, password):
 
 # ============ SUPERADMIN ANALYTICS FUNCTIONS ============
 
-def get_orders_by_date(days=30):
-    """Get orders count for the last N days"""
-    conn = get_connection()
-    cursor = conn.cursor()
+def _orders_by_date(cursor, days=30):
     cursor.execute("""
-        SELECT DATE(order_date) as date, COUNT(*) as count
-        FROM orders 
-        WHERE order_date >= date('now', ?)
-        GROUP BY DATE(order_date)
+        SELECT day as date, SUM(order_count) as count
+        FROM daily_sales
+        WHERE day >= date('now', ?)
+        GROUP BY day
         ORDER BY date ASC
     """, (f'-{days} days',))
-    orders = cursor.fetchall()
-    conn.close()
-    return orders
+    return cursor.fetchall()
 
-def get_top_business_owners(limit=5):
-    """Get top performing business owners by sales"""
-    conn = get_connection()
-    cursor = conn.cursor()
+def get_orders_by_date(days=30):
+    """Get orders count for the last N days"""
+    return _read_analytics(_orders_by_date, days)
+
+def _top_business_owners(cursor, limit=5):
     cursor.execute("""
-        SELECT u.username, COALESCE(SUM(o.total), 0) as total_sales, COUNT(o.id) as order_count
+        SELECT u.username, COALESCE(SUM(d.revenue), 0) / 100.0 as total_sales, COALESCE(SUM(d.order_count), 0) as order_count
         FROM users u
-        LEFT JOIN orders o ON u.id = o.business_owner_id AND o.payment_status = 'paid'
+        LEFT JOIN daily_sales d ON u.id = d.business_owner_id AND d.payment_status = 'paid'
         WHERE u.role IN ('owner', 'staff')
         GROUP BY u.id
         ORDER BY total_sales DESC
         LIMIT ?
     """, (limit,))
-    owners = cursor.fetchall()
-    conn.close()
-    return owners
+    return cursor.fetchall()
 
-def get_order_status_distribution():
-    """Get distribution of order statuses"""
-    conn = get_connection()
-    cursor = conn.cursor()
+def get_top_business_owners(limit=5):
+    """Get top performing business owners by sales"""
+    return _read_analytics(_top_business_owners, limit)
+
+def _order_status_distribution(cursor):
     cursor.execute("""
-        SELECT status, COUNT(*) as count
-        FROM orders
+        SELECT status, SUM(order_count) as count
+        FROM daily_sales
         GROUP BY status
     """)
-    distribution = cursor.fetchall()
-    conn.close()
-    return distribution
+    return cursor.fetchall()
 
-def get_monthly_revenue(months=6):
-    """Get monthly revenue for the last N months"""
-    conn = get_connection()
-    cursor = conn.cursor()
+def get_order_status_distribution():
+    """Get distribution of order statuses"""
+    return _read_analytics(_order_status_distribution)
+
+def _monthly_revenue(cursor, months=6):
     cursor.execute("""
-        SELECT strftime('%Y-%m', order_date) as month, SUM(total) as revenue
-        FROM orders 
-        WHERE payment_status = 'paid' AND order_date >= date('now', ?)
-        GROUP BY strftime('%Y-%m', order_date)
+        SELECT strftime('%Y-%m', day) as month, SUM(revenue) / 100.0 as revenue
+        FROM daily_sales
+        WHERE payment_status = 'paid' AND day >= date('now', ?)
+        GROUP BY month
         ORDER BY month ASC
     """, (f'-{months} months',))
-    revenue = cursor.fetchall()
-    conn.close()
-    return revenue
+    return cursor.fetchall()
+
+def get_monthly_revenue(months=6):
+    """Get monthly revenue for the last N months"""
+    return _read_analytics(_monthly_revenue, months)
+
+def _total_orders(cursor):
+    cursor.execute("SELECT COALESCE(SUM(order_count), 0) FROM daily_sales")
+    return cursor.fetchone()[0]
 
 def get_total_orders():
     """Get total number of orders"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM orders")
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return _read_analytics(_total_orders)
+
+def _total_products(cursor):
+    cursor.execute("SELECT COUNT(*) FROM products")
+    return cursor.fetchone()[0]
 
 def get_total_products():
     """Get total number of products"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM products")
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return _read_analytics(_total_products)
 
-def get_top_selling_products(limit=5):
-    """Get top selling products across all business owners"""
-    conn = get_connection()
-    cursor = conn.cursor()
+def _top_selling_products(cursor, limit=5):
     cursor.execute("""
-        SELECT oi.product_name, SUM(oi.quantity) as total_sold, SUM(oi.price * oi.quantity) as total_revenue
-        FROM order_items oi
-        JOIN orders o ON oi.order_id = o.id
-        WHERE o.payment_status = 'paid'
-        GROUP BY oi.product_name
+        SELECT product_name, SUM(units) as total_sold, SUM(revenue) / 100.0 as total_revenue
+        FROM daily_product_sales
+        WHERE payment_status = 'paid'
+        GROUP BY product_name
         ORDER BY total_sold DESC
         LIMIT ?
     """, (limit,))
-    products = cursor.fetchall()
-    conn.close()
-    return products
-
+    return cursor.fetchall()
 
-# Run setup on import
-create_table()
-add_default_users()
-create_products_table()
-add_default_products()
-create_orders_table()
+def get_top_selling_products(limit=5):
+    """Get top selling products across all business owners"""
+    return _read_analytics(_top_selling_products, limit)
+
+# ============ PLATFORM SNAPSHOT ============
+
+@dataclass(frozen=True)
+class PlatformSnapshot:
+    """Everything the superadmin dashboard shows, read at a single point in time"""
+    total_owners: int
+    total_customers: int
+    total_sales: float
+    total_orders: int
+    total_products: int
+    sales_by_date: list       # [(day, revenue)]
+    customers_by_date: list   # [(day, new customers)]
+    orders_by_date: list      # [(day, orders)]
+    monthly_revenue: list     # [(YYYY-MM, revenue)]
+    status_distribution: list # [(status, orders)]
+    top_owners: list          # [(username, revenue, orders)]
+    top_products: list        # [(product_name, units, revenue)]
+    load_ms: float            # wall time spent building the snapshot
+
+def get_platform_snapshot(days=7, months=6, top_n=5):
+    """Compute every dashboard KPI, series and top list in one read transaction"""
+    start = time.perf_counter()
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    try:
+        # Under WAL the first read pins the snapshot; every query below sees the same data
+        cursor.execute("BEGIN")
+        values = dict(
+            total_owners=_total_business_owners(cursor),
+            total_customers=_total_customers(cursor),
+            total_sales=_total_sales(cursor),
+            total_orders=_total_orders(cursor),
+            total_products=_total_products(cursor),
+            sales_by_date=_sales_by_date(cursor, days),
+            customers_by_date=_customers_by_date(cursor, days),
+            orders_by_date=_orders_by_date(cursor, days),
+            monthly_revenue=_monthly_revenue(cursor, months),
+            status_distribution=_order_status_distribution(cursor),
+            top_owners=_top_business_owners(cursor, top_n),
+            top_products=_top_selling_products(cursor, top_n),
+        )
+    finally:
+        conn.rollback()
+        conn.close()
+    return PlatformSnapshot(load_ms=(time.perf_counter() - start) * 1000, **values)
@@ -1,19 +1,43 @@
 import sqlite3
 import os
+import threading
+from connection_pool import get_pool
 
 # Database path - use a new database file
 DB_FILE = "coffeestry_pos.db"
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), DB_FILE)
 
+def _pool():
+    return get_pool(DB_PATH, row_factory=sqlite3.Row)  # Enable column access by name
+
 def get_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
-    return conn
+    """Get a pooled database connection; conn.close() hands it back to the pool"""
+    init()
+    return _pool().acquire()
+
+def connection():
+    """Context manager over a pooled connection (commits on success, rolls back on error)"""
+    init()
+    return _pool().connection()
+
+# Tables and default data are created on first use, not at import
+_initialized = False
+_init_lock = threading.Lock()
+
+def init():
+    """Initialize the database once (safe to call repeatedly)"""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized:
+            init_database()
+            add_default_data()
+            _initialized = True
 
 def init_database():
     """Initialize all database tables"""
-    conn = get_connection()
+    conn = _pool().acquire()
     cursor = conn.cursor()
 
     # Create users table
@@ -68,7 +92,7 @@ def init_database():
 
 def add_default_data():
     """Add default users and products if they don't exist"""
-    conn = get_connection()
+    conn = _pool().acquire()
     cursor = conn.cursor()
 
     # Check if default owner exists
@@ -216,11 +240,10 @@ def save_order(customer_name, order_type, total, items):
                    (customer_name, order_type, total))
     order_id = cursor.lastrowid
     
-    for item in items:
-        cursor.execute("""
-            INSERT INTO order_items (order_id, product_name, category, price, quantity)
-            VALUES (?, ?, ?, ?, ?)
-        """, (order_id, item["name"], item["category"], item["price"], item["quantity"]))
+    cursor.executemany("""
+        INSERT INTO order_items (order_id, product_name, category, price, quantity)
+        VALUES (?, ?, ?, ?, ?)
+    """, [(order_id, item["name"], item["category"], item["price"], item["quantity"]) for item in items])
     
     conn.commit()
     conn.close()
@@ -235,8 +258,3 @@ def get_all_orders():
     rows = cursor.fetchall()
     conn.close()
     return rows
-
-# ==================== INITIALIZE ====================
-# Initialize database when module is imported
-init_database()
-add_default_data()
@@ -1,17 +1,36 @@
 import sqlite3
 import os
+import threading
 
 # Database path - use absolute path for consistency
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "coffeestry.db")
 
+def _connect():
+    return sqlite3.connect(DB_PATH)
+
 def get_connection():
     """Get database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    return conn
+    init()
+    return _connect()
+
+# Tables and default data are created on first use, not at import
+_initialized = False
+_init_lock = threading.Lock()
+
+def init():
+    """Initialize the database once (safe to call repeatedly)"""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized:
+            init_database()
+            add_default_data()
+            _initialized = True
 
 def init_database():
     """Initialize all database tables"""
-    conn = get_connection()
+    conn = _connect()
     cursor = conn.cursor()
 
     # Create users table
@@ -66,7 +85,7 @@ def init_database():
 
 def add_default_data():
     """Add default users and products if they don't exist"""
-    conn = get_connection()
+    conn = _connect()
     cursor = conn.cursor()
 
     # Default users
@@ -201,7 +220,3 @@ def get_all_orders():
     rows = cursor.fetchall()
     conn.close()
     return rows
-
-# Initialize database on import
-init_database()
-add_default_data()
@@ -0,0 +1,38 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """Stands in for a module and imports it the first time one of its attributes is used.
+
+    For modules most sessions never touch (receipt rendering pulls in
+    ReportLab, zipfile and multiprocessing), so starting the app doesn't pay
+    for them. Safe to first use from several threads at once.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_import(name):
+    """A LazyModule for name: `receipts = lazy_import("receipts")` instead of `import receipts`"""
+    return LazyModule(name)
@@ -1,25 +1,33 @@
 import flet as ft 
 from database import (get_connection, add_product, get_products, delete_product, register_user, 
-                      check_username_exists, update_product, save_order, get_all_orders, get_order_items,
-                      get_all_business_owners, get_total_business_owners, get_total_customers, get_total_sales,
-                      get_sales_by_date, get_customers_by_date, delete_user, update_user, get_user_by_id,
-                      create_customer, get_customers_for_business, get_orders_for_business, get_pending_orders_for_business,
+                      check_username_exists, update_product, save_order, get_all_orders,
+                      get_all_business_owners, delete_user, update_user, get_user_by_id,
+                      create_customer, get_customers_for_business,
                       confirm_order, complete_order, cancel_order, mark_order_paid, get_business_sales, delete_customer,
                       get_products_for_customer, get_best_sellers, place_customer_order, get_customer_orders,
-                      get_customer_business_owner, login_user, get_orders_by_date, get_top_business_owners,
-                      get_order_status_distribution, get_monthly_revenue, get_total_orders, get_total_products,
-                      get_top_selling_products, seed_default_products_for_owner)
+                      get_customer_business_owner, login_user, get_platform_snapshot, search_products,
+                      search_orders, HIGHLIGHT_START, HIGHLIGHT_END,
+                      seed_default_products_for_owner, init as init_database,
+                      get_order_items_bulk, get_orders_with_items, get_order_counts_for_business,
+                      iter_orders_for_receipts)
 from prod import products
 from flet import TextField, ElevatedButton, Text, Row, Column 
 from datetime import datetime
-import random
-import string
+import re
+from search_pipeline import DebouncedSearch
+from row_cache import KeyedRowCache
+from cart import Cart, CartError
+from lazy import lazy_import
+from router import ViewRouter
+import assets
 import os
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+import threading
+
+# Imported on first use: most sessions never save a receipt or pay by QR
+receipts = lazy_import("receipts")            # ReportLab, zipfile, process pools
+receipt_store = lazy_import("receipt_store")
+random = lazy_import("random")
+string = lazy_import("string")
 
 # ============ TOAST NOTIFICATION HELPER ============
 def show_toast(page, message, toast_type="info", duration=3000):
@@ -52,6 +60,52 @@ def show_toast(page, message, toast_type="info", duration=3000):
     page.snack_bar.open = True
     page.update()
 
+# ============ PAGED LISTS ============
+# Long tables (order history, users) load PAGE_SIZE rows at a time using the
+# keyset (limit/after) parameters of the database list functions.
+PAGE_SIZE = 50
+
+def paged_loader(page, fetch_page, cursor_of, on_rows, page_size=PAGE_SIZE):
+    """Infinite-scroll helper for keyset-paged tables.
+
+    fetch_page(limit, after) returns the next rows, cursor_of(row) gives the
+    (date, id) cursor of a row and on_rows(rows) renders a page. Returns
+    (load_more, on_scroll, more_button): call load_more() once for the first
+    page, hook on_scroll to the scrolling Column and place more_button below
+    the table (it stays visible while more rows remain).
+    """
+    state = {"after": None, "done": False, "loading": False}
+    more_button = ft.TextButton("Load more", icon=ft.Icons.EXPAND_MORE, visible=False)
+
+    def load_more():
+        if state["done"]:
+            return
+        rows = fetch_page(page_size + 1, state["after"])  # one extra row tells us if there is more
+        state["done"] = len(rows) <= page_size
+        rows = rows[:page_size]
+        if rows:
+            state["after"] = cursor_of(rows[-1])
+        more_button.visible = not state["done"]
+        on_rows(rows)
+
+    def load_more_and_update(e=None):
+        # Scroll events arrive in bursts; ignore them while a page is loading
+        if state["done"] or state["loading"]:
+            return
+        state["loading"] = True
+        try:
+            load_more()
+            page.update()
+        finally:
+            state["loading"] = False
+
+    def on_scroll(e):
+        if e.pixels >= e.max_scroll_extent - 200:
+            load_more_and_update()
+
+    more_button.on_click = load_more_and_update
+    return load_more, on_scroll, more_button
+
 # ============ PRODUCT CATEGORIES ============
 PRODUCT_CATEGORIES = [
     "Coffee",
@@ -82,6 +136,19 @@ TEXT_LIGHT = "#8B7355"        # Light brown text
 SUCCESS = "#4CAF50"           # Green for success
 ERROR = "#E57373"             # Soft red for errors
 
+# ============ SEARCH HIGHLIGHTS ============
+def highlighted_text(text, size=None, color=TEXT_DARK):
+    """ft.Text for a search_orders() highlight, with the matched words in bold"""
+    spans = []
+    for i, part in enumerate(re.split(f"[{HIGHLIGHT_START}{HIGHLIGHT_END}]", text)):
+        if part:
+            matched = i % 2 == 1
+            spans.append(ft.TextSpan(part, ft.TextStyle(
+                weight=ft.FontWeight.BOLD if matched else None,
+                bgcolor=ACCENT_CREAM if matched else None,
+            )))
+    return ft.Text(spans=spans, size=size, color=color)
+
 def main(page: ft.Page):
     page.title = "Coffeestry System"
     page.bgcolor = BG_LIGHT
@@ -89,7 +156,9 @@ def main(page: ft.Page):
     page.window_resizable = True
     page.vertical_alignment = ft.MainAxisAlignment.CENTER
     page.theme_mode = ft.ThemeMode.LIGHT
-    page.fonts = {"Poppins": "https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&display=swap"}
+
+    # Migrate the schema once the window exists (cheap when already current)
+    init_database()
 
     # Store the last save path for receipts (default to receipts folder)
     default_receipts_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "receipts")
@@ -97,6 +166,61 @@ def main(page: ft.Page):
         os.makedirs(default_receipts_folder)
     last_save_path = {"path": default_receipts_folder}  # Using dict to allow modification in nested functions
 
+    # Receipts render on background workers so saving one never freezes the POS
+    receipt_service = {"service": None}  # Started by the first receipt saved
+    receipt_service_lock = threading.Lock()  # Handlers run on several threads: start only one service
+
+    def get_receipt_service():
+        if receipt_service["service"] is None:
+            with receipt_service_lock:
+                if receipt_service["service"] is None:
+                    # COFFEESTRY_RECEIPT_FORMAT picks pdf/text/escpos; re-prints come from the receipt store
+                    receipt_service["service"] = receipts.ReceiptService(render=receipts.get_renderer(),
+                                                                         store=receipt_store.ReceiptStore())
+        return receipt_service["service"]
+
+    def save_receipt(receipt, folder):
+        last_save_path["path"] = folder
+
+        def receipt_done(future):
+            try:
+                filepath = future.result()
+            except Exception as ex:
+                page.snack_bar = ft.SnackBar(
+                    content=ft.Row([
+                        ft.Icon(ft.Icons.ERROR, color=ACCENT_CREAM, size=20),
+                        ft.Text(f"Error saving receipt: {str(ex)}", color=ACCENT_CREAM),
+                    ], spacing=10),
+                    bgcolor=ERROR,
+                    duration=4000,
+                )
+            else:
+                page.snack_bar = ft.SnackBar(
+                    content=ft.Row([
+                        ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM, size=20),
+                        ft.Column([
+                            ft.Text("Receipt saved to:", color=ACCENT_CREAM, size=11),
+                            ft.Text(filepath, color=ACCENT_CREAM, size=12, weight=ft.FontWeight.W_500),
+                        ], spacing=0, expand=True),
+                    ], spacing=10),
+                    bgcolor=SUCCESS,
+                    duration=5000,
+                )
+            page.snack_bar.open = True
+            page.update()
+
+        get_receipt_service().submit(receipt, folder, on_done=receipt_done)
+        page.snack_bar = ft.SnackBar(
+            content=ft.Row([
+                ft.Icon(ft.Icons.HOURGLASS_TOP, color=ACCENT_CREAM, size=20),
+                ft.Text("Saving receipt...", color=ACCENT_CREAM),
+            ], spacing=10),
+            bgcolor=PRIMARY_MID,
+            duration=2000,
+        )
+        page.snack_bar.open = True
+        page.update()
+
     page.appbar = ft.AppBar(
         title=ft.Text("Coffeestry System", size=18, color=ACCENT_CREAM, weight=ft.FontWeight.W_600),
         center_title=True,
@@ -107,6 +231,7 @@ def main(page: ft.Page):
     # HOME PAGE
     def layout1():
         page.clean()
+        page.on_route_change = None  # the signed-out session's views
 
         main_container = ft.Container(expand=True, bgcolor=BG_LIGHT)
 
@@ -115,7 +240,7 @@ def main(page: ft.Page):
         home_content = ft.Column(
             [
                 ft.Container(
-                    content=ft.Image(src="source/logo.png", width=400, height=300, fit=ft.ImageFit.CONTAIN),
+                    content=ft.Image(src=assets.image_src("logo.png", 400, 300), width=400, height=300, fit=ft.ImageFit.CONTAIN),
                     alignment=ft.alignment.top_center,
                     margin=ft.margin.only(top=5, bottom=5),
                 ),
@@ -662,7 +787,7 @@ def main(page: ft.Page):
                 if e.control:
                     print("Selected Order Type:", e.control.value)
 
-            cart_items = []
+            cart = Cart()
             customer_name_field = ft.TextField(
                 hint_text="Enter customer name",
                 bgcolor=BG_CARD,
@@ -744,41 +869,60 @@ def main(page: ft.Page):
                 data_row_color={ft.ControlState.HOVERED: ft.Colors.with_opacity(0.1, ACCENT_WARM)},
             )
 
-            def update_cart_table():
-                total = 0
-                rows = []
-                
-                for i, item in enumerate(cart_items):
-                    total_item = item["price"] * item["quantity"]
-                    total += total_item
+            cart_rows = {}  # product id -> (DataRow, qty Text, line total Text)
 
-                    def remove_item(e, idx=i):
-                        cart_items.pop(idx)
-                        update_cart_table()
+            def remove_cart_line(product_id):
+                cart.remove(product_id)
+                row = cart_rows.pop(product_id, None)
+                if row is not None:
+                    cart_table.rows.remove(row[0])
+                cart_table.update()
+
+            def make_cart_row(line):
+                qty_cell = ft.Text(str(line.quantity), color=TEXT_DARK)
+                total_cell = ft.Text(f"₱{line.line_total:.2f}", weight=ft.FontWeight.W_600, color=PRIMARY_MID)
+                row = ft.DataRow(cells=[
+                    ft.DataCell(ft.Text(line.name, color=TEXT_DARK)),
+                    ft.DataCell(ft.Text(line.category, color=TEXT_MID)),
+                    ft.DataCell(ft.Text(f"₱{line.price:.2f}", color=TEXT_DARK)),
+                    ft.DataCell(qty_cell),
+                    ft.DataCell(total_cell),
+                    ft.DataCell(ft.IconButton(
+                        ft.Icons.DELETE_OUTLINE,
+                        icon_color=ERROR,
+                        icon_size=20,
+                        on_click=lambda e, product_id=line.product_id: remove_cart_line(product_id)
+                    ))
+                ])
+                cart_rows[line.product_id] = (row, qty_cell, total_cell)
+                return row
+
+            def show_cart_line(line, created):
+                # Only the touched row is added or edited, so Flet sends just that row
+                if created:
+                    cart_table.rows.append(make_cart_row(line))
+                    cart_table.update()
+                    return
+                _, qty_cell, total_cell = cart_rows[line.product_id]
+                qty_cell.value = str(line.quantity)
+                total_cell.value = f"₱{line.line_total:.2f}"
+                qty_cell.update()
+                total_cell.update()
+
+            def redraw_cart_table():
+                cart_rows.clear()
+                cart_table.rows = [make_cart_row(line) for line in cart]
+                cart_table.update()
+
+            def empty_cart_table():
+                cart.clear()
+                cart_rows.clear()
+                cart_table.rows.clear()
+                cart_table.update()
 
-                    rows.append(
-                        ft.DataRow(cells=[
-                            ft.DataCell(ft.Text(item["name"], color=TEXT_DARK)),
-                            ft.DataCell(ft.Text(item["category"], color=TEXT_MID)),
-                            ft.DataCell(ft.Text(f"₱{item['price']:.2f}", color=TEXT_DARK)),
-                            ft.DataCell(ft.Text(str(item["quantity"]), color=TEXT_DARK)),
-                            ft.DataCell(ft.Text(f"₱{total_item:.2f}", weight=ft.FontWeight.W_600, color=PRIMARY_MID)),
-                            ft.DataCell(ft.IconButton(
-                                ft.Icons.DELETE_OUTLINE,
-                                icon_color=ERROR,
-                                icon_size=20,
-                                on_click=remove_item
-                            ))
-                        ])
-                    )
-                
-                cart_table.rows = rows
-                cart_total[0] = total
-                page.update()
-            
             def confirm_order(e):
                 # Validate cart is not empty
-                if not cart_items:
+                if not cart:
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([
                             ft.Icon(ft.Icons.SHOPPING_CART_OUTLINED, color=ACCENT_CREAM, size=20),
@@ -808,16 +952,28 @@ def main(page: ft.Page):
                 customer_display.value = customer_name
                 order_type_display.value = order_type_dropdown.value
                 
-                # Copy cart items to confirmed order
+                # Copy cart items to confirmed order, re-checked against the current menu
+                catalog = load_dashboard_products()
+                try:
+                    total, items = cart.to_order(catalog)
+                except CartError as error:
+                    cart.reprice(catalog)
+                    redraw_cart_table()
+                    page.snack_bar = ft.SnackBar(
+                        ft.Text(f"Cart updated: {error}. Please review and confirm again.", color=ACCENT_CREAM),
+                        bgcolor=ERROR,
+                    )
+                    page.snack_bar.open = True
+                    page.update()
+                    return
                 confirmed_order_items.clear()
-                confirmed_order_items.extend(cart_items.copy())
+                confirmed_order_items.extend(items)
+                cart_total[0] = total
                 
                 # Build order summary
                 summary_items = []
-                total = 0
                 for item in confirmed_order_items:
                     total_item = item["price"] * item["quantity"]
-                    total += total_item
                     summary_items.append(
                         ft.Container(
                             content=ft.Row(
@@ -849,8 +1005,7 @@ def main(page: ft.Page):
                 page.update()
             
             def clear_cart(e):
-                cart_items.clear()
-                update_cart_table()
+                empty_cart_table()
                 page.snack_bar = ft.SnackBar(
                     ft.Text("Cart cleared!", color=ACCENT_CREAM),
                     bgcolor=PRIMARY_MID,
@@ -993,6 +1148,7 @@ def main(page: ft.Page):
                         customer_id=current_user_id,
                         business_owner_id=effective_business_owner_id,
                     )
+                    views.changed("orders")
                     
                     # Close payment dialog
                     page.close(payment_dialog)
@@ -1001,9 +1157,8 @@ def main(page: ft.Page):
                     show_receipt(order_id, customer_name, order_type, selected_payment[0], total, confirmed_order_items.copy())
                     
                     # Clear everything
-                    cart_items.clear()
+                    empty_cart_table()
                     confirmed_order_items.clear()
-                    update_cart_table()
                     order_summary_column.controls = []
                     total_text.value = "₱ 0.00"
                     customer_name_field.value = ""
@@ -1109,147 +1264,6 @@ def main(page: ft.Page):
                 
                 page.open(payment_dialog)
             
-            def generate_pdf_receipt(order_id, customer_name, order_type, payment_method, total, items, order_date, save_folder=None):
-                """Generate a PDF receipt file"""
-                # Use provided folder or default to last saved path
-                if save_folder is None:
-                    save_folder = last_save_path["path"]
-                
-                # Create folder if it doesn't exist
-                if not os.path.exists(save_folder):
-                    os.makedirs(save_folder)
-                
-                # Generate filename with .pdf extension
-                filename = f"receipt_order_{order_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                filepath = os.path.join(save_folder, filename)
-                
-                # Create PDF document
-                doc = SimpleDocTemplate(filepath, pagesize=letter, 
-                                       rightMargin=50, leftMargin=50, 
-                                       topMargin=50, bottomMargin=50)
-                
-                # Create styles
-                styles = getSampleStyleSheet()
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=24,
-                    alignment=1,  # Center
-                    spaceAfter=6,
-                    textColor=colors.HexColor('#5D4037')
-                )
-                subtitle_style = ParagraphStyle(
-                    'CustomSubtitle',
-                    parent=styles['Normal'],
-                    fontSize=12,
-                    alignment=1,  # Center
-                    spaceAfter=20,
-                    textColor=colors.HexColor('#6D4C41')
-                )
-                normal_style = ParagraphStyle(
-                    'CustomNormal',
-                    parent=styles['Normal'],
-                    fontSize=11,
-                    spaceAfter=3,
-                    textColor=colors.HexColor('#3E2723')
-                )
-                footer_style = ParagraphStyle(
-                    'CustomFooter',
-                    parent=styles['Normal'],
-                    fontSize=12,
-                    alignment=1,  # Center
-                    spaceBefore=20,
-                    textColor=colors.HexColor('#5D4037')
-                )
-                
-                # Build PDF elements
-                elements = []
-                
-                # Header
-                elements.append(Paragraph("☕ COFFEESTRY", title_style))
-                elements.append(Paragraph("Your Cozy Coffee Shop", subtitle_style))
-                
-                # Order details
-                elements.append(Paragraph(f"<b>Order #:</b> {order_id}", normal_style))
-                elements.append(Paragraph(f"<b>Date:</b> {order_date}", normal_style))
-                elements.append(Paragraph(f"<b>Customer:</b> {customer_name}", normal_style))
-                elements.append(Paragraph(f"<b>Order Type:</b> {order_type}", normal_style))
-                elements.append(Paragraph(f"<b>Payment:</b> {payment_method}", normal_style))
-                elements.append(Spacer(1, 20))
-                
-                # Items table
-                table_data = [['Item', 'Qty', 'Price', 'Total']]
-                subtotal = 0
-                for item in items:
-                    item_total = item['price'] * item['quantity']
-                    subtotal += item_total
-                    table_data.append([
-                        item['name'],
-                        str(item['quantity']),
-                        f"₱{item['price']:.2f}",
-                        f"₱{item_total:.2f}"
-                    ])
-                
-                # Create table with styling
-                table = Table(table_data, colWidths=[2.5*inch, 0.75*inch, 1*inch, 1*inch])
-                table.setStyle(TableStyle([
-                    # Header row
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#5D4037')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 11),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                    ('TOPPADDING', (0, 0), (-1, 0), 10),
-                    # Data rows
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#FFF8E1')),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#3E2723')),
-                    ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-                    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 10),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-                    ('TOPPADDING', (0, 1), (-1, -1), 8),
-                    # Grid
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#D4A574')),
-                    # Alternating row colors
-                    *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#FFECB3') if i % 2 == 0 else colors.HexColor('#FFF8E1')) 
-                      for i in range(1, len(table_data))],
-                ]))
-                elements.append(table)
-                elements.append(Spacer(1, 15))
-                
-                # Totals table
-                totals_data = [
-                    ['Subtotal:', f'₱{subtotal:.2f}'],
-                    ['Tax (0%):', '₱0.00'],
-                    ['TOTAL:', f'₱{total:.2f}'],
-                ]
-                totals_table = Table(totals_data, colWidths=[4*inch, 1.25*inch])
-                totals_table.setStyle(TableStyle([
-                    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                    ('FONTNAME', (0, 0), (-1, 1), 'Helvetica'),
-                    ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 11),
-                    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#3E2723')),
-                    ('FONTSIZE', (0, 2), (-1, 2), 14),
-                    ('TEXTCOLOR', (0, 2), (-1, 2), colors.HexColor('#5D4037')),
-                    ('TOPPADDING', (0, 2), (-1, 2), 10),
-                    ('LINEABOVE', (0, 2), (-1, 2), 2, colors.HexColor('#5D4037')),
-                ]))
-                elements.append(totals_table)
-                
-                # Footer
-                elements.append(Spacer(1, 30))
-                elements.append(Paragraph("Thank you for your purchase!", footer_style))
-                elements.append(Paragraph("Visit us again soon! ☕", footer_style))
-                
-                # Build PDF
-                doc.build(elements)
-                
-                return filepath
-            
             def show_receipt(order_id, customer_name, order_type, payment_method, total, items):
                 order_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 
@@ -1287,46 +1301,8 @@ def main(page: ft.Page):
                 # File picker for choosing save location
                 def on_folder_selected(e: ft.FilePickerResultEvent):
                     if e.path:
-                        # Update the last save path
-                        last_save_path["path"] = e.path
-                        try:
-                            filepath = generate_pdf_receipt(order_id, customer_name, order_type, payment_method, total, items, order_date, e.path)
-                            page.snack_bar = ft.SnackBar(
-                                content=ft.Row([
-                                    ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM, size=20),
-                                    ft.Text(f"Receipt saved successfully!", color=ACCENT_CREAM, weight=ft.FontWeight.W_500),
-                                ], spacing=10),
-                                bgcolor=SUCCESS,
-                                duration=3000,
-                            )
-                            page.snack_bar.open = True
-                            page.update()
-                            
-                            # Show a second notification with the file path
-                            page.snack_bar = ft.SnackBar(
-                                content=ft.Row([
-                                    ft.Icon(ft.Icons.FOLDER_OPEN, color=ACCENT_CREAM, size=20),
-                                    ft.Column([
-                                        ft.Text("Saved to:", color=ACCENT_CREAM, size=11),
-                                        ft.Text(filepath, color=ACCENT_CREAM, size=12, weight=ft.FontWeight.W_500),
-                                    ], spacing=0, expand=True),
-                                ], spacing=10),
-                                bgcolor=PRIMARY_MID,
-                                duration=5000,
-                            )
-                            page.snack_bar.open = True
-                            page.update()
-                        except Exception as ex:
-                            page.snack_bar = ft.SnackBar(
-                                content=ft.Row([
-                                    ft.Icon(ft.Icons.ERROR, color=ACCENT_CREAM, size=20),
-                                    ft.Text(f"Error saving receipt: {str(ex)}", color=ACCENT_CREAM),
-                                ], spacing=10),
-                                bgcolor=ERROR,
-                                duration=4000,
-                            )
-                            page.snack_bar.open = True
-                            page.update()
+                        save_receipt(receipts.Receipt(order_id, customer_name, order_type, payment_method, total, tuple(items), order_date),
+                                     e.path)
                 
                 folder_picker = ft.FilePicker(on_result=on_folder_selected)
                 page.overlay.append(folder_picker)
@@ -1501,161 +1477,136 @@ def main(page: ft.Page):
             )
 
             # Function to build product rows with working buttons
-            def build_product_rows(filtered_products):
-                rows = []
-                for product in filtered_products:
-                    qty_text = ft.Text(value="1", size=14, width=35, text_align=ft.TextAlign.CENTER, color=TEXT_DARK)
-
-                    def make_decrease_qty(qt):
-                        def decrease_qty(e):
-                            qty = int(qt.value)
-                            if qty > 1:
-                                qt.value = str(qty - 1)
-                                page.update()
-                        return decrease_qty
+            def build_product_row(product):
+                qty_text = ft.Text(value="1", size=14, width=35, text_align=ft.TextAlign.CENTER, color=TEXT_DARK)
 
-                    def make_increase_qty(qt):
-                        def increase_qty(e):
-                            qt.value = str(int(qt.value) + 1)
+                def make_decrease_qty(qt):
+                    def decrease_qty(e):
+                        qty = int(qt.value)
+                        if qty > 1:
+                            qt.value = str(qty - 1)
                             page.update()
-                        return increase_qty
+                    return decrease_qty
 
-                    def make_add_to_cart(prod, qt):
-                        def add_to_cart(e):
-                            qty = int(qt.value)
-                            # Check if product already in cart
-                            for item in cart_items:
-                                if item["name"] == prod["name"]:
-                                    item["quantity"] += qty
-                                    update_cart_table()
-                                    qt.value = "1"
-                                    page.snack_bar = ft.SnackBar(
-                                        ft.Text(f"Added {qty}x {prod['name']} to cart!", color=ACCENT_CREAM),
-                                        bgcolor=SUCCESS,
-                                        duration=1500,
-                                    )
-                                    page.snack_bar.open = True
-                                    page.update()
-                                    return
-                            cart_items.append({
-                                "name": prod["name"],
-                                "category": prod["category"],
-                                "price": prod["price"],
-                                "quantity": qty
-                            })
-                            update_cart_table()
-                            qt.value = "1"
-                            page.snack_bar = ft.SnackBar(
-                                ft.Text(f"Added {qty}x {prod['name']} to cart!", color=ACCENT_CREAM),
-                                bgcolor=SUCCESS,
-                                duration=1500,
-                            )
-                            page.snack_bar.open = True
-                            page.update()
-                        return add_to_cart
+                def make_increase_qty(qt):
+                    def increase_qty(e):
+                        qt.value = str(int(qt.value) + 1)
+                        page.update()
+                    return increase_qty
 
-                    def make_quick_order(prod, qt):
-                        def quick_order(e):
-                            qty = int(qt.value)
-                            # Clear cart and add only this product
-                            cart_items.clear()
-                            cart_items.append({
-                                "name": prod["name"],
-                                "category": prod["category"],
-                                "price": prod["price"],
-                                "quantity": qty
-                            })
-                            update_cart_table()
-                            # Auto confirm the order
-                            customer_name = customer_name_field.value if customer_name_field.value else "Walk-in Customer"
-                            customer_display.value = customer_name
-                            order_type_display.value = order_type_dropdown.value
-                            
-                            # Build order summary
-                            total = prod["price"] * qty
-                            order_summary_column.controls = [
-                                ft.Container(
-                                    content=ft.Row(
-                                        [
-                                            ft.Text(f"{prod['name']} x{qty}", size=14, color=TEXT_DARK, expand=True),
-                                            ft.Text(f"₱{total:.2f}", size=14, weight=ft.FontWeight.W_500, color=PRIMARY_MID),
-                                        ],
-                                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                                    ),
-                                    padding=ft.padding.symmetric(vertical=5, horizontal=10),
-                                    bgcolor=ACCENT_CREAM,
-                                    border_radius=5,
-                                )
-                            ]
-                            total_text.value = f"₱ {total:.2f}"
-                            qt.value = "1"
-                            
-                            page.snack_bar = ft.SnackBar(
-                                ft.Text(f"Order confirmed! {qty}x {prod['name']} - ₱{total:.2f}", color=ACCENT_CREAM),
-                                bgcolor=PRIMARY_MID,
-                                duration=2000,
+                def make_add_to_cart(prod, qt):
+                    def add_to_cart(e):
+                        qty = int(qt.value)
+                        show_cart_line(*cart.add(prod, qty))
+                        qt.value = "1"
+                        page.snack_bar = ft.SnackBar(
+                            ft.Text(f"Added {qty}x {prod['name']} to cart!", color=ACCENT_CREAM),
+                            bgcolor=SUCCESS,
+                            duration=1500,
+                        )
+                        page.snack_bar.open = True
+                        page.update()
+                    return add_to_cart
+
+                def make_quick_order(prod, qt):
+                    def quick_order(e):
+                        qty = int(qt.value)
+                        # Clear cart and add only this product
+                        empty_cart_table()
+                        show_cart_line(*cart.add(prod, qty))
+                        # Auto confirm the order
+                        customer_name = customer_name_field.value if customer_name_field.value else "Walk-in Customer"
+                        customer_display.value = customer_name
+                        order_type_display.value = order_type_dropdown.value
+                        
+                        # Build order summary
+                        total = prod["price"] * qty
+                        order_summary_column.controls = [
+                            ft.Container(
+                                content=ft.Row(
+                                    [
+                                        ft.Text(f"{prod['name']} x{qty}", size=14, color=TEXT_DARK, expand=True),
+                                        ft.Text(f"₱{total:.2f}", size=14, weight=ft.FontWeight.W_500, color=PRIMARY_MID),
+                                    ],
+                                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                                ),
+                                padding=ft.padding.symmetric(vertical=5, horizontal=10),
+                                bgcolor=ACCENT_CREAM,
+                                border_radius=5,
                             )
-                            page.snack_bar.open = True
-                            page.update()
-                        return quick_order
+                        ]
+                        total_text.value = f"₱ {total:.2f}"
+                        qt.value = "1"
+                        
+                        page.snack_bar = ft.SnackBar(
+                            ft.Text(f"Order confirmed! {qty}x {prod['name']} - ₱{total:.2f}", color=ACCENT_CREAM),
+                            bgcolor=PRIMARY_MID,
+                            duration=2000,
+                        )
+                        page.snack_bar.open = True
+                        page.update()
+                    return quick_order
 
-                    rows.append(
-                        ft.DataRow(cells=[
-                            ft.DataCell(ft.Text(product["name"], color=TEXT_DARK, weight=ft.FontWeight.W_500)),
-                            ft.DataCell(
-                                ft.Container(
-                                    content=ft.Text(product["category"], size=12, color=ACCENT_CREAM),
-                                    bgcolor=PRIMARY_LIGHT if product["category"] == "Coffee" else ACCENT_GOLD,
-                                    padding=ft.padding.symmetric(horizontal=10, vertical=3),
-                                    border_radius=12,
-                                )
-                            ),
-                            ft.DataCell(ft.Text(f"₱{product['price']:.2f}", color=TEXT_DARK, weight=ft.FontWeight.W_500)),
-                            ft.DataCell(
-                                ft.Row([
-                                    ft.IconButton(ft.Icons.REMOVE_CIRCLE_OUTLINE, on_click=make_decrease_qty(qty_text), icon_color=PRIMARY_MID, icon_size=20),
-                                    qty_text,
-                                    ft.IconButton(ft.Icons.ADD_CIRCLE_OUTLINE, on_click=make_increase_qty(qty_text), icon_color=PRIMARY_MID, icon_size=20),
-                                    ft.Container(width=10),
-                                    ft.Container(
-                                        content=ft.IconButton(
-                                            ft.Icons.ADD_SHOPPING_CART_ROUNDED,
-                                            icon_color=ACCENT_CREAM,
-                                            icon_size=22,
-                                            on_click=make_add_to_cart(product, qty_text),
-                                            tooltip="Add to Cart",
-                                        ),
-                                        bgcolor=SUCCESS,
-                                        border_radius=8,
-                                        padding=2,
-                                    ),
-                                ], alignment=ft.MainAxisAlignment.CENTER, spacing=0)
+                return ft.DataRow(cells=[
+                    ft.DataCell(ft.Text(product["name"], color=TEXT_DARK, weight=ft.FontWeight.W_500)),
+                    ft.DataCell(
+                        ft.Container(
+                            content=ft.Text(product["category"], size=12, color=ACCENT_CREAM),
+                            bgcolor=PRIMARY_LIGHT if product["category"] == "Coffee" else ACCENT_GOLD,
+                            padding=ft.padding.symmetric(horizontal=10, vertical=3),
+                            border_radius=12,
+                        )
+                    ),
+                    ft.DataCell(ft.Text(f"₱{product['price']:.2f}", color=TEXT_DARK, weight=ft.FontWeight.W_500)),
+                    ft.DataCell(
+                        ft.Row([
+                            ft.IconButton(ft.Icons.REMOVE_CIRCLE_OUTLINE, on_click=make_decrease_qty(qty_text), icon_color=PRIMARY_MID, icon_size=20),
+                            qty_text,
+                            ft.IconButton(ft.Icons.ADD_CIRCLE_OUTLINE, on_click=make_increase_qty(qty_text), icon_color=PRIMARY_MID, icon_size=20),
+                            ft.Container(width=10),
+                            ft.Container(
+                                content=ft.IconButton(
+                                    ft.Icons.ADD_SHOPPING_CART_ROUNDED,
+                                    icon_color=ACCENT_CREAM,
+                                    icon_size=22,
+                                    on_click=make_add_to_cart(product, qty_text),
+                                    tooltip="Add to Cart",
+                                ),
+                                bgcolor=SUCCESS,
+                                border_radius=8,
+                                padding=2,
                             ),
-                        ])
-                    )
-                return rows
+                        ], alignment=ft.MainAxisAlignment.CENTER, spacing=0)
+                    ),
+                ])
+
+            # Each product's row is built once and reused by every filter; an edited
+            # product (different name/category/price) gets a new row
+            product_rows = KeyedRowCache(build_product_row,
+                                         key=lambda p: (p["id"], p["name"], p["category"], p["price"]))
 
             # Search and filter function
+            def run_product_search(query):
+                search_text, selected_category = query
+                # Ranked lookup in the owner's search index (kept current by product edits)
+                return search_products(effective_business_owner_id, search_text, selected_category)
+            
+            def render_product_search(matches):
+                filtered = [{"id": p[0], "name": p[1], "category": p[2], "price": p[3]} for p in matches]
+                product_table.rows = product_rows.arrange(load_dashboard_products(), filtered)
+                page.update()
+            
+            # Keystrokes are coalesced; the table is only rebuilt when the matching rows change
+            # (whole rows, like product_rows' key, so a price edit with the same matches still redraws)
+            product_search = DebouncedSearch(run_product_search, render_product_search)
+            
             def filter_products(e=None):
-                # Reload products from database to get latest
-                nonlocal dashboard_products
-                dashboard_products = load_dashboard_products()
-                
-                search_text = search_field.value.lower() if search_field.value else ""
+                search_text = search_field.value or ""
                 selected_category = category_dropdown.value if category_dropdown.value and category_dropdown.value != "All" else None
-                
-                filtered = []
-                for product in dashboard_products:
-                    # Check search text
-                    if search_text and search_text not in product["name"].lower():
-                        continue
-                    # Check category
-                    if selected_category and product["category"] != selected_category:
-                        continue
-                    filtered.append(product)
-                
-                product_table.rows = build_product_rows(filtered)
-                page.update()
+                product_search.submit((search_text, selected_category))
+                # Category picks and Enter don't need to wait out the typing delay
+                if e is None or e.control is not search_field or e.name == "submit":
+                    product_search.flush()
 
             # Search and Category Filter
             search_field = ft.TextField(
@@ -1668,6 +1619,7 @@ def main(page: ft.Page):
                 width=200,
                 prefix_icon=ft.Icons.SEARCH,
                 on_change=filter_products,
+                on_submit=filter_products,
             )
             
             category_dropdown = ft.Dropdown(
@@ -1684,7 +1636,7 @@ def main(page: ft.Page):
             )
 
             # Initialize product table with all products from database
-            product_table.rows = build_product_rows(dashboard_products)
+            product_table.rows = product_rows.arrange(dashboard_products, dashboard_products)
 
             # Main Making Orders Panel
             making_orders_panel = ft.Container(
@@ -2085,6 +2037,7 @@ def main(page: ft.Page):
             # SEED DEFAULT PRODUCTS
             def seed_products_clicked(e):
                 ok, msg = seed_default_products_for_owner(effective_business_owner_id)
+                views.changed("products")
                 bgcolor = SUCCESS if ok else ERROR
                 page.snack_bar = ft.SnackBar(
                     content=ft.Row([
@@ -2115,6 +2068,7 @@ def main(page: ft.Page):
             # Deleting product                
             def delete_prod(product):
                 delete_product(product["id"], effective_business_owner_id)
+                views.changed("products")
                 page.snack_bar = ft.SnackBar(
                     ft.Text(f"Product '{product['name']}' deleted!", color=ACCENT_CREAM),
                     bgcolor=ERROR,
@@ -2149,6 +2103,7 @@ def main(page: ft.Page):
                 if selected_product[0] is None:
                     # Add new product to database (shared across all staff)
                     add_product(name, category, price, effective_business_owner_id)
+                    views.changed("products")
                     page.snack_bar = ft.SnackBar(
                         ft.Text(f"Product '{name}' added successfully!", color=ACCENT_CREAM),
                         bgcolor=SUCCESS,
@@ -2156,6 +2111,7 @@ def main(page: ft.Page):
                 else:
                     # Update existing product in database
                     update_product(selected_product[0]["id"], name, category, price, effective_business_owner_id)
+                    views.changed("products")
                     page.snack_bar = ft.SnackBar(
                         ft.Text(f"Product '{name}' updated successfully!", color=ACCENT_CREAM),
                         bgcolor=SUCCESS,
@@ -2348,14 +2304,16 @@ def main(page: ft.Page):
             layout7()
 
         # ORDER HISTORY PAGE
-        def layout_order_history():
-            orders = get_all_orders()  # Get orders from database
+        def layout_order_history(search_query=""):
+            orders = []       # Orders loaded so far, newest first (one page at a time)
+            order_items = {}  # Items of the loaded orders
             
             def refresh_orders():
-                layout_order_history()
+                layout_order_history(search_query)
             
             def confirm_order_clicked(order_id):
                 confirm_order(order_id)
+                views.changed("orders")
                 page.snack_bar = ft.SnackBar(
                     content=ft.Row([ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM), ft.Text("Order confirmed!", color=ACCENT_CREAM)], spacing=10),
                     bgcolor=SUCCESS
@@ -2365,6 +2323,7 @@ def main(page: ft.Page):
             
             def mark_paid_clicked(order_id):
                 mark_order_paid(order_id)
+                views.changed("orders")
                 page.snack_bar = ft.SnackBar(
                     content=ft.Row([ft.Icon(ft.Icons.PAYMENTS, color=ACCENT_CREAM), ft.Text("Payment confirmed!", color=ACCENT_CREAM)], spacing=10),
                     bgcolor=SUCCESS
@@ -2374,6 +2333,7 @@ def main(page: ft.Page):
             
             def complete_order_clicked(order_id):
                 complete_order(order_id)
+                views.changed("orders")
                 page.snack_bar = ft.SnackBar(
                     content=ft.Row([ft.Icon(ft.Icons.DONE_ALL, color=ACCENT_CREAM), ft.Text("Order completed!", color=ACCENT_CREAM)], spacing=10),
                     bgcolor=SUCCESS
@@ -2384,6 +2344,7 @@ def main(page: ft.Page):
             def cancel_order_clicked(order_id):
                 def confirm_cancel(e):
                     cancel_order(order_id)
+                    views.changed("orders")
                     page.close(cancel_dialog)
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([ft.Icon(ft.Icons.CANCEL, color=ACCENT_CREAM), ft.Text("Order cancelled!", color=ACCENT_CREAM)], spacing=10),
@@ -2421,9 +2382,9 @@ def main(page: ft.Page):
                     return
                 
                 # Get order items
-                items = get_order_items(order_id)
+                items = order_items[order_id]
                 
-                # Prepare items in the format expected by generate_pdf_receipt
+                # Prepare items in the format Receipt expects
                 items_list = []
                 for item in items:
                     # item = (product_name, category, price, quantity)
@@ -2444,149 +2405,8 @@ def main(page: ft.Page):
                 # File picker for choosing save location
                 def on_folder_selected(e: ft.FilePickerResultEvent):
                     if e.path:
-                        last_save_path["path"] = e.path
-                        try:
-                            # Generate PDF receipt
-                            save_folder = e.path
-                            if not os.path.exists(save_folder):
-                                os.makedirs(save_folder)
-                            
-                            filename = f"receipt_order_{order_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                            filepath = os.path.join(save_folder, filename)
-                            
-                            # Create PDF document
-                            doc = SimpleDocTemplate(filepath, pagesize=letter, 
-                                                   rightMargin=50, leftMargin=50, 
-                                                   topMargin=50, bottomMargin=50)
-                            
-                            # Create styles
-                            styles = getSampleStyleSheet()
-                            title_style = ParagraphStyle(
-                                'CustomTitle',
-                                parent=styles['Heading1'],
-                                fontSize=24,
-                                alignment=1,
-                                spaceAfter=6,
-                                textColor=colors.HexColor('#5D4037')
-                            )
-                            subtitle_style = ParagraphStyle(
-                                'CustomSubtitle',
-                                parent=styles['Normal'],
-                                fontSize=12,
-                                alignment=1,
-                                spaceAfter=20,
-                                textColor=colors.HexColor('#6D4C41')
-                            )
-                            normal_style = ParagraphStyle(
-                                'CustomNormal',
-                                parent=styles['Normal'],
-                                fontSize=11,
-                                spaceAfter=3,
-                                textColor=colors.HexColor('#3E2723')
-                            )
-                            footer_style = ParagraphStyle(
-                                'CustomFooter',
-                                parent=styles['Normal'],
-                                fontSize=12,
-                                alignment=1,
-                                spaceBefore=20,
-                                textColor=colors.HexColor('#5D4037')
-                            )
-                            
-                            # Build PDF elements
-                            elements = []
-                            
-                            # Header
-                            elements.append(Paragraph("☕ COFFEESTRY", title_style))
-                            elements.append(Paragraph("Your Cozy Coffee Shop", subtitle_style))
-                            
-                            # Order details
-                            elements.append(Paragraph(f"<b>Order #:</b> {order_id}", normal_style))
-                            elements.append(Paragraph(f"<b>Date:</b> {order_date}", normal_style))
-                            elements.append(Paragraph(f"<b>Customer:</b> {customer_name}", normal_style))
-                            elements.append(Paragraph(f"<b>Order Type:</b> {order_type}", normal_style))
-                            elements.append(Paragraph(f"<b>Payment Status:</b> {payment_method}", normal_style))
-                            elements.append(Spacer(1, 20))
-                            
-                            # Items table
-                            table_data = [['Item', 'Qty', 'Price', 'Total']]
-                            subtotal = 0
-                            for item in items_list:
-                                item_total = item['price'] * item['quantity']
-                                subtotal += item_total
-                                table_data.append([
-                                    item['name'],
-                                    str(item['quantity']),
-                                    f"₱{item['price']:.2f}",
-                                    f"₱{item_total:.2f}"
-                                ])
-                            
-                            # Create table with styling
-                            table = Table(table_data, colWidths=[2.5*inch, 0.75*inch, 1*inch, 1*inch])
-                            table.setStyle(TableStyle([
-                                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#5D4037')),
-                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                                ('TOPPADDING', (0, 0), (-1, 0), 10),
-                                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#FFF8E1')),
-                                ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#3E2723')),
-                                ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-                                ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-                                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                                ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-                                ('TOPPADDING', (0, 1), (-1, -1), 8),
-                                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#D4A574')),
-                            ]))
-                            elements.append(table)
-                            elements.append(Spacer(1, 15))
-                            
-                            # Totals table
-                            totals_data = [
-                                ['Subtotal:', f'₱{subtotal:.2f}'],
-                                ['Tax (0%):', '₱0.00'],
-                                ['TOTAL:', f'₱{total:.2f}'],
-                            ]
-                            totals_table = Table(totals_data, colWidths=[4*inch, 1.25*inch])
-                            totals_table.setStyle(TableStyle([
-                                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                                ('FONTNAME', (0, 0), (-1, 1), 'Helvetica'),
-                                ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, -1), 11),
-                                ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#3E2723')),
-                                ('FONTSIZE', (0, 2), (-1, 2), 14),
-                                ('TEXTCOLOR', (0, 2), (-1, 2), colors.HexColor('#5D4037')),
-                                ('TOPPADDING', (0, 2), (-1, 2), 10),
-                                ('LINEABOVE', (0, 2), (-1, 2), 2, colors.HexColor('#5D4037')),
-                            ]))
-                            elements.append(totals_table)
-                            
-                            # Footer
-                            elements.append(Spacer(1, 30))
-                            elements.append(Paragraph("Thank you for your purchase!", footer_style))
-                            elements.append(Paragraph("Visit us again soon! ☕", footer_style))
-                            
-                            # Build PDF
-                            doc.build(elements)
-                            
-                            page.snack_bar = ft.SnackBar(
-                                content=ft.Row([ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM), ft.Text(f"Receipt saved to {filepath}", color=ACCENT_CREAM)], spacing=10),
-                                bgcolor=SUCCESS,
-                                duration=4000,
-                            )
-                            page.snack_bar.open = True
-                            page.update()
-                        except Exception as ex:
-                            page.snack_bar = ft.SnackBar(
-                                content=ft.Row([ft.Icon(ft.Icons.ERROR, color=ACCENT_CREAM), ft.Text(f"Error saving receipt: {str(ex)}", color=ACCENT_CREAM)], spacing=10),
-                                bgcolor=ERROR
-                            )
-                            page.snack_bar.open = True
-                            page.update()
+                        save_receipt(receipts.Receipt(order_id, customer_name, order_type, payment_method, total, tuple(items_list),
+                                             order_date, payment_label="Payment Status"), e.path)
                 
                 folder_picker = ft.FilePicker(on_result=on_folder_selected)
                 page.overlay.append(folder_picker)
@@ -2596,8 +2416,87 @@ def main(page: ft.Page):
                     initial_directory=last_save_path["path"]
                 )
             
-            order_rows = []
-            for order in orders:
+            def export_receipts_clicked(e):
+                today = datetime.now()
+                from_field = ft.TextField(label="From (YYYY-MM-DD)", value=today.strftime("%Y-%m-01"), width=200,
+                                          border_color=PRIMARY_LIGHT, focused_border_color=PRIMARY_MID, border_radius=10)
+                to_field = ft.TextField(label="To (YYYY-MM-DD)", value=today.strftime("%Y-%m-%d"), width=200,
+                                        border_color=PRIMARY_LIGHT, focused_border_color=PRIMARY_MID, border_radius=10)
+                format_group = ft.RadioGroup(
+                    value="pdf",
+                    content=ft.Column([
+                        ft.Radio(value="pdf", label="One PDF, a page per receipt"),
+                        ft.Radio(value="zip", label="ZIP with a PDF per receipt (best for large ranges)"),
+                    ], spacing=0),
+                )
+
+                def show_export_result(message, ok):
+                    page.snack_bar = ft.SnackBar(
+                        content=ft.Row([
+                            ft.Icon(ft.Icons.CHECK_CIRCLE if ok else ft.Icons.ERROR, color=ACCENT_CREAM, size=20),
+                            ft.Text(message, color=ACCENT_CREAM, expand=True),
+                        ], spacing=10),
+                        bgcolor=SUCCESS if ok else ERROR,
+                        duration=5000,
+                    )
+                    page.snack_bar.open = True
+                    page.update()
+
+                def run_export(folder, start_date, end_date, fmt):
+                    # Runs on its own thread: orders stream from the database page by page while the file is written
+                    path = os.path.join(folder, f"receipts_{start_date}_to_{end_date}.{fmt}")
+                    batch = (receipts.receipt_from_order(order, items) for order, items in
+                             iter_orders_for_receipts(effective_business_owner_id, start_date, end_date))
+                    try:
+                        export = receipts.export_receipts_zip if fmt == "zip" else receipts.export_receipts_pdf
+                        count = export(batch, path)
+                    except Exception as ex:
+                        show_export_result(f"Error exporting receipts: {str(ex)}", False)
+                    else:
+                        show_export_result(f"Exported {count} receipts to {path}" if count
+                                           else "No orders in that date range", True)
+
+                def on_folder_selected(ev: ft.FilePickerResultEvent):
+                    if not ev.path:
+                        return
+                    last_save_path["path"] = ev.path
+                    threading.Thread(target=run_export, daemon=True,
+                                     args=(ev.path, from_field.value.strip(), to_field.value.strip(),
+                                           format_group.value)).start()
+                    show_export_result("Exporting receipts in the background...", True)
+
+                def start_export(ev):
+                    for field in (from_field, to_field):
+                        try:
+                            datetime.strptime(field.value.strip(), "%Y-%m-%d")
+                            field.error_text = None
+                        except ValueError:
+                            field.error_text = "Use YYYY-MM-DD"
+                    if from_field.error_text or to_field.error_text:
+                        page.update()
+                        return
+                    page.close(export_dialog)
+                    folder_picker = ft.FilePicker(on_result=on_folder_selected)
+                    page.overlay.append(folder_picker)
+                    page.update()
+                    folder_picker.get_directory_path(
+                        dialog_title="Choose where to save the receipts",
+                        initial_directory=last_save_path["path"]
+                    )
+
+                export_dialog = ft.AlertDialog(
+                    modal=True,
+                    title=ft.Text("Export Receipts", color=PRIMARY_DARK, weight=ft.FontWeight.BOLD),
+                    content=ft.Column([ft.Row([from_field, to_field], spacing=10), format_group],
+                                      tight=True, spacing=15),
+                    actions=[
+                        ft.TextButton("Cancel", on_click=lambda ev: page.close(export_dialog)),
+                        ft.ElevatedButton("Export", bgcolor=PRIMARY_MID, color=ACCENT_CREAM, on_click=start_export),
+                    ],
+                )
+                page.open(export_dialog)
+
+            def build_order_row(order):
                 # order = (id, customer_name, order_type, total, order_date, status, payment_status)
                 order_id = order[0]
                 customer_name = order[1]
@@ -2622,6 +2521,15 @@ def main(page: ft.Page):
                 status_bg, status_text = status_colors.get(status, ("#FFA726", TEXT_DARK))
                 payment_bg, payment_text = payment_colors.get(payment_status, (ERROR, ACCENT_CREAM))
                 
+                # Search results carry highlighted customer and product names
+                if len(order) > 8:
+                    customer_cell = ft.Column([
+                        highlighted_text(order[7] or "Walk-in"),
+                        *([highlighted_text(order[8], size=10, color=TEXT_MID)] if HIGHLIGHT_START in order[8] else []),
+                    ], spacing=0, tight=True)
+                else:
+                    customer_cell = ft.Text(customer_name or "Walk-in", color=TEXT_DARK)
+                
                 # Action buttons based on status
                 action_buttons = []
                 if status == "pending":
@@ -2683,44 +2591,42 @@ def main(page: ft.Page):
                     )
                 )
                 
-                order_rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text(f"#{order_id}", color=PRIMARY_MID, weight=ft.FontWeight.W_600)),
-                            ft.DataCell(ft.Text(customer_name or "Walk-in", color=TEXT_DARK)),
-                            ft.DataCell(
-                                ft.Container(
-                                    content=ft.Text(order_type or "Dine in", size=11, color=ACCENT_CREAM),
-                                    bgcolor=PRIMARY_LIGHT if order_type == "Dine in" else ACCENT_GOLD,
-                                    padding=ft.padding.symmetric(horizontal=8, vertical=2),
-                                    border_radius=10,
-                                )
-                            ),
-                            ft.DataCell(ft.Text(f"₱{total:.2f}", color=TEXT_DARK, weight=ft.FontWeight.W_500)),
-                            ft.DataCell(
-                                ft.Container(
-                                    content=ft.Text(status.capitalize(), size=11, color=status_text),
-                                    bgcolor=status_bg,
-                                    padding=ft.padding.symmetric(horizontal=8, vertical=2),
-                                    border_radius=10,
-                                )
-                            ),
-                            ft.DataCell(
-                                ft.Container(
-                                    content=ft.Text(payment_status.capitalize(), size=11, color=payment_text),
-                                    bgcolor=payment_bg,
-                                    padding=ft.padding.symmetric(horizontal=8, vertical=2),
-                                    border_radius=10,
-                                )
-                            ),
-                            ft.DataCell(ft.Text(str(order_date)[:16] if order_date else "", color=TEXT_MID, size=11)),
-                            ft.DataCell(ft.Row(action_buttons, spacing=0)),
-                        ]
-                    )
+                return ft.DataRow(
+                    cells=[
+                        ft.DataCell(ft.Text(f"#{order_id}", color=PRIMARY_MID, weight=ft.FontWeight.W_600)),
+                        ft.DataCell(customer_cell),
+                        ft.DataCell(
+                            ft.Container(
+                                content=ft.Text(order_type or "Dine in", size=11, color=ACCENT_CREAM),
+                                bgcolor=PRIMARY_LIGHT if order_type == "Dine in" else ACCENT_GOLD,
+                                padding=ft.padding.symmetric(horizontal=8, vertical=2),
+                                border_radius=10,
+                            )
+                        ),
+                        ft.DataCell(ft.Text(f"₱{total:.2f}", color=TEXT_DARK, weight=ft.FontWeight.W_500)),
+                        ft.DataCell(
+                            ft.Container(
+                                content=ft.Text(status.capitalize(), size=11, color=status_text),
+                                bgcolor=status_bg,
+                                padding=ft.padding.symmetric(horizontal=8, vertical=2),
+                                border_radius=10,
+                            )
+                        ),
+                        ft.DataCell(
+                            ft.Container(
+                                content=ft.Text(payment_status.capitalize(), size=11, color=payment_text),
+                                bgcolor=payment_bg,
+                                padding=ft.padding.symmetric(horizontal=8, vertical=2),
+                                border_radius=10,
+                            )
+                        ),
+                        ft.DataCell(ft.Text(str(order_date)[:16] if order_date else "", color=TEXT_MID, size=11)),
+                        ft.DataCell(ft.Row(action_buttons, spacing=0)),
+                    ]
                 )
             
             def view_order_details(order_id):
-                items = get_order_items(order_id)
+                items = order_items[order_id]
                 
                 # Get the order info
                 order_info = None
@@ -2857,6 +2763,38 @@ def main(page: ft.Page):
                 
                 page.open(dialog)
             
+            order_rows = []
+            
+            def show_order_page(rows):
+                orders.extend(rows)
+                order_items.update(get_order_items_bulk(order[0] for order in rows))  # All items in one query
+                order_rows.extend(build_order_row(order) for order in rows)
+            
+            if search_query.strip():
+                fetch_orders = lambda limit, after: search_orders(None, search_query, limit, after)
+            else:
+                fetch_orders = get_all_orders
+            load_more_orders, on_orders_scroll, more_orders_button = paged_loader(
+                page, fetch_orders, lambda order: (order[4], order[0]), show_order_page)
+            load_more_orders()
+            
+            order_search_field = ft.TextField(
+                value=search_query,
+                hint_text="Search customer, product or order #",
+                prefix_icon=ft.Icons.SEARCH,
+                width=300,
+                height=40,
+                text_size=13,
+                border_color=ACCENT_WARM,
+                focused_border_color=PRIMARY_MID,
+                border_radius=8,
+                bgcolor=BG_CARD,
+                color=TEXT_DARK,
+                on_submit=lambda e: layout_order_history(e.control.value),
+                suffix=ft.IconButton(ft.Icons.CLOSE, icon_size=16, tooltip="Clear search",
+                                     on_click=lambda e: layout_order_history()) if search_query else None,
+            )
+            
             main_content.content = ft.Container(
                 content=ft.Column(
                     [
@@ -2865,6 +2803,14 @@ def main(page: ft.Page):
                                 ft.Icon(ft.Icons.HISTORY, size=28, color=PRIMARY_MID),
                                 ft.Text("Order History", size=22, weight=ft.FontWeight.BOLD, color=PRIMARY_DARK),
                                 ft.Container(expand=True),
+                                order_search_field,
+                                ft.ElevatedButton(
+                                    "Export Receipts",
+                                    icon=ft.Icons.DOWNLOAD,
+                                    bgcolor=PRIMARY_MID,
+                                    color=ACCENT_CREAM,
+                                    on_click=export_receipts_clicked,
+                                ),
                                 ft.ElevatedButton(
                                     "Refresh",
                                     icon=ft.Icons.REFRESH,
@@ -2890,14 +2836,16 @@ def main(page: ft.Page):
                                         ft.DataColumn(ft.Text("Date", weight=ft.FontWeight.W_600, color=PRIMARY_DARK, size=12)),
                                         ft.DataColumn(ft.Text("Actions", weight=ft.FontWeight.W_600, color=PRIMARY_DARK, size=12)),
                                     ],
-                                    rows=order_rows if order_rows else [],
+                                    rows=order_rows,
                                     border=ft.border.all(1, ACCENT_WARM),
                                     border_radius=10,
                                     heading_row_color=ACCENT_CREAM,
                                     data_row_color={ft.ControlState.HOVERED: ft.Colors.with_opacity(0.1, ACCENT_WARM)},
                                     column_spacing=20,
                                 ),
-                            ], scroll=ft.ScrollMode.AUTO, horizontal_alignment=ft.CrossAxisAlignment.STRETCH),
+                                more_orders_button,
+                            ], scroll=ft.ScrollMode.AUTO, horizontal_alignment=ft.CrossAxisAlignment.STRETCH,
+                               on_scroll=on_orders_scroll),
                             bgcolor=BG_CARD,
                             padding=20,
                             border_radius=15,
@@ -2909,9 +2857,10 @@ def main(page: ft.Page):
                             expand=True,
                         ) if order_rows else ft.Container(
                             content=ft.Column([
-                                ft.Icon(ft.Icons.RECEIPT_LONG, size=60, color=TEXT_LIGHT),
-                                ft.Text("No orders yet", size=18, color=TEXT_MID),
-                                ft.Text("Orders will appear here after customers place orders", size=14, color=TEXT_LIGHT),
+                                ft.Icon(ft.Icons.SEARCH_OFF if search_query else ft.Icons.RECEIPT_LONG, size=60, color=TEXT_LIGHT),
+                                ft.Text(f'No orders match "{search_query}"' if search_query else "No orders yet", size=18, color=TEXT_MID),
+                                ft.Text("Try a customer name, a product or an order number" if search_query
+                                        else "Orders will appear here after customers place orders", size=14, color=TEXT_LIGHT),
                             ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=10),
                             bgcolor=BG_CARD,
                             padding=50,
@@ -2963,6 +2912,7 @@ def main(page: ft.Page):
                 
                 success, message = create_customer(new_customer_username.value, new_customer_password.value, effective_business_owner_id)
                 if success:
+                    views.changed("customers")
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM), ft.Text(message, color=ACCENT_CREAM)], spacing=10),
                         bgcolor=SUCCESS
@@ -2981,6 +2931,7 @@ def main(page: ft.Page):
             def delete_customer_clicked(customer_id):
                 def confirm_delete(e):
                     delete_customer(customer_id, effective_business_owner_id)
+                    views.changed("customers")
                     page.close(delete_dialog)
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM), ft.Text("Customer deleted!", color=ACCENT_CREAM)], spacing=10),
@@ -3114,11 +3065,13 @@ def main(page: ft.Page):
         
         # CUSTOMER ORDERS PAGE - Business Owner can view and manage customer orders
         def layout_customer_orders():
-            orders = get_orders_for_business(effective_business_owner_id) if effective_business_owner_id else []
-            pending_orders = get_pending_orders_for_business(effective_business_owner_id) if effective_business_owner_id else []
+            orders = []       # Orders loaded so far, newest first (one page at a time)
+            order_items = {}  # Items of the loaded orders
+            order_counts = get_order_counts_for_business(effective_business_owner_id) if effective_business_owner_id else {}
             
             def confirm_order_clicked(order_id):
                 confirm_order(order_id)
+                views.changed("orders")
                 page.snack_bar = ft.SnackBar(
                     content=ft.Row([ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM), ft.Text("Order confirmed!", color=ACCENT_CREAM)], spacing=10),
                     bgcolor=SUCCESS
@@ -3144,6 +3097,7 @@ def main(page: ft.Page):
                 # Payment verification dialog
                 def confirm_payment(e):
                     mark_order_paid(order_id)
+                    views.changed("orders")
                     page.close(payment_dialog)
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([
@@ -3213,6 +3167,7 @@ def main(page: ft.Page):
             
             def complete_order_clicked(order_id):
                 complete_order(order_id)
+                views.changed("orders")
                 page.snack_bar = ft.SnackBar(
                     content=ft.Row([ft.Icon(ft.Icons.DONE_ALL, color=ACCENT_CREAM), ft.Text("Order completed!", color=ACCENT_CREAM)], spacing=10),
                     bgcolor=SUCCESS
@@ -3222,6 +3177,7 @@ def main(page: ft.Page):
             
             def cancel_order_clicked(order_id):
                 cancel_order(order_id)
+                views.changed("orders")
                 page.snack_bar = ft.SnackBar(
                     content=ft.Row([ft.Icon(ft.Icons.CANCEL, color=ACCENT_CREAM), ft.Text("Order cancelled!", color=ACCENT_CREAM)], spacing=10),
                     bgcolor=ERROR
@@ -3230,7 +3186,7 @@ def main(page: ft.Page):
                 layout_customer_orders()  # Refresh
             
             def view_order_details(order_id, total):
-                items = get_order_items(order_id)
+                items = order_items[order_id]
                 items_list = []
                 for item in items:
                     item_name, item_category, item_price, item_qty = item
@@ -3270,8 +3226,7 @@ def main(page: ft.Page):
                 page.open(details_dialog)
             
             # Build order rows
-            order_rows = []
-            for order in orders:
+            def build_order_row(order):
                 ord_id, cust_name, ord_type, ord_total, ord_status, payment_status, ord_date, cust_username = order
                 
                 # Status badge color
@@ -3327,27 +3282,42 @@ def main(page: ft.Page):
                     ft.IconButton(icon=ft.Icons.VISIBILITY, icon_color=PRIMARY_LIGHT, tooltip="View Details", on_click=lambda e, oid=ord_id, t=ord_total: view_order_details(oid, t))
                 )
                 
-                order_rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text(f"#{ord_id}", color=PRIMARY_MID, weight=ft.FontWeight.W_600)),
-                            ft.DataCell(ft.Text(cust_username or cust_name or "Walk-in", color=TEXT_DARK)),
-                            ft.DataCell(
-                                ft.Container(
-                                    content=ft.Text(ord_status.capitalize(), size=11, color=ACCENT_CREAM),
-                                    bgcolor=status_colors.get(ord_status, TEXT_MID),
-                                    padding=ft.padding.symmetric(horizontal=10, vertical=3),
-                                    border_radius=12,
-                                )
-                            ),
-                            ft.DataCell(payment_badge),
-                            ft.DataCell(ft.Text(f"₱{ord_total:.2f}", color=TEXT_DARK, weight=ft.FontWeight.W_500)),
-                            ft.DataCell(ft.Text(str(ord_date)[:16] if ord_date else "", color=TEXT_MID, size=11)),
-                            ft.DataCell(ft.Row(action_buttons, spacing=0)),
-                        ]
-                    )
+                return ft.DataRow(
+                    cells=[
+                        ft.DataCell(ft.Text(f"#{ord_id}", color=PRIMARY_MID, weight=ft.FontWeight.W_600)),
+                        ft.DataCell(ft.Text(cust_username or cust_name or "Walk-in", color=TEXT_DARK)),
+                        ft.DataCell(
+                            ft.Container(
+                                content=ft.Text(ord_status.capitalize(), size=11, color=ACCENT_CREAM),
+                                bgcolor=status_colors.get(ord_status, TEXT_MID),
+                                padding=ft.padding.symmetric(horizontal=10, vertical=3),
+                                border_radius=12,
+                            )
+                        ),
+                        ft.DataCell(payment_badge),
+                        ft.DataCell(ft.Text(f"₱{ord_total:.2f}", color=TEXT_DARK, weight=ft.FontWeight.W_500)),
+                        ft.DataCell(ft.Text(str(ord_date)[:16] if ord_date else "", color=TEXT_MID, size=11)),
+                        ft.DataCell(ft.Row(action_buttons, spacing=0)),
+                    ]
                 )
             
+            order_rows = []
+            
+            def fetch_order_page(limit, after):
+                if not effective_business_owner_id:
+                    return []
+                page_orders, page_items = get_orders_with_items(effective_business_owner_id, limit=limit, after=after)
+                order_items.update(page_items)
+                return page_orders
+            
+            def show_order_page(rows):
+                orders.extend(rows)
+                order_rows.extend(build_order_row(order) for order in rows)
+            
+            load_more_orders, on_orders_scroll, more_orders_button = paged_loader(
+                page, fetch_order_page, lambda order: (order[6], order[0]), show_order_page)
+            load_more_orders()
+            
             main_content.content = ft.Container(
                 content=ft.Column(
                     [
@@ -3355,6 +3325,14 @@ def main(page: ft.Page):
                         ft.Row([
                             ft.Icon(ft.Icons.SHOPPING_BAG_ROUNDED, size=28, color=PRIMARY_MID),
                             ft.Text("Customer Orders", size=26, weight=ft.FontWeight.BOLD, color=PRIMARY_DARK),
+                            ft.Container(expand=True),
+                            ft.ElevatedButton(
+                                "Refresh",
+                                icon=ft.Icons.REFRESH,
+                                bgcolor=PRIMARY_LIGHT,
+                                color=ACCENT_CREAM,
+                                on_click=lambda e: layout_customer_orders(),
+                            ),
                         ], spacing=12),
                         ft.Text("Manage and confirm customer orders", size=14, color=TEXT_MID),
                         ft.Divider(height=20, color=ACCENT_CREAM),
@@ -3363,7 +3341,7 @@ def main(page: ft.Page):
                         ft.Row([
                             ft.Container(
                                 content=ft.Column([
-                                    ft.Text(str(len(pending_orders)), size=28, weight=ft.FontWeight.BOLD, color=ACCENT_GOLD),
+                                    ft.Text(str(order_counts.get('pending', 0)), size=28, weight=ft.FontWeight.BOLD, color=ACCENT_GOLD),
                                     ft.Text("Pending", size=12, color=TEXT_MID),
                                 ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
                                 padding=15,
@@ -3374,7 +3352,7 @@ def main(page: ft.Page):
                             ),
                             ft.Container(
                                 content=ft.Column([
-                                    ft.Text(str(len([o for o in orders if o[4] == 'completed'])), size=28, weight=ft.FontWeight.BOLD, color=SUCCESS),
+                                    ft.Text(str(order_counts.get('completed', 0)), size=28, weight=ft.FontWeight.BOLD, color=SUCCESS),
                                     ft.Text("Completed", size=12, color=TEXT_MID),
                                 ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
                                 padding=15,
@@ -3385,7 +3363,7 @@ def main(page: ft.Page):
                             ),
                             ft.Container(
                                 content=ft.Column([
-                                    ft.Text(str(len(orders)), size=28, weight=ft.FontWeight.BOLD, color=PRIMARY_MID),
+                                    ft.Text(str(sum(order_counts.values())), size=28, weight=ft.FontWeight.BOLD, color=PRIMARY_MID),
                                     ft.Text("Total Orders", size=12, color=TEXT_MID),
                                 ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
                                 padding=15,
@@ -3415,7 +3393,8 @@ def main(page: ft.Page):
                                     border_radius=10,
                                     heading_row_color=ACCENT_CREAM,
                                 ),
-                            ], scroll=ft.ScrollMode.AUTO),
+                                more_orders_button,
+                            ], scroll=ft.ScrollMode.AUTO, on_scroll=on_orders_scroll),
                             bgcolor=BG_CARD,
                             padding=20,
                             border_radius=15,
@@ -3439,6 +3418,22 @@ def main(page: ft.Page):
                 expand=True,
             )
             page.update()
+
+        # Each tab is built on its first visit and kept, so switching tabs doesn't rebuild it or query again;
+        # a write marks the other tabs showing that data stale (views.changed) and they're rebuilt on return
+        views = ViewRouter(page, main_content, {
+            "/pos": layout5,
+            "/products": layout6,
+            "/orders": layout_order_history,
+            "/customers": layout_customers,
+            "/customer-orders": layout_customer_orders,
+        }, depends={
+            "/pos": {"products"},
+            "/products": {"products"},
+            "/orders": {"orders"},
+            "/customers": {"customers"},
+            "/customer-orders": {"orders", "customers"},
+        })
                                         
         # SIDEBAR - Modern Coffee Shop Style
         def create_sidebar_button(text, icon, on_click, is_active=False):
@@ -3488,15 +3483,15 @@ def main(page: ft.Page):
                     ft.Text("MENU", size=11, color=TEXT_LIGHT, weight=ft.FontWeight.W_600),
                     ft.Container(height=10),
                     
-                    create_sidebar_button("Dashboard", ft.Icons.DASHBOARD_ROUNDED, lambda e: layout5()),
+                    create_sidebar_button("Dashboard", ft.Icons.DASHBOARD_ROUNDED, lambda e: views.go("/pos")),
                     ft.Container(height=5),
-                    create_sidebar_button("Products & Prices", ft.Icons.INVENTORY_2_ROUNDED, lambda e: layout6()),
+                    create_sidebar_button("Products & Prices", ft.Icons.INVENTORY_2_ROUNDED, lambda e: views.go("/products")),
                     ft.Container(height=5),
-                    create_sidebar_button("Order History", ft.Icons.HISTORY_ROUNDED, lambda e: layout_order_history()),
+                    create_sidebar_button("Order History", ft.Icons.HISTORY_ROUNDED, lambda e: views.go("/orders")),
                     ft.Container(height=5),
-                    create_sidebar_button("My Customers", ft.Icons.PEOPLE_ROUNDED, lambda e: layout_customers()),
+                    create_sidebar_button("My Customers", ft.Icons.PEOPLE_ROUNDED, lambda e: views.go("/customers")),
                     ft.Container(height=5),
-                    create_sidebar_button("Customer Orders", ft.Icons.SHOPPING_BAG_ROUNDED, lambda e: layout_customer_orders()),
+                    create_sidebar_button("Customer Orders", ft.Icons.SHOPPING_BAG_ROUNDED, lambda e: views.go("/customer-orders")),
                     
                     ft.Container(expand=True),
                     
@@ -3552,7 +3547,7 @@ def main(page: ft.Page):
         page.update()
 
         # Load Dashboard by default
-        layout5()
+        views.attach("/pos")
 
     # ============ SUPERADMIN DASHBOARD ============
     def superadmin_dashboard():
@@ -3561,18 +3556,19 @@ def main(page: ft.Page):
         
         # Dashboard Overview
         def sa_dashboard():
-            total_owners = get_total_business_owners()
-            total_customers = get_total_customers()
-            total_sales = get_total_sales()
-            total_orders = get_total_orders()
-            total_products = get_total_products()
-            sales_data = get_sales_by_date(7)
-            customers_data = get_customers_by_date(7)
-            orders_data = get_orders_by_date(7)
-            top_owners = get_top_business_owners(5)
-            order_status = get_order_status_distribution()
-            monthly_revenue = get_monthly_revenue(6)
-            top_products = get_top_selling_products(5)
+            snapshot = get_platform_snapshot(days=7, months=6, top_n=5)
+            total_owners = snapshot.total_owners
+            total_customers = snapshot.total_customers
+            total_sales = snapshot.total_sales
+            total_orders = snapshot.total_orders
+            total_products = snapshot.total_products
+            sales_data = snapshot.sales_by_date
+            customers_data = snapshot.customers_by_date
+            orders_data = snapshot.orders_by_date
+            top_owners = snapshot.top_owners
+            order_status = snapshot.status_distribution
+            monthly_revenue = snapshot.monthly_revenue
+            top_products = snapshot.top_products
             
             # Build sales chart items (bar chart style)
             sales_chart_items = []
@@ -3713,8 +3709,16 @@ def main(page: ft.Page):
                     ft.Row([
                         ft.Icon(ft.Icons.ADMIN_PANEL_SETTINGS, size=32, color=PRIMARY_MID),
                         ft.Text("SuperAdmin Dashboard", size=28, weight=ft.FontWeight.BOLD, color=PRIMARY_DARK),
+                        ft.Container(expand=True),
+                        ft.ElevatedButton(
+                            "Refresh",
+                            icon=ft.Icons.REFRESH,
+                            bgcolor=PRIMARY_LIGHT,
+                            color=ACCENT_CREAM,
+                            on_click=lambda e: sa_dashboard(),
+                        ),
                     ], spacing=12),
-                    ft.Text("Platform Overview & Analytics", size=14, color=TEXT_MID),
+                    ft.Text(f"Platform Overview & Analytics • loaded in {snapshot.load_ms:.0f} ms", size=14, color=TEXT_MID),
                     ft.Divider(height=25, color=ACCENT_CREAM),
                     
                     # Stats Cards Row 1
@@ -3912,8 +3916,6 @@ def main(page: ft.Page):
         
         # Manage Users Page
         def sa_manage_users():
-            users = get_all_business_owners()
-            
             def edit_user_clicked(user_id):
                 user = get_user_by_id(user_id)
                 if not user:
@@ -3934,6 +3936,8 @@ def main(page: ft.Page):
                 
                 def save_changes(e):
                     success, message = update_user(user_id, edit_username.value, edit_password.value, edit_role.value)
+                    if success:
+                        views.changed("users")
                     page.close(edit_dialog)
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([ft.Icon(ft.Icons.CHECK_CIRCLE if success else ft.Icons.ERROR, color=ACCENT_CREAM), ft.Text(message, color=ACCENT_CREAM)], spacing=10),
@@ -3958,6 +3962,7 @@ def main(page: ft.Page):
             def delete_user_clicked(user_id, username):
                 def confirm_delete(e):
                     delete_user(user_id)
+                    views.changed("users")
                     page.close(delete_dialog)
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM), ft.Text(f"User '{username}' deleted!", color=ACCENT_CREAM)], spacing=10),
@@ -3977,30 +3982,36 @@ def main(page: ft.Page):
                 )
                 page.open(delete_dialog)
             
-            user_rows = []
-            for user in users:
+            def build_user_row(user):
                 uid, uname, upwd, urole, ucreated = user
-                user_rows.append(
-                    ft.DataRow(cells=[
-                        ft.DataCell(ft.Text(f"#{uid}", color=PRIMARY_MID, weight=ft.FontWeight.W_600)),
-                        ft.DataCell(ft.Text(uname, color=TEXT_DARK)),
-                        ft.DataCell(
-                            ft.Container(
-                                content=ft.Text(urole.capitalize(), size=11, color=ACCENT_CREAM),
-                                bgcolor=PRIMARY_MID if urole == 'owner' else PRIMARY_LIGHT,
-                                padding=ft.padding.symmetric(horizontal=10, vertical=3),
-                                border_radius=12,
-                            )
-                        ),
-                        ft.DataCell(ft.Text(str(ucreated)[:10] if ucreated else "", color=TEXT_MID, size=12)),
-                        ft.DataCell(
-                            ft.Row([
-                                ft.IconButton(icon=ft.Icons.EDIT, icon_color=PRIMARY_MID, tooltip="Edit", on_click=lambda e, u=uid: edit_user_clicked(u)),
-                                ft.IconButton(icon=ft.Icons.DELETE, icon_color=ERROR, tooltip="Delete", on_click=lambda e, u=uid, n=uname: delete_user_clicked(u, n)),
-                            ], spacing=0)
-                        ),
-                    ])
-                )
+                return ft.DataRow(cells=[
+                    ft.DataCell(ft.Text(f"#{uid}", color=PRIMARY_MID, weight=ft.FontWeight.W_600)),
+                    ft.DataCell(ft.Text(uname, color=TEXT_DARK)),
+                    ft.DataCell(
+                        ft.Container(
+                            content=ft.Text(urole.capitalize(), size=11, color=ACCENT_CREAM),
+                            bgcolor=PRIMARY_MID if urole == 'owner' else PRIMARY_LIGHT,
+                            padding=ft.padding.symmetric(horizontal=10, vertical=3),
+                            border_radius=12,
+                        )
+                    ),
+                    ft.DataCell(ft.Text(str(ucreated)[:10] if ucreated else "", color=TEXT_MID, size=12)),
+                    ft.DataCell(
+                        ft.Row([
+                            ft.IconButton(icon=ft.Icons.EDIT, icon_color=PRIMARY_MID, tooltip="Edit", on_click=lambda e, u=uid: edit_user_clicked(u)),
+                            ft.IconButton(icon=ft.Icons.DELETE, icon_color=ERROR, tooltip="Delete", on_click=lambda e, u=uid, n=uname: delete_user_clicked(u, n)),
+                        ], spacing=0)
+                    ),
+                ])
+            
+            user_rows = []
+            
+            def show_user_page(rows):
+                user_rows.extend(build_user_row(user) for user in rows)
+            
+            load_more_users, on_users_scroll, more_users_button = paged_loader(
+                page, get_all_business_owners, lambda user: (user[4], user[0]), show_user_page)
+            load_more_users()
             
             main_content.content = ft.Container(
                 content=ft.Column([
@@ -4039,7 +4050,8 @@ def main(page: ft.Page):
                         border_radius=15,
                         alignment=ft.alignment.center,
                     ),
-                ], expand=True, scroll=ft.ScrollMode.AUTO),
+                    more_users_button,
+                ], expand=True, scroll=ft.ScrollMode.AUTO, on_scroll=on_users_scroll),
                 padding=25,
                 bgcolor=BG_LIGHT,
                 expand=True,
@@ -4123,6 +4135,7 @@ def main(page: ft.Page):
                     assigned_owner_id,
                 )
                 if success:
+                    views.changed("users")
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([ft.Icon(ft.Icons.CHECK_CIRCLE, color=ACCENT_CREAM), ft.Text(f"Admin '{new_admin_username.value}' created successfully!", color=ACCENT_CREAM)], spacing=10),
                         bgcolor=SUCCESS
@@ -4196,6 +4209,17 @@ def main(page: ft.Page):
             )
             page.update()
         
+        views = ViewRouter(page, main_content, {
+            "/admin": sa_dashboard,
+            "/admin/create": sa_create_admin,
+            "/admin/users": sa_manage_users,
+        }, depends={
+            # Other sessions' orders and sales come in through the dashboard's Refresh
+            "/admin": {"users"},
+            "/admin/create": {"users"},
+            "/admin/users": {"users"},
+        })
+
         # Sidebar
         def sa_sidebar_button(text, icon, on_click):
             return ft.Container(
@@ -4227,11 +4251,11 @@ def main(page: ft.Page):
                 ft.Container(height=15),
                 ft.Text("MANAGEMENT", size=11, color=TEXT_LIGHT, weight=ft.FontWeight.W_600),
                 ft.Container(height=10),
-                sa_sidebar_button("Dashboard", ft.Icons.DASHBOARD_ROUNDED, lambda e: sa_dashboard()),
+                sa_sidebar_button("Dashboard", ft.Icons.DASHBOARD_ROUNDED, lambda e: views.go("/admin")),
                 ft.Container(height=5),
-                sa_sidebar_button("Create Admin", ft.Icons.PERSON_ADD, lambda e: sa_create_admin()),
+                sa_sidebar_button("Create Admin", ft.Icons.PERSON_ADD, lambda e: views.go("/admin/create")),
                 ft.Container(height=5),
-                sa_sidebar_button("Manage Users", ft.Icons.MANAGE_ACCOUNTS, lambda e: sa_manage_users()),
+                sa_sidebar_button("Manage Users", ft.Icons.MANAGE_ACCOUNTS, lambda e: views.go("/admin/users")),
                 ft.Container(expand=True),
                 ft.Divider(color=ft.Colors.with_opacity(0.3, ACCENT_CREAM)),
                 ft.Container(
@@ -4267,19 +4291,21 @@ def main(page: ft.Page):
         layout = ft.Row([sidebar, main_content], expand=True, spacing=0)
         page.add(layout)
         page.update()
-        sa_dashboard()
+        views.attach("/admin")
 
     # ============ CUSTOMER PORTAL ============
     def customer_portal(customer_id, customer_name, business_owner_id):
         page.clean()
         main_content = ft.Container(expand=True, bgcolor=BG_LIGHT)
-        cart_items = []
+        cart = Cart()
         
         # Customer Dashboard with Best Sellers and Menu
         def cp_dashboard(filter_cat=None):
             best_sellers = get_best_sellers(business_owner_id, 3)
             all_products = get_products_for_customer(business_owner_id)
             products_list = [{"id": p[0], "name": p[1], "category": p[2], "price": p[3]} for p in all_products]
+            # Best sellers come from past order lines, which only carry the product name
+            products_by_name = {(p["name"], p["category"]): p for p in products_list}
             
             # Best sellers cards
             best_seller_cards = []
@@ -4303,7 +4329,8 @@ def main(page: ft.Page):
                                     "Add to Cart",
                                     bgcolor=PRIMARY_MID,
                                     color=ACCENT_CREAM,
-                                    on_click=lambda e, n=name, c=category, p=price: add_to_cart(n, c, p),
+                                    on_click=lambda e, p=products_by_name.get((name, category)): add_to_cart(p),
+                                    disabled=(name, category) not in products_by_name,
                                 ),
                             ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=5),
                             padding=20,
@@ -4328,22 +4355,12 @@ def main(page: ft.Page):
                     )
                 )
             
-            def add_to_cart(name, category, price):
-                # Check if item already in cart
-                for item in cart_items:
-                    if item['name'] == name:
-                        item['quantity'] += 1
-                        page.snack_bar = ft.SnackBar(
-                            content=ft.Row([ft.Icon(ft.Icons.ADD_SHOPPING_CART, color=ACCENT_CREAM), ft.Text(f"Added another {name} to cart!", color=ACCENT_CREAM)], spacing=10),
-                            bgcolor=SUCCESS, duration=1500,
-                        )
-                        page.snack_bar.open = True
-                        page.update()
-                        return
-                
-                cart_items.append({"name": name, "category": category, "price": price, "quantity": 1})
+            def add_to_cart(product):
+                line, created = cart.add(product)
+                views.changed("cart")
+                message = f"{product['name']} added to cart!" if created else f"Added another {product['name']} to cart!"
                 page.snack_bar = ft.SnackBar(
-                    content=ft.Row([ft.Icon(ft.Icons.ADD_SHOPPING_CART, color=ACCENT_CREAM), ft.Text(f"{name} added to cart!", color=ACCENT_CREAM)], spacing=10),
+                    content=ft.Row([ft.Icon(ft.Icons.ADD_SHOPPING_CART, color=ACCENT_CREAM), ft.Text(message, color=ACCENT_CREAM)], spacing=10),
                     bgcolor=SUCCESS, duration=1500,
                 )
                 page.snack_bar.open = True
@@ -4471,7 +4488,7 @@ def main(page: ft.Page):
                                 bgcolor=PRIMARY_MID,
                                 padding=ft.padding.symmetric(horizontal=16, vertical=8),
                                 border_radius=20,
-                                on_click=lambda e, n=product['name'], c=product['category'], p=product['price']: add_to_cart(n, c, p),
+                                on_click=lambda e, p=product: add_to_cart(p),
                                 ink=True,
                             ),
                         ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=4),
@@ -4494,6 +4511,14 @@ def main(page: ft.Page):
                     ft.Row([
                         ft.Icon(ft.Icons.WAVING_HAND, size=28, color=ACCENT_WARM),
                         ft.Text(f"Welcome, {customer_name}!", size=24, weight=ft.FontWeight.BOLD, color=PRIMARY_DARK),
+                        ft.Container(expand=True),
+                        ft.ElevatedButton(
+                            "Refresh",
+                            icon=ft.Icons.REFRESH,
+                            bgcolor=PRIMARY_LIGHT,
+                            color=ACCENT_CREAM,
+                            on_click=lambda e: cp_dashboard(filter_cat),
+                        ),
                     ], spacing=12),
                     ft.Text("Browse our menu and place your order", size=14, color=TEXT_MID),
                     ft.Divider(height=20, color=ACCENT_CREAM),
@@ -4542,13 +4567,13 @@ def main(page: ft.Page):
         # Cart Page
         def cp_cart():
             def update_cart_display():
-                if not cart_items:
+                if not cart:
                     main_content.content = ft.Container(
                         content=ft.Column([
                             ft.Icon(ft.Icons.SHOPPING_CART_OUTLINED, size=80, color=TEXT_LIGHT),
                             ft.Text("Your cart is empty", size=20, color=TEXT_MID),
                             ft.Text("Add items from the menu to get started", size=14, color=TEXT_LIGHT),
-                            ft.ElevatedButton("Browse Menu", bgcolor=PRIMARY_MID, color=ACCENT_CREAM, on_click=lambda e: cp_dashboard()),
+                            ft.ElevatedButton("Browse Menu", bgcolor=PRIMARY_MID, color=ACCENT_CREAM, on_click=lambda e: views.go("/shop")),
                         ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=15, alignment=ft.MainAxisAlignment.CENTER),
                         padding=50,
                         bgcolor=BG_LIGHT,
@@ -4559,38 +4584,36 @@ def main(page: ft.Page):
                     return
                 
                 cart_list = []
-                total = 0
-                for item in cart_items:
-                    item_total = item['price'] * item['quantity']
-                    total += item_total
+                total = cart.total
+                for item in cart:
                     
-                    def make_remove(itm):
+                    def make_remove(product_id):
                         def remove(e):
-                            cart_items.remove(itm)
+                            cart.remove(product_id)
                             update_cart_display()
                         return remove
                     
                     def make_qty_change(itm, delta):
                         def change(e):
-                            itm['quantity'] = max(1, itm['quantity'] + delta)
+                            cart.set_quantity(itm.product_id, max(1, itm.quantity + delta))
                             update_cart_display()
                         return change
                     
                     cart_list.append(
                         ft.Container(
                             content=ft.Row([
-                                ft.Icon(ft.Icons.LOCAL_CAFE if item['category'] == 'Coffee' else ft.Icons.CAKE, size=28, color=PRIMARY_MID),
+                                ft.Icon(ft.Icons.LOCAL_CAFE if item.category == 'Coffee' else ft.Icons.CAKE, size=28, color=PRIMARY_MID),
                                 ft.Column([
-                                    ft.Text(item['name'], size=14, weight=ft.FontWeight.W_500, color=TEXT_DARK),
-                                    ft.Text(f"₱{item['price']:.2f} each", size=12, color=TEXT_MID),
+                                    ft.Text(item.name, size=14, weight=ft.FontWeight.W_500, color=TEXT_DARK),
+                                    ft.Text(f"₱{item.price:.2f} each", size=12, color=TEXT_MID),
                                 ], spacing=0, expand=True),
                                 ft.Row([
                                     ft.IconButton(icon=ft.Icons.REMOVE_CIRCLE_OUTLINE, icon_size=20, on_click=make_qty_change(item, -1)),
-                                    ft.Text(str(item['quantity']), size=14, weight=ft.FontWeight.W_600),
+                                    ft.Text(str(item.quantity), size=14, weight=ft.FontWeight.W_600),
                                     ft.IconButton(icon=ft.Icons.ADD_CIRCLE_OUTLINE, icon_size=20, on_click=make_qty_change(item, 1)),
                                 ], spacing=0),
-                                ft.Text(f"₱{item_total:.2f}", size=14, weight=ft.FontWeight.W_600, color=SUCCESS),
-                                ft.IconButton(icon=ft.Icons.DELETE, icon_color=ERROR, icon_size=20, on_click=make_remove(item)),
+                                ft.Text(f"₱{item.line_total:.2f}", size=14, weight=ft.FontWeight.W_600, color=SUCCESS),
+                                ft.IconButton(icon=ft.Icons.DELETE, icon_color=ERROR, icon_size=20, on_click=make_remove(item.product_id)),
                             ], spacing=10),
                             padding=15,
                             bgcolor=BG_CARD,
@@ -4600,14 +4623,30 @@ def main(page: ft.Page):
                     )
                 
                 def place_order(e):
-                    if not cart_items:
+                    if not cart:
                         return
                     
+                    catalog = [{"id": p[0], "name": p[1], "category": p[2], "price": p[3]}
+                               for p in get_products_for_customer(business_owner_id)]
+                    try:
+                        order_total, items = cart.to_order(catalog)
+                    except CartError as error:
+                        # The menu changed since these were added; show the updated cart
+                        cart.reprice(catalog)
+                        page.snack_bar = ft.SnackBar(
+                            ft.Text(f"Your cart was updated: {error}.", color=ACCENT_CREAM),
+                            bgcolor=ERROR,
+                        )
+                        page.snack_bar.open = True
+                        update_cart_display()
+                        return
                     order_id = place_customer_order(
                         customer_id, customer_name, business_owner_id,
-                        "Dine in", total, cart_items
+                        "Dine in", order_total, items
                     )
-                    cart_items.clear()
+                    views.changed("orders")
+                    cart.clear()
+                    update_cart_display()  # the kept cart view shows the emptied cart next time
                     
                     page.snack_bar = ft.SnackBar(
                         content=ft.Row([
@@ -4618,7 +4657,7 @@ def main(page: ft.Page):
                         duration=4000,
                     )
                     page.snack_bar.open = True
-                    cp_order_history()
+                    views.go("/shop/orders")
                 
                 main_content.content = ft.Container(
                     content=ft.Column([
@@ -4661,9 +4700,10 @@ def main(page: ft.Page):
         # Order History
         def cp_order_history():
             orders = get_customer_orders(customer_id)
+            order_items = get_order_items_bulk(order[0] for order in orders)  # All items in one query
             
             def view_details(order_id, total):
-                items = get_order_items(order_id)
+                items = order_items[order_id]
                 items_list = []
                 for item in items:
                     name, cat, price, qty = item
@@ -4718,6 +4758,14 @@ def main(page: ft.Page):
                     ft.Row([
                         ft.Icon(ft.Icons.HISTORY, size=28, color=PRIMARY_MID),
                         ft.Text("Order History", size=24, weight=ft.FontWeight.BOLD, color=PRIMARY_DARK),
+                        ft.Container(expand=True),
+                        ft.ElevatedButton(
+                            "Refresh",
+                            icon=ft.Icons.REFRESH,
+                            bgcolor=PRIMARY_LIGHT,
+                            color=ACCENT_CREAM,
+                            on_click=lambda e: cp_order_history(),
+                        ),
                     ], spacing=12),
                     ft.Text("View your past orders and their status", size=14, color=TEXT_MID),
                     ft.Divider(height=20, color=ACCENT_CREAM),
@@ -4744,7 +4792,7 @@ def main(page: ft.Page):
                         content=ft.Column([
                             ft.Icon(ft.Icons.RECEIPT_LONG, size=60, color=TEXT_LIGHT),
                             ft.Text("No orders yet", size=18, color=TEXT_MID),
-                            ft.ElevatedButton("Start Ordering", bgcolor=PRIMARY_MID, color=ACCENT_CREAM, on_click=lambda e: cp_dashboard()),
+                            ft.ElevatedButton("Start Ordering", bgcolor=PRIMARY_MID, color=ACCENT_CREAM, on_click=lambda e: views.go("/shop")),
                         ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=10),
                         bgcolor=BG_CARD,
                         padding=50,
@@ -4757,6 +4805,16 @@ def main(page: ft.Page):
             )
             page.update()
         
+        views = ViewRouter(page, main_content, {
+            "/shop": cp_dashboard,
+            "/shop/cart": cp_cart,
+            "/shop/orders": cp_order_history,
+        }, depends={
+            "/shop": {"orders"},   # best sellers; the owner's menu changes come in through Refresh
+            "/shop/cart": {"cart"},
+            "/shop/orders": {"orders"},
+        })
+
         # Customer Sidebar
         def cp_sidebar_btn(text, icon, on_click):
             return ft.Container(
@@ -4782,11 +4840,11 @@ def main(page: ft.Page):
                 ft.Container(height=15),
                 ft.Text("MENU", size=11, color=TEXT_LIGHT, weight=ft.FontWeight.W_600),
                 ft.Container(height=10),
-                cp_sidebar_btn("Browse Menu", ft.Icons.RESTAURANT_MENU, lambda e: cp_dashboard()),
+                cp_sidebar_btn("Browse Menu", ft.Icons.RESTAURANT_MENU, lambda e: views.go("/shop")),
                 ft.Container(height=5),
-                cp_sidebar_btn("My Cart", ft.Icons.SHOPPING_CART, lambda e: cp_cart()),
+                cp_sidebar_btn("My Cart", ft.Icons.SHOPPING_CART, lambda e: views.go("/shop/cart")),
                 ft.Container(height=5),
-                cp_sidebar_btn("Order History", ft.Icons.HISTORY, lambda e: cp_order_history()),
+                cp_sidebar_btn("Order History", ft.Icons.HISTORY, lambda e: views.go("/shop/orders")),
                 ft.Container(expand=True),
                 ft.Divider(color=ft.Colors.with_opacity(0.3, ACCENT_CREAM)),
                 ft.Container(
@@ -4811,9 +4869,11 @@ def main(page: ft.Page):
         layout = ft.Row([sidebar, main_content], expand=True, spacing=0)
         page.add(layout)
         page.update()
-        cp_dashboard()
+        views.attach("/shop")
 
     # START
     layout1()
 
-ft.app(target=main)
\ No newline at end of file
+# Guarded: receipt render processes re-import this file as __mp_main__ and must not open the app
+if __name__ == "__main__":
+    ft.app(target=main, assets_dir=assets.ASSETS_DIR)
\ No newline at end of file
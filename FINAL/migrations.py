@@ -0,0 +1,41 @@
+"""Numbered schema migrations tracked with PRAGMA user_version.
+
+A migration list is a sequence of (version, function) pairs in ascending
+order. Each function receives an open connection and runs inside a single
+BEGIN IMMEDIATE transaction together with the user_version bump, so a crash
+mid-migration leaves the database at the previous version.
+"""
+
+
+def get_schema_version(conn):
+    """Return the version of the last migration applied to this database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def latest_version(migrations):
+    return migrations[-1][0] if migrations else 0
+
+
+def run_migrations(conn, migrations):
+    """Apply every migration newer than the database's user_version and return the new version"""
+    version = get_schema_version(conn)
+    if version >= latest_version(migrations):
+        return version
+
+    for number, migrate in migrations:
+        if number <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the write lock
+            if get_schema_version(conn) >= number:
+                conn.rollback()
+                continue
+            migrate(conn)
+            conn.execute(f"PRAGMA user_version = {int(number)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = number
+    return get_schema_version(conn)
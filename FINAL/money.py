@@ -0,0 +1,27 @@
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+
+CENTS_PER_UNIT = 100
+
+_CENT = Decimal("0.01")
+
+
+def to_cents(amount):
+    """Peso amount (int, float, Decimal or numeric string) as integer centavos, rounding half up.
+
+    Floats go through their shortest repr, so 0.1 + 0.2 and 1.005 round to
+    the centavo a person would expect (30 and 101) rather than float noise.
+    """
+    if isinstance(amount, bool):
+        raise TypeError("not an amount of money: bool")
+    if isinstance(amount, int):
+        return amount * CENTS_PER_UNIT
+    try:
+        value = Decimal(amount if isinstance(amount, (str, Decimal)) else repr(float(amount)))
+        return int(value.quantize(_CENT, rounding=ROUND_HALF_UP) * CENTS_PER_UNIT)
+    except (InvalidOperation, ValueError, TypeError):
+        raise ValueError(f"not an amount of money: {amount!r}") from None
+
+
+def from_cents(cents):
+    """Integer centavos as a peso float (the nearest float to the exact amount)"""
+    return cents / CENTS_PER_UNIT
@@ -2,13 +2,14 @@ import flet as ft
 from datetime import datetime
 from config import *
 from database_new import get_all_products, save_order
+from cart import Cart, CartError
 
 def create_orders_view(page, main_content):
     """Create the Making Orders view"""
     
     # Get products from database
     products = get_all_products()
-    cart_items = []
+    cart = Cart()
     
     # Customer info fields
     customer_name_field = ft.TextField(
@@ -77,17 +78,16 @@ def create_orders_view(page, main_content):
     customer_name_field.on_change = update_customer_display
 
     def update_cart_table():
-        total = 0
         rows = []
         summary_items = []
         
-        for i, item in enumerate(cart_items):
-            total_item = item["price"] * item["quantity"]
-            total += total_item
+        for line in cart:
+            item = line.as_item()
+            total_item = line.line_total
 
-            def make_remove_handler(idx):
+            def make_remove_handler(product_id):
                 def remove_item(e):
-                    cart_items.pop(idx)
+                    cart.remove(product_id)
                     update_cart_table()
                 return remove_item
 
@@ -101,7 +101,7 @@ def create_orders_view(page, main_content):
                         ft.Icons.DELETE_OUTLINE,
                         icon_color=ERROR,
                         icon_size=20,
-                        on_click=make_remove_handler(i)
+                        on_click=make_remove_handler(line.product_id)
                     ))
                 ])
             )
@@ -123,11 +123,11 @@ def create_orders_view(page, main_content):
         
         cart_table.rows = rows
         order_summary_column.controls = summary_items
-        total_text.value = f"₱ {total:.2f}"
+        total_text.value = f"₱ {cart.total:.2f}"
         page.update()
 
     def proceed_to_payment(e):
-        if not cart_items:
+        if not cart:
             page.snack_bar = ft.SnackBar(
                 ft.Text("Cart is empty! Please add items first.", color=ACCENT_CREAM),
                 bgcolor=ERROR,
@@ -136,13 +136,24 @@ def create_orders_view(page, main_content):
             page.update()
             return
         
-        # Calculate total
-        total = sum(item["price"] * item["quantity"] for item in cart_items)
+        # Re-check the cart against the current menu
+        catalog = get_all_products()
+        try:
+            total, items = cart.to_order(catalog)
+        except CartError as error:
+            cart.reprice(catalog)
+            page.snack_bar = ft.SnackBar(
+                ft.Text(f"Cart updated: {error}.", color=ACCENT_CREAM),
+                bgcolor=ERROR,
+            )
+            page.snack_bar.open = True
+            update_cart_table()
+            return
         customer_name = customer_name_field.value.strip() or "Walk-in Customer"
         order_type = order_type_dropdown.value
         
         # Save order to database
-        order_id = save_order(customer_name, order_type, total, cart_items)
+        order_id = save_order(customer_name, order_type, total, items)
         
         # Show success message
         page.snack_bar = ft.SnackBar(
@@ -152,7 +163,7 @@ def create_orders_view(page, main_content):
         page.snack_bar.open = True
         
         # Clear cart
-        cart_items.clear()
+        cart.clear()
         customer_name_field.value = ""
         customer_display.value = "Walk-in Customer"
         update_cart_table()
@@ -181,22 +192,7 @@ def create_orders_view(page, main_content):
         def make_add_handler(prod, qr, qt):
             def add_to_cart(e):
                 qty = qr["value"]
-                # Check if product already in cart
-                for item in cart_items:
-                    if item["name"] == prod["name"]:
-                        item["quantity"] += qty
-                        update_cart_table()
-                        # Reset quantity
-                        qr["value"] = 1
-                        qt.value = "1"
-                        page.update()
-                        return
-                cart_items.append({
-                    "name": prod["name"],
-                    "category": prod["category"],
-                    "price": prod["price"],
-                    "quantity": qty
-                })
+                cart.add(prod, qty)
                 update_cart_table()
                 # Reset quantity
                 qr["value"] = 1
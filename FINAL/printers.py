@@ -0,0 +1,135 @@
+import itertools
+import os
+import socket
+import threading
+
+# Raw TCP port network receipt printers listen on (JetDirect / "port 9100" printing)
+RAW_PRINT_PORT = 9100
+
+
+class PrinterError(OSError):
+    """A sink couldn't take a print job (printer unreachable, spool directory unwritable)"""
+
+
+# ============ SINKS ============
+# A sink takes one rendered receipt: send(data, name) delivers the bytes
+# and returns where they went. name is the receipt's file name, which
+# sinks that don't write files may ignore.
+
+class FileSink:
+    """Writes each receipt to folder/name"""
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def send(self, data, name):
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+
+class SpoolSink:
+    """Drops jobs into a spool directory for a print daemon to pick up.
+
+    A job is written under a dot-name and renamed into place once complete,
+    so whatever watches the directory never sees half a receipt. Job names
+    start with a sequence number so they print in the order sent.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def send(self, data, name):
+        os.makedirs(self.folder, exist_ok=True)
+        with self._lock:
+            job = f"{next(self._sequence):06d}_{name}"
+        partial = os.path.join(self.folder, f".{job}.part")
+        path = os.path.join(self.folder, job)
+        try:
+            with open(partial, "wb") as f:
+                f.write(data)
+            os.replace(partial, path)
+        except OSError as e:
+            raise PrinterError(f"can't spool {name}: {e}") from e
+        return path
+
+
+class SocketSink:
+    """Sends each receipt to a network printer's raw port, one connection per job"""
+
+    def __init__(self, host, port=RAW_PRINT_PORT, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def send(self, data, name):
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout) as conn:
+                conn.sendall(data)
+        except OSError as e:
+            raise PrinterError(f"printer {self.host}:{self.port} didn't take {name}: {e}") from e
+        return f"{self.host}:{self.port}"
+
+
+# ============ FAKE PRINTER ============
+
+class FakePrinter:
+    """A local stand-in for a network printer: accepts raw jobs on 127.0.0.1 and keeps them.
+
+    Point a SocketSink at (printer.host, printer.port) for development,
+    tests and benchmarks. Use as a context manager, or start()/stop().
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.jobs = []
+        self._server = socket.create_server((host, port))
+        self._server.settimeout(0.1)  # so the accept loop notices stop()
+        self.port = self._server.getsockname()[1]
+        self._received = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, name="fake-printer", daemon=True)
+        self._thread.start()
+        return self
+
+    def _serve(self):
+        while not self._stopped.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(None)
+            with conn:
+                chunks = []
+                while True:
+                    chunk = conn.recv(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            with self._received:
+                self.jobs.append(b"".join(chunks))
+                self._received.notify_all()
+
+    def wait_for(self, count, timeout=5.0):
+        """Block until count jobs have arrived; returns whether they did"""
+        with self._received:
+            return self._received.wait_for(lambda: len(self.jobs) >= count, timeout)
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._server.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
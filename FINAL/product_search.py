@@ -0,0 +1,184 @@
+import re
+from heapq import nsmallest
+from bisect import bisect_left, insort
+
+# Query terms shorter than this are only prefix-matched (a one-letter typo in
+# a two-letter word matches nearly everything)
+MIN_FUZZY_LENGTH = 3
+
+# Per-term scores: a whole-word hit beats a prefix hit beats a one-typo hit
+EXACT_SCORE = 3
+PREFIX_SCORE = 2
+FUZZY_SCORE = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercase alphanumeric words of a product name or query"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _deletes(token):
+    """The token with each single character removed (its edit-distance-1 deletion neighbourhood)"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion, substitution or adjacent swap"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return a[i + 2:] == b[i + 2:] and a[i:i + 2] == b[i:i + 2][::-1]
+    if len(a) > len(b):
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+
+class ProductSearchIndex:
+    """In-memory search index over one catalog of (id, name, category, price) rows.
+
+    Name words are kept in a sorted list, so a prefix lookup is two bisects.
+    Typos are found through a deletion neighbourhood: every word is also
+    filed under each of its one-character deletions, and a query word is
+    looked up under itself and its own deletions (one edit, including
+    adjacent swaps). Category membership is kept per category for facets.
+    Equal scores keep catalog order, so results don't jump around as you type.
+    """
+
+    def __init__(self, products=()):
+        self._products = {}     # id -> product row, in catalog order
+        self._names = {}        # id -> lowercase name
+        self._positions = {}    # id -> catalog position, the tie-break order
+        self._next_position = 0
+        self._postings = {}     # word -> {product id}
+        self._words = []        # sorted words, for prefix ranges
+        self._deleted = {}      # one-character deletion -> {word}
+        self._categories = {}   # category -> {product id: None}, in catalog order
+        for product in products:
+            self.add(product)
+
+    def __len__(self):
+        return len(self._products)
+
+    def add(self, product):
+        """Index a product row; a row with the same id is replaced but keeps its catalog position"""
+        product_id = product[0]
+        old = self._products.get(product_id)
+        if old is None:
+            self._positions[product_id] = self._next_position
+            self._next_position += 1
+        else:
+            self._unindex(product_id, old, keep_category=old[2] == product[2])
+        self._products[product_id] = product
+        self._names[product_id] = product[1].lower()
+        self._categories.setdefault(product[2], {})[product_id] = None
+        for word in set(tokenize(product[1])):
+            ids = self._postings.get(word)
+            if ids is None:
+                ids = self._postings[word] = set()
+                insort(self._words, word)
+                for deleted in _deletes(word):
+                    self._deleted.setdefault(deleted, set()).add(word)
+            ids.add(product_id)
+
+    update = add
+
+    def remove(self, product_id):
+        """Drop a product from the index (no-op if it isn't there)"""
+        product = self._products.pop(product_id, None)
+        if product is None:
+            return
+        self._unindex(product_id, product)
+        del self._names[product_id]
+        del self._positions[product_id]
+
+    def _unindex(self, product_id, product, keep_category=False):
+        """Take a product's words (and category, unless kept) out of the lookup tables"""
+        if not keep_category:
+            members = self._categories[product[2]]
+            del members[product_id]
+            if not members:
+                del self._categories[product[2]]
+        for word in set(tokenize(product[1])):
+            ids = self._postings[word]
+            ids.discard(product_id)
+            if ids:
+                continue
+            del self._postings[word]
+            del self._words[bisect_left(self._words, word)]
+            for deleted in _deletes(word):
+                words = self._deleted[deleted]
+                words.discard(word)
+                if not words:
+                    del self._deleted[deleted]
+
+    def categories(self):
+        """Category facets: {category: product count}"""
+        return {category: len(ids) for category, ids in self._categories.items()}
+
+    def _term_scores(self, term):
+        """{product id: best score} for one query word"""
+        scores = {}
+        start = bisect_left(self._words, term)
+        for word in self._words[start:bisect_left(self._words, term + "\uffff", start)]:
+            score = EXACT_SCORE if word == term else PREFIX_SCORE
+            for product_id in self._postings[word]:
+                if scores.get(product_id, 0) < score:
+                    scores[product_id] = score
+        if len(term) >= MIN_FUZZY_LENGTH:
+            candidates = set(self._deleted.get(term, ()))
+            for deleted in _deletes(term):
+                if deleted in self._postings:
+                    candidates.add(deleted)
+                candidates.update(self._deleted.get(deleted, ()))
+            for word in candidates:
+                if word != term and _within_one_edit(term, word):
+                    for product_id in self._postings[word]:
+                        scores.setdefault(product_id, FUZZY_SCORE)
+        return scores
+
+    def search(self, query, category=None, limit=None):
+        """Products matching every word of query (by prefix or with one typo), best first.
+
+        An empty query lists the catalog (or one category) in catalog order.
+        """
+        terms = tokenize(query)
+        if category is not None:
+            in_category = self._categories.get(category, {})
+        if not terms:
+            ids = self._products if category is None else in_category
+            rows = [self._products[product_id] for product_id in ids]
+            return rows if limit is None else rows[:limit]
+
+        totals = None
+        for term in terms:
+            scores = self._term_scores(term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {product_id: total + scores[product_id]
+                          for product_id, total in totals.items() if product_id in scores}
+            if not totals:
+                return []
+        if category is not None:
+            totals = {product_id: total for product_id, total in totals.items() if product_id in in_category}
+
+        phrase = query.strip().lower()
+        names, positions = self._names, self._positions
+        ranked = []
+        for product_id, total in totals.items():
+            # Names that start with exactly what was typed go first
+            if names[product_id].startswith(phrase):
+                total += EXACT_SCORE
+            ranked.append((-total, positions[product_id], product_id))
+        ranked = sorted(ranked) if limit is None else nsmallest(limit, ranked)
+        products = self._products
+        return [products[entry[2]] for entry in ranked]
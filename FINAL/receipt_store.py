@@ -0,0 +1,83 @@
+import dataclasses
+import hashlib
+import json
+import os
+
+import database
+
+# Bump when a renderer's layout changes, so receipts stored under the old layout aren't served again
+LAYOUT_VERSION = 1
+
+
+def content_hash(receipt, renderer):
+    """SHA-256 of everything that decides a receipt's bytes: its fields, the renderer and its options, the layout"""
+    payload = json.dumps([LAYOUT_VERSION, renderer.key, dataclasses.asdict(receipt)],
+                         sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReceiptStore:
+    """Rendered receipts, stored once and re-printed from the stored bytes.
+
+    A receipt is looked up by (order id, format, content hash), where the
+    content hash covers the receipt's fields and the renderer (see
+    content_hash()), so it's known before rendering: a re-print of an
+    unchanged order is a lookup and a file read. The bytes live in folder,
+    named by their own SHA-256, so identical output is kept once; the
+    receipt_artifacts table in the app database is the index.
+    """
+
+    def __init__(self, folder=None):
+        self.folder = folder or os.path.join(os.path.dirname(database.DB_PATH), "receipt_store")
+
+    def blob_path(self, blob_sha256):
+        return os.path.join(self.folder, blob_sha256[:2], blob_sha256)
+
+    def filename(self, receipt, renderer):
+        """receipt_order_<id>_<content hash prefix>.<ext>: the same receipt always gets the same name"""
+        return f"receipt_order_{receipt.order_id}_{content_hash(receipt, renderer)[:10]}.{renderer.extension}"
+
+    def fetch(self, receipt, renderer):
+        """The stored bytes for this receipt, or None if it was never rendered (or its blob is gone).
+
+        Served bytes count as a print; a miss doesn't, as the re-render that follows is counted when it's stored.
+        """
+        key = (receipt.order_id, renderer.extension, content_hash(receipt, renderer))
+        found = database.get_receipt_artifact(*key)
+        if found is None:
+            return None
+        try:
+            with open(self.blob_path(found[0]), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        database.count_receipt_reprint(*key)
+        return data
+
+    def put(self, receipt, renderer, data):
+        """Store freshly rendered bytes for this receipt and index them; returns the blob's SHA-256"""
+        blob = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(blob)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = f"{path}.{os.getpid()}.part"
+            with open(partial, "wb") as f:
+                f.write(data)
+            os.replace(partial, path)
+        replaced = database.record_receipt_artifact(receipt.order_id, renderer.extension,
+                                                    content_hash(receipt, renderer), blob, len(data))
+        if replaced is not None and replaced != blob and not database.count_blob_references(replaced):
+            try:
+                os.remove(self.blob_path(replaced))
+            except FileNotFoundError:
+                pass
+        return blob
+
+    def get_or_render(self, receipt, renderer):
+        """(bytes, reused): the stored receipt if there is one, else render it with renderer.render() and store it"""
+        data = self.fetch(receipt, renderer)
+        if data is not None:
+            return data, True
+        data = renderer.render(receipt)
+        self.put(receipt, renderer, data)
+        return data, False
@@ -0,0 +1,603 @@
+import io
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from types import SimpleNamespace
+
+from money import to_cents, from_cents
+
+# Worker threads per ReceiptService
+DEFAULT_WORKERS = 2
+# Renderer the app saves receipts with: "pdf", "text" or "escpos" (see RENDERERS)
+RECEIPT_FORMAT = os.environ.get("COFFEESTRY_RECEIPT_FORMAT", "pdf")
+# Receipts per task a batch export hands to a render process
+EXPORT_CHUNK = 16
+# Tasks a batch export lets pile up per process before writing them out
+EXPORT_WINDOW_PER_PROCESS = 4
+# How render processes start, the same on every platform: fork isn't safe in a process running
+# threads (the UI's), and spawn workers import main.py as __mp_main__, which its main guard allows
+MP_START_METHOD = "spawn"
+
+
+@dataclass(frozen=True)
+class Receipt:
+    """Everything printed on one receipt; items are order item dicts (name, category, price, quantity)"""
+    order_id: int
+    customer_name: str
+    order_type: str
+    payment_method: str
+    total: float
+    items: tuple
+    order_date: str
+    payment_label: str = "Payment"
+
+    @property
+    def subtotal(self):
+        return from_cents(sum(to_cents(item["price"]) * item["quantity"] for item in self.items))
+
+
+def receipt_from_order(order, items):
+    """A Receipt for an (id, customer_name, order_type, total, order_date, payment_status) row and its item tuples"""
+    order_id, customer_name, order_type, total, order_date, payment_status = order
+    return Receipt(order_id, customer_name or "Walk-in", order_type or "Dine in",
+                   "Paid" if payment_status == "paid" else "Unpaid", total,
+                   tuple({"name": name, "category": category, "price": price, "quantity": quantity}
+                         for name, category, price, quantity in items),
+                   str(order_date)[:19], payment_label="Payment Status")
+
+
+def receipt_filename(order_id, extension="pdf", when=None):
+    """receipt_order_<id>_<YYYYmmdd_HHMMSS>.<extension>, the name receipts have always been saved under"""
+    when = when or datetime.now()
+    return f"receipt_order_{order_id}_{when.strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+# ============ PDF RENDERING ============
+
+@lru_cache(maxsize=None)
+def _pdf_kit():
+    """ReportLab classes, paragraph styles and the fixed table styles, built once per process.
+
+    ReportLab is imported here rather than at module level so importing
+    receipts (and main) doesn't pay for it until the first receipt.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+    styles = getSampleStyleSheet()
+    dark, mid, text = colors.HexColor('#5D4037'), colors.HexColor('#6D4C41'), colors.HexColor('#3E2723')
+    return SimpleNamespace(
+        letter=letter, inch=inch, colors=colors,
+        SimpleDocTemplate=SimpleDocTemplate, Table=Table, TableStyle=TableStyle, Paragraph=Paragraph, Spacer=Spacer,
+        title=ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24, alignment=1, spaceAfter=6,
+                             textColor=dark),
+        subtitle=ParagraphStyle('CustomSubtitle', parent=styles['Normal'], fontSize=12, alignment=1, spaceAfter=20,
+                                textColor=mid),
+        normal=ParagraphStyle('CustomNormal', parent=styles['Normal'], fontSize=11, spaceAfter=3, textColor=text),
+        footer=ParagraphStyle('CustomFooter', parent=styles['Normal'], fontSize=12, alignment=1, spaceBefore=20,
+                              textColor=dark),
+        items_style=[
+            # Header row
+            ('BACKGROUND', (0, 0), (-1, 0), dark),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('TOPPADDING', (0, 0), (-1, 0), 10),
+            # Data rows
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#FFF8E1')),
+            ('TEXTCOLOR', (0, 1), (-1, -1), text),
+            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+            ('TOPPADDING', (0, 1), (-1, -1), 8),
+            # Grid
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#D4A574')),
+        ],
+        stripe=colors.HexColor('#FFECB3'),
+        totals_style=TableStyle([
+            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 1), 'Helvetica'),
+            ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('TEXTCOLOR', (0, 0), (-1, -1), text),
+            ('FONTSIZE', (0, 2), (-1, 2), 14),
+            ('TEXTCOLOR', (0, 2), (-1, 2), dark),
+            ('TOPPADDING', (0, 2), (-1, 2), 10),
+            ('LINEABOVE', (0, 2), (-1, 2), 2, dark),
+        ]),
+    )
+
+
+def pdf_elements(receipt):
+    """The Platypus flowables for one receipt (a batch export can put several in one document)"""
+    kit = _pdf_kit()
+    inch = kit.inch
+    elements = [
+        kit.Paragraph("☕ COFFEESTRY", kit.title),
+        kit.Paragraph("Your Cozy Coffee Shop", kit.subtitle),
+        kit.Paragraph(f"<b>Order #:</b> {receipt.order_id}", kit.normal),
+        kit.Paragraph(f"<b>Date:</b> {receipt.order_date}", kit.normal),
+        kit.Paragraph(f"<b>Customer:</b> {receipt.customer_name}", kit.normal),
+        kit.Paragraph(f"<b>Order Type:</b> {receipt.order_type}", kit.normal),
+        kit.Paragraph(f"<b>{receipt.payment_label}:</b> {receipt.payment_method}", kit.normal),
+        kit.Spacer(1, 20),
+    ]
+
+    table_data = [['Item', 'Qty', 'Price', 'Total']]
+    for item in receipt.items:
+        table_data.append([
+            item['name'],
+            str(item['quantity']),
+            f"₱{item['price']:.2f}",
+            f"₱{from_cents(to_cents(item['price']) * item['quantity']):.2f}",
+        ])
+    table = kit.Table(table_data, colWidths=[2.5 * inch, 0.75 * inch, 1 * inch, 1 * inch])
+    # Alternating row colors on top of the cached fixed style
+    table.setStyle(kit.TableStyle(kit.items_style + [
+        ('BACKGROUND', (0, i), (-1, i), kit.stripe) for i in range(2, len(table_data), 2)
+    ]))
+    elements.append(table)
+    elements.append(kit.Spacer(1, 15))
+
+    totals_table = kit.Table([
+        ['Subtotal:', f'₱{receipt.subtotal:.2f}'],
+        ['Tax (0%):', '₱0.00'],
+        ['TOTAL:', f'₱{receipt.total:.2f}'],
+    ], colWidths=[4 * inch, 1.25 * inch])
+    totals_table.setStyle(kit.totals_style)
+    elements.append(totals_table)
+
+    elements.append(kit.Spacer(1, 30))
+    elements.append(kit.Paragraph("Thank you for your purchase!", kit.footer))
+    elements.append(kit.Paragraph("Visit us again soon! ☕", kit.footer))
+    return elements
+
+
+def pdf_document(target):
+    """A letter-size document with the receipt margins; target is a path or a binary file object.
+
+    invariant=True leaves out ReportLab's creation timestamp and random
+    document id, so the same receipt always renders to the same bytes.
+    """
+    kit = _pdf_kit()
+    return kit.SimpleDocTemplate(target, pagesize=kit.letter, rightMargin=50, leftMargin=50,
+                                 topMargin=50, bottomMargin=50, invariant=True)
+
+
+def render_pdf(receipt, filepath):
+    """Write one receipt as a PDF and return its path"""
+    pdf_document(filepath).build(pdf_elements(receipt))
+    return filepath
+
+
+def render_pdf_bytes(receipt):
+    """One receipt as PDF bytes"""
+    buffer = io.BytesIO()
+    pdf_document(buffer).build(pdf_elements(receipt))
+    return buffer.getvalue()
+
+
+# ============ RENDERERS ============
+# A renderer turns a Receipt into bytes with render(); called as
+# renderer(receipt, filepath) it writes them to a file, which is the shape
+# ReceiptService's render takes. extension names the files it writes and
+# key identifies its output (format and options) for the receipt store.
+
+class ReceiptRenderer:
+    extension = "bin"
+
+    @property
+    def key(self):
+        return self.extension
+
+    def render(self, receipt):
+        raise NotImplementedError
+
+    def __call__(self, receipt, filepath):
+        with open(filepath, "wb") as f:
+            f.write(self.render(receipt))
+        return filepath
+
+
+class PdfRenderer(ReceiptRenderer):
+    """The ReportLab PDF receipt"""
+    extension = "pdf"
+
+    def render(self, receipt):
+        return render_pdf_bytes(receipt)
+
+    def __call__(self, receipt, filepath):
+        return render_pdf(receipt, filepath)
+
+
+class TextRenderer(ReceiptRenderer):
+    """Fixed-width plain text in the layout of the old .txt receipts.
+
+    Everything that doesn't change between receipts (rules, banner, column
+    header, footer) is formatted and encoded once in __init__; a receipt is
+    a handful of str.format calls joined into one bytes object.
+    """
+    extension = "txt"
+
+    def __init__(self, width=50, currency="₱", encoding="utf-8", logo="☕ "):
+        self.width = width
+        self.currency = currency
+        self.encoding = encoding
+        self.logo = logo
+        self._name_width = width - 26
+        self._item = "  {:<%d.%d}{:>5}{:>10}{:>9}\n" % (self._name_width, self._name_width)
+        self._amount = "  {:<%d}{:>%d}\n" % (width - 14, 12)
+        self._rule = "=" * width + "\n"
+        self._dash = "-" * width + "\n"
+        self._head = self._encode(self._head_text())
+        self._columns = self._encode(self._dash + self._item.format("ITEM", "QTY", "PRICE", "TOTAL") + self._dash)
+        self._foot = self._encode(self._foot_text())
+
+    @property
+    def key(self):
+        return f"{type(self).__name__}:{self.width}:{self.currency}:{self.encoding}:{self.logo}"
+
+    def _encode(self, text):
+        return text.encode(self.encoding, "replace")
+
+    def _head_text(self):
+        return (self._rule + f"{self.logo}COFFEESTRY".center(self.width).rstrip() + "\n"
+                + "Your Cozy Coffee Shop".center(self.width).rstrip() + "\n" + self._rule + "\n")
+
+    def _foot_text(self):
+        return ("\n" + "Thank you for your purchase!".center(self.width).rstrip() + "\n"
+                + f"Visit us again soon! {self.logo}".rstrip().center(self.width).rstrip() + "\n\n" + self._rule)
+
+    def _money(self, amount):
+        return f"{self.currency}{amount:.2f}"
+
+    def _details(self, receipt):
+        return (f"  Order #: {receipt.order_id}\n  Date: {receipt.order_date}\n"
+                f"  Customer: {receipt.customer_name}\n  Order Type: {receipt.order_type}\n"
+                f"  {receipt.payment_label}: {receipt.payment_method}\n\n")
+
+    def _items(self, receipt):
+        item, money = self._item, self._money
+        return "".join(item.format(line["name"], line["quantity"], money(line["price"]),
+                                   money(from_cents(to_cents(line["price"]) * line["quantity"])))
+                       for line in receipt.items)
+
+    def _totals(self, receipt):
+        return (self._dash + self._amount.format("Subtotal:", self._money(receipt.subtotal))
+                + self._amount.format("Tax (0%):", self._money(0)) + self._rule)
+
+    def _grand_total(self, receipt):
+        return self._amount.format("TOTAL:", self._money(receipt.total)) + self._rule
+
+    def render(self, receipt):
+        return b"".join((
+            self._head,
+            self._encode(self._details(receipt)),
+            self._columns,
+            self._encode(self._items(receipt) + self._totals(receipt) + self._grand_total(receipt)),
+            self._foot,
+        ))
+
+
+class EscPosRenderer(TextRenderer):
+    """ESC/POS bytes for an 80mm thermal printer (48 columns of font A).
+
+    The same layout as TextRenderer with printer commands around it: reset,
+    a centred double-size banner, a bold total, then feed and cut. Text is
+    code page 437, which has no peso sign, so amounts are prefixed "P".
+    """
+    extension = "bin"
+
+    RESET = b"\x1b@"
+    ALIGN_LEFT = b"\x1ba\x00"
+    ALIGN_CENTER = b"\x1ba\x01"
+    BOLD_ON = b"\x1bE\x01"
+    BOLD_OFF = b"\x1bE\x00"
+    DOUBLE_SIZE = b"\x1d!\x11"
+    NORMAL_SIZE = b"\x1d!\x00"
+    FEED_AND_CUT = b"\x1dVB\x04"
+
+    def __init__(self, width=48, currency="P", encoding="cp437", logo=""):
+        super().__init__(width, currency, encoding, logo)
+        self._head = (self.RESET + self.ALIGN_CENTER + self.DOUBLE_SIZE + self.BOLD_ON + b"COFFEESTRY\n"
+                      + self.NORMAL_SIZE + self.BOLD_OFF + b"Your Cozy Coffee Shop\n" + self.ALIGN_LEFT
+                      + self._encode(self._rule + "\n"))
+        self._foot = (self.ALIGN_CENTER + b"\nThank you for your purchase!\nVisit us again soon!\n"
+                      + self.ALIGN_LEFT + self.FEED_AND_CUT)
+
+    def render(self, receipt):
+        return b"".join((
+            self._head,
+            self._encode(self._details(receipt)),
+            self._columns,
+            self._encode(self._items(receipt) + self._totals(receipt)),
+            self.BOLD_ON,
+            self._encode(self._grand_total(receipt)),
+            self.BOLD_OFF,
+            self._foot,
+        ))
+
+
+RENDERERS = {"pdf": PdfRenderer, "text": TextRenderer, "escpos": EscPosRenderer}
+
+
+def get_renderer(name=RECEIPT_FORMAT, **options):
+    """A renderer by RENDERERS name; options go to its constructor (e.g. width=42)"""
+    if name not in RENDERERS:
+        raise ValueError(f"unknown receipt format {name!r}; expected one of {', '.join(RENDERERS)}")
+    return RENDERERS[name](**options)
+
+
+def print_receipt(receipt, sink, renderer=None):
+    """Render a receipt and hand the bytes to a printer sink (see printers.py); returns what the sink returns"""
+    renderer = renderer or get_renderer()
+    return sink.send(renderer.render(receipt), receipt_filename(receipt.order_id, renderer.extension))
+
+
+# ============ RECEIPT SERVICE ============
+
+class ReceiptService:
+    """Renders receipts off the UI thread.
+
+    submit() puts a job on a queue and returns a Future at once; a small
+    pool of worker threads takes jobs in order and renders them. ReportLab
+    is pure Python, so for throughput the threads can hand the rendering
+    itself to a process pool (processes=N); the threads then only wait.
+    on_done(future) runs on the worker thread when a job finishes, which is
+    where the UI shows its "saved" or error message.
+
+    With a store (receipt_store.ReceiptStore) a receipt that was rendered
+    before is written from the stored bytes instead of rendered again, and
+    files are named by content, so re-printing an unchanged receipt into the
+    same folder doesn't add another copy.
+    """
+
+    def __init__(self, render=render_pdf, workers=DEFAULT_WORKERS, processes=0, store=None, mp_context=None):
+        # render(receipt, filepath) writes one receipt: a function, or a renderer from get_renderer()
+        if store is not None and not isinstance(render, ReceiptRenderer):
+            raise TypeError("a receipt store needs a renderer from get_renderer(), not a plain function")
+        self.render = render
+        self.workers = workers
+        self.processes = processes
+        self.mp_context = mp_context or multiprocessing.get_context(MP_START_METHOD)
+        self.store = store
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._pool = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "reused": 0, "render_seconds": 0.0}
+
+    def _start(self):
+        if self.processes and self._pool is None:
+            self._pool = ProcessPoolExecutor(self.processes, mp_context=self.mp_context)
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"receipt-worker-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, receipt, folder, on_done=None, filename=None):
+        """Queue a receipt for rendering into folder; returns a Future for the written path"""
+        future = Future()
+        if on_done is not None:
+            future.add_done_callback(on_done)
+        os.makedirs(folder, exist_ok=True)
+        if filename is None:
+            filename = (self.store.filename(receipt, self.render) if self.store is not None
+                        else receipt_filename(receipt.order_id, getattr(self.render, "extension", "pdf")))
+        filepath = os.path.join(folder, filename)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("receipt service is closed")
+            self._start()
+            self.stats["submitted"] += 1
+            # Queued under the lock, so close() can't put its stop markers ahead of this job
+            self._jobs.put((future, receipt, filepath))
+        return future
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, receipt, filepath = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            start = time.perf_counter()
+            try:
+                if self.store is not None:
+                    result = self._write_stored(receipt, filepath)
+                elif self._pool is not None:
+                    result = self._pool.submit(self.render, receipt, filepath).result()
+                else:
+                    result = self.render(receipt, filepath)
+            except Exception as e:
+                with self._lock:
+                    self.stats["failed"] += 1
+                future.set_exception(e)
+            else:
+                with self._lock:
+                    self.stats["completed"] += 1
+                    self.stats["render_seconds"] += time.perf_counter() - start
+                future.set_result(result)
+
+    def _write_stored(self, receipt, filepath):
+        data = self.store.fetch(receipt, self.render)
+        if data is not None:
+            with self._lock:
+                self.stats["reused"] += 1
+        else:
+            if self._pool is not None:
+                data = self._pool.submit(self.render.render, receipt).result()
+            else:
+                data = self.render.render(receipt)
+            self.store.put(receipt, self.render, data)
+        partial = filepath + ".part"
+        with open(partial, "wb") as f:
+            f.write(data)
+        os.replace(partial, filepath)
+        return filepath
+
+    def pending(self):
+        """Jobs queued but not yet picked up by a worker"""
+        return self._jobs.qsize()
+
+    def close(self, wait=True):
+        """Stop taking jobs; with wait=True, finish the queued ones first"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._jobs.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+
+
+# ============ BATCH EXPORT ============
+# Exports take an iterable of Receipts (e.g. receipt_from_order() over
+# database.iter_orders_for_receipts()) and consume it lazily, so the orders
+# are fetched page by page while the file is written.
+
+def _render_chunk(render, receipts):
+    return [render(receipt) for receipt in receipts]
+
+
+def _chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _rendered_in_order(render, receipts, processes, mp_context):
+    """Yield (receipt, render(receipt)) in input order, rendering in a process pool.
+
+    Receipts go to the pool EXPORT_CHUNK at a time to keep the pickling
+    overhead per receipt low, and at most EXPORT_WINDOW_PER_PROCESS chunks
+    per process are in flight, so neither unrendered receipts nor rendered
+    bytes pile up in memory. processes=0 renders in this process.
+    """
+    if not processes:
+        for receipt in receipts:
+            yield receipt, render(receipt)
+        return
+    window = processes * EXPORT_WINDOW_PER_PROCESS
+    with ProcessPoolExecutor(processes, mp_context=mp_context) as pool:
+        in_flight = deque()
+        for chunk in _chunked(receipts, EXPORT_CHUNK):
+            in_flight.append((chunk, pool.submit(_render_chunk, render, chunk)))
+            if len(in_flight) >= window:
+                done, future = in_flight.popleft()
+                yield from zip(done, future.result())
+        while in_flight:
+            done, future = in_flight.popleft()
+            yield from zip(done, future.result())
+
+
+def export_receipts_zip(receipts, path, processes=None, render=render_pdf_bytes, on_progress=None, mp_context=None):
+    """Write one PDF per receipt into a ZIP at path; returns how many were written.
+
+    Receipts render in parallel processes (default: one per CPU) and each is
+    added to the archive as soon as it's ready; only the archive's directory
+    (a few hundred bytes per entry) is kept until the end. The archive is built next
+    to path and moved into place at the end, so a failed export leaves no
+    half-written file. on_progress(count) is called after every receipt.
+    Render processes start with MP_START_METHOD unless mp_context is given.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    mp_context = mp_context or multiprocessing.get_context(MP_START_METHOD)
+    partial = path + ".part"
+    count = 0
+    try:
+        with zipfile.ZipFile(partial, "w", zipfile.ZIP_DEFLATED) as archive:
+            for receipt, data in _rendered_in_order(render, receipts, processes, mp_context):
+                archive.writestr(f"receipt_order_{receipt.order_id}.pdf", data)
+                count += 1
+                if on_progress is not None:
+                    on_progress(count)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return count
+
+
+class _FlowableStream(list):
+    """The flowable list SimpleDocTemplate.build() consumes, refilled one receipt at a time.
+
+    build() only works at the head of its list (len(), [0], del [0], and
+    inserts at 0 for split tables), so handing it the receipts' flowables
+    one receipt at a time keeps a single receipt's worth alive instead of
+    the whole export's.
+    """
+
+    def __init__(self, chunks):
+        super().__init__()
+        self._chunks = iter(chunks)
+
+    def __len__(self):
+        while not super().__len__():
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self.extend(chunk)
+        return super().__len__()
+
+
+def export_receipts_pdf(receipts, path, on_progress=None):
+    """Write every receipt into one multi-page PDF at path, a page break between receipts; returns the count.
+
+    One document is laid out in order by one process, so unlike the ZIP
+    export this doesn't use a process pool. The Python side stays flat
+    (see _FlowableStream), but ReportLab keeps the finished pages' content
+    until it saves, so memory still grows with the size of the PDF: use the
+    ZIP export for very large ranges.
+    """
+    from reportlab.platypus import PageBreak
+    count = 0
+
+    def chunks():
+        nonlocal count
+        for receipt in receipts:
+            yield ([PageBreak()] if count else []) + pdf_elements(receipt)
+            count += 1
+            if on_progress is not None:
+                on_progress(count)
+
+    partial = path + ".part"
+    try:
+        with open(partial, "wb") as f:
+            pdf_document(f).build(_FlowableStream(chunks()))
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return count
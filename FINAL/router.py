@@ -0,0 +1,74 @@
+class ViewRouter:
+    """Route-based views for one content area, built on first visit and kept for the next.
+
+    routes maps a route ("/orders") to the function that builds its view,
+    called the first time the route is visited. It either returns the
+    view's root control or, like main.py's layout functions, puts it in
+    container.content itself.
+
+    Navigation goes through page.route: go() calls page.go(), and the
+    page's on_route_change shows the route. Leaving a route keeps whatever
+    its view shows at that moment, so coming back puts the same controls
+    back with their state (scroll position, half-filled cart, search) and
+    without querying the database again.
+
+    depends maps a route to the data topics it shows ("orders",
+    "products"); changed(topic) after a write marks the other views showing
+    that data stale, and they are built afresh on their next visit.
+    """
+
+    def __init__(self, page, container, routes, depends=None):
+        self.page = page
+        self.container = container
+        self.routes = dict(routes)
+        self.depends = {route: set(topics) for route, topics in (depends or {}).items()}
+        self.current = None
+        self._views = {}     # route -> its root control, as last shown
+        self._stale = set()  # routes to build afresh on their next visit
+        self.stats = {"built": 0, "reused": 0}
+
+    def attach(self, route=None):
+        """Take over the page's route changes and show route (default: the first route)"""
+        self.page.on_route_change = self._route_changed
+        self.go(route or next(iter(self.routes)))
+
+    def _route_changed(self, e):
+        if e.route in self.routes:
+            self.show(e.route)
+
+    def go(self, route):
+        """Navigate to route, through page.route"""
+        if route not in self.routes:
+            raise KeyError(f"no view for route {route!r}")
+        if self.page.route == route:
+            self.show(route)  # page.go() to the current route may not fire on_route_change
+        else:
+            self.page.go(route)
+
+    def show(self, route):
+        """Show route's view: the kept one, or a new one if it was never built or has gone stale"""
+        if self.current is not None and self.current not in self._stale:
+            self._views[self.current] = self.container.content
+        self.current = route
+        view = self._views.get(route)
+        if view is None or route in self._stale:
+            self._stale.discard(route)
+            self._views.pop(route, None)
+            self.stats["built"] += 1
+            built = self.routes[route]()
+            if built is not None:
+                self.container.content = built
+                self.page.update()
+        else:
+            self.stats["reused"] += 1
+            self.container.content = view
+            self.page.update()
+
+    def changed(self, *topics):
+        """Data behind these topics changed: views showing it are built afresh on their next visit.
+
+        The view on screen is left alone: it's the one that made the change, and it redraws itself.
+        """
+        for route, route_topics in self.depends.items():
+            if route != self.current and route_topics.intersection(topics):
+                self._stale.add(route)
@@ -0,0 +1,54 @@
+class KeyedRowCache:
+    """Builds one table row per item and reuses it across filters.
+
+    Rows are keyed by key(item), which should change whenever the item's
+    displayed content does (e.g. the product tuple), so an edited item gets
+    a fresh row while untouched ones are reused. arrange() returns the rows
+    for a filtered view without rebuilding anything: matching rows in result
+    order, followed by the others with visible=False. For a UI framework that
+    diffs child lists (Flet), unchanged rows then cost nothing and filtered
+    rows only a visibility flag.
+    """
+
+    def __init__(self, build_row, key):
+        self.build_row = build_row
+        self.key = key
+        self._rows = {}
+        self.stats = {"built": 0, "reused": 0, "dropped": 0}
+
+    def _row(self, item):
+        key = self.key(item)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = self.build_row(item)
+            self.stats["built"] += 1
+        else:
+            self.stats["reused"] += 1
+        return key, row
+
+    def arrange(self, catalog, matches):
+        """Rows for the whole catalog: matches first (in their order) and visible, the rest hidden"""
+        catalog_rows = dict(self._row(item) for item in catalog)
+        # Rows of items that left the catalog (deleted or edited) are released
+        for key in self._rows.keys() - catalog_rows.keys():
+            del self._rows[key]
+            self.stats["dropped"] += 1
+
+        shown = []
+        shown_keys = set()
+        for item in matches:
+            key = self.key(item)
+            row = catalog_rows.get(key)
+            if row is not None and key not in shown_keys:
+                shown_keys.add(key)
+                shown.append(row)
+        hidden = [row for key, row in catalog_rows.items() if key not in shown_keys]
+        for row in shown:
+            if row.visible is False:
+                row.visible = True
+        for row in hidden:
+            row.visible = False
+        return shown + hidden
+
+    def __len__(self):
+        return len(self._rows)
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+
+# Quiet time after the last keystroke before a search runs
+DEFAULT_DELAY = 0.15
+# Keystroke latencies kept for latency_stats()
+LATENCY_WINDOW = 200
+
+
+class DebouncedSearch:
+    """Debounced, cancellable search-as-you-type.
+
+    submit(query) on every keystroke restarts a short timer; only the last
+    query of a burst runs. Each submit also bumps a generation counter, so a
+    search that is still running when a newer keystroke arrives is dropped
+    instead of rendered. render(results) is only called when key(results)
+    differs from what is on screen.
+
+    Latency is measured per keystroke, from the keystroke to the moment its
+    burst's results were rendered (or found unchanged).
+    """
+
+    def __init__(self, run, render, key=None, delay=DEFAULT_DELAY, clock=time.perf_counter):
+        self.run = run
+        self.render = render
+        self.key = key or (lambda results: tuple(results))
+        self.delay = delay
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._timer = None
+        self._generation = 0
+        self._pending = None            # (query, keystroke times) of the burst not yet searched
+        self._shown = None              # key of the results on screen
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {"keystrokes": 0, "searches": 0, "stale": 0, "renders": 0, "unchanged": 0}
+
+    def submit(self, query):
+        """Queue a search for query, replacing any not yet run"""
+        with self._lock:
+            self.stats["keystrokes"] += 1
+            self._generation += 1
+            keystrokes = self._pending[1] if self._pending else []
+            keystrokes.append(self._clock())
+            self._pending = (query, keystrokes)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._fire, args=(self._generation,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Run the pending search now (e.g. on Enter or a category click)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            generation = self._generation
+        self._fire(generation)
+
+    def _fire(self, generation):
+        with self._lock:
+            if generation != self._generation or self._pending is None:
+                return
+            query, keystrokes = self._pending
+            self._pending = None
+            self._timer = None
+            self.stats["searches"] += 1
+        results = self.run(query)
+        # Renders are serialized so an older search can never paint over a newer one
+        with self._render_lock:
+            with self._lock:
+                if generation != self._generation:
+                    # A newer keystroke arrived while this search ran; its own search renders
+                    # instead, and these keystrokes are timed until then
+                    self.stats["stale"] += 1
+                    if self._pending is not None:
+                        self._pending = (self._pending[0], keystrokes + self._pending[1])
+                    return
+                key = self.key(results)
+                changed = key != self._shown
+                self._shown = key
+            if changed:
+                self.render(results)
+            done = self._clock()
+            with self._lock:
+                self.stats["renders" if changed else "unchanged"] += 1
+                self._latencies.extend(done - pressed for pressed in keystrokes)
+
+    def invalidate(self):
+        """Forget what is on screen so the next search renders even if unchanged"""
+        with self._lock:
+            self._shown = None
+
+    def latency_stats(self):
+        """Keystroke-to-screen latency over the recent window: {count, p50_ms, p95_ms, max_ms}"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {"count": len(latencies), "p50_ms": percentile(0.5), "p95_ms": percentile(0.95),
+                "max_ms": latencies[-1] * 1000}
@@ -0,0 +1,96 @@
+"""
+Unit Tests for the bundled assets
+=================================
+Run tests with: python -m pytest test_assets.py -v
+"""
+
+import hashlib
+import os
+import struct
+import subprocess
+import sys
+import unittest
+
+import assets
+import build_assets
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def png_size(path):
+    with open(path, "rb") as f:
+        return struct.unpack(">II", f.read(24)[16:24])
+
+# Makes any network access in the probe fail loudly
+OFFLINE_PROBE = """
+import socket, sys
+def offline(*args, **kwargs):
+    raise OSError("network disabled")
+socket.socket.connect = socket.create_connection = socket.getaddrinfo = offline
+import assets
+print(assets.image_src("logo.png", 400, 300), assets.image_src("logo.png", 400, 300, ratio=2))
+"""
+
+
+class TestManifest(unittest.TestCase):
+    """Test cases for the checked-in assets and their manifest"""
+
+    def test_files_match(self):
+        """Test that every variant on disk matches its manifest entry"""
+        manifest = assets.load_manifest()
+        entries = [variant for image in manifest["images"].values() for variant in image["variants"]]
+        self.assertTrue(entries)
+        for entry in entries:
+            with open(os.path.join(assets.ASSETS_DIR, entry["file"]), "rb") as f:
+                data = f.read()
+            self.assertEqual((len(data), hashlib.sha256(data).hexdigest()), (entry["bytes"], entry["sha256"]),
+                             f"{entry['file']} changed; run python build_assets.py")
+
+    def test_every_rendered_box_is_sharp(self):
+        """Test that each box gets enough pixels at every pixel ratio built for"""
+        for name, boxes in build_assets.IMAGES.items():
+            source = png_size(os.path.join(HERE, "source", name))
+            for box in boxes:
+                for ratio in build_assets.SCALES:
+                    src = assets.image_src(name, *box, ratio=ratio)
+                    size = png_size(src if os.path.isabs(src) else os.path.join(assets.ASSETS_DIR, src))
+                    # Enough device pixels for the box at this ratio, or the original when it has fewer
+                    self.assertEqual(size, assets.contain(*source, box[0] * ratio, box[1] * ratio),
+                                     f"{name} at {box} x{ratio}")
+
+    def test_variants_are_smaller(self):
+        """Test that variants are smaller files than their source"""
+        for image in assets.load_manifest()["images"].values():
+            for variant in image["variants"]:
+                self.assertLess(variant["bytes"], image["source"]["bytes"])
+
+    def test_fallbacks(self):
+        """Test that boxes no variant fills, and unknown images, get the original"""
+        self.assertEqual(assets.image_src("logo.png", 2000, 2000, ratio=1), os.path.join(HERE, "source", "logo.png"))
+        self.assertEqual(assets.image_src("logo.png", 400, 300, ratio=2), os.path.join(HERE, "source", "logo.png"))
+        self.assertEqual(assets.image_src("coffee.jpg", 100, 100), os.path.join(HERE, "source", "coffee.jpg"))
+
+    def test_no_network_fonts(self):
+        """Test that main.py no longer registers fonts by URL"""
+        with open(os.path.join(HERE, "main.py"), encoding="utf-8") as f:
+            self.assertNotIn("fonts.googleapis.com", f.read())
+
+    def test_resolves_offline(self):
+        """Test that image sources resolve with the network disabled, to the built variant by default"""
+        result = subprocess.run([sys.executable, "-c", OFFLINE_PROBE], cwd=HERE, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split(), ["images/logo_300x300.png", os.path.join(HERE, "source", "logo.png")])
+
+
+class TestContain(unittest.TestCase):
+    """Test cases for the CONTAIN sizing"""
+
+    def test_contain(self):
+        """Test that images shrink to fit the box and are never upscaled"""
+        self.assertEqual(assets.contain(500, 500, 400, 300), (300, 300))
+        self.assertEqual(assets.contain(1440, 1024, 400, 300), (400, 284))
+        self.assertEqual(assets.contain(100, 50, 400, 300), (100, 50))
+
+
+if __name__ == "__main__":
+    unittest.main()
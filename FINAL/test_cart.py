@@ -0,0 +1,279 @@
+"""
+Unit Tests for the Cart domain object
+=====================================
+Run tests with: python -m pytest test_cart.py -v
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import database
+from cart import Cart, CartError, CartLine, to_cents
+from connection_pool import close_pool
+
+LATTE = {"id": 1, "name": "Latte", "category": "Coffee", "price": 120.0}
+MOCHA = {"id": 2, "name": "Mocha", "category": "Coffee", "price": 135.5}
+CROISSANT = {"id": 3, "name": "Croissant", "category": "Pastry", "price": 0.1}
+MENU = [LATTE, MOCHA, CROISSANT] + [
+    {"id": 10 + i, "name": f"Item {i}", "category": "Pastry", "price": round(0.05 + i * 17.33, 2)} for i in range(7)
+]
+
+# Random operation sequences per property; the seed keeps failures reproducible
+EXAMPLES = 300
+
+
+class TestCart(unittest.TestCase):
+    """Test cases for Cart"""
+
+    def setUp(self):
+        self.cart = Cart()
+
+    def test_add_creates_then_merges_lines_by_product_id(self):
+        """Test that adding a product again merges into its line"""
+        line, created = self.cart.add(LATTE, 2)
+        self.assertTrue(created)
+        again, created = self.cart.add(LATTE, 3)
+        self.assertFalse(created)
+        self.assertIs(again, line)
+        self.assertEqual(line.quantity, 5)
+        self.assertEqual(len(self.cart), 1)
+        self.assertEqual(self.cart.total_cents, 60000)
+        self.assertEqual(self.cart.total, 600.0)
+
+    def test_same_name_different_id_are_separate_lines(self):
+        """Test that lines are keyed by product id, not name"""
+        self.cart.add(LATTE)
+        self.cart.add(dict(LATTE, id=9))
+        self.assertEqual(len(self.cart), 2)
+
+    def test_running_total_follows_every_change(self):
+        """Test that the running total follows adds, quantity changes and removes"""
+        self.cart.add(LATTE, 2)
+        self.cart.add(MOCHA)
+        self.assertEqual(self.cart.total, 375.5)
+        self.cart.set_quantity(MOCHA["id"], 3)
+        self.assertEqual(self.cart.total, 646.5)
+        self.assertEqual(self.cart.remove(LATTE["id"]).name, "Latte")
+        self.assertEqual(self.cart.total, 406.5)
+        self.assertIsNone(self.cart.set_quantity(MOCHA["id"], 0))
+        self.assertNotIn(MOCHA["id"], self.cart)
+        self.assertEqual(self.cart.total_cents, 0)
+
+    def test_total_is_exact(self):
+        """Test that totals are summed in centavos without float drift"""
+        for _ in range(10):
+            self.cart.add(CROISSANT)
+        self.assertEqual(self.cart.total_cents, 100)
+        self.assertEqual(self.cart.total, 1.0)
+
+    def test_remove_missing_product_is_noop(self):
+        """Test that removing a product not in the cart changes nothing"""
+        self.cart.add(LATTE)
+        self.assertIsNone(self.cart.remove(42))
+        self.assertEqual(self.cart.total, 120.0)
+
+    def test_rejects_bad_quantities(self):
+        """Test that zero, negative, fractional and non-int quantities are rejected"""
+        for quantity in (0, -1, 1.5, True, "2"):
+            with self.assertRaises(CartError):
+                self.cart.add(LATTE, quantity)
+        self.assertEqual(len(self.cart), 0)
+
+    def test_line_slots(self):
+        """Test that cart lines don't accept arbitrary attributes"""
+        line, _ = self.cart.add(LATTE)
+        with self.assertRaises(AttributeError):
+            line.discount = 5
+
+    def test_items_are_order_item_dicts_in_add_order(self):
+        """Test that items() gives save_order's item dicts in add order"""
+        self.cart.add(MOCHA)
+        self.cart.add(LATTE, 2)
+        items = self.cart.items()
+        self.assertEqual([item["name"] for item in items], ["Mocha", "Latte"])
+        self.assertEqual(items[1], {"id": 1, "name": "Latte", "category": "Coffee", "price": 120.0, "quantity": 2})
+
+    def test_merge_rejects_conflicting_prices(self):
+        """Test that merging carts with different prices for a product fails"""
+        self.cart.add(LATTE)
+        other = Cart()
+        other.add(dict(LATTE, price=99))
+        with self.assertRaises(CartError):
+            self.cart.merge(other)
+
+    def test_split_rejects_more_than_in_cart(self):
+        """Test that a split asking for more than the cart holds fails and changes nothing"""
+        self.cart.add(LATTE, 2)
+        with self.assertRaises(CartError):
+            self.cart.split({LATTE["id"]: 3})
+        with self.assertRaises(CartError):
+            self.cart.split({MOCHA["id"]: 1})
+        self.assertEqual(self.cart.get(LATTE["id"]).quantity, 2)
+
+    def test_from_json_rejects_garbage(self):
+        """Test that malformed cart JSON is rejected"""
+        for text in ("not json", "{}", '{"lines": [[1, "Latte"]]}', '{"lines": [[1, "Latte", "Coffee", 1.5, 1]]}',
+                     '{"lines": [[1, "Latte", "Coffee", 100, 0]]}'):
+            with self.assertRaises(CartError):
+                Cart.from_json(text)
+
+
+class TestCartCheckout(unittest.TestCase):
+    """Test cases for turning a cart into an order"""
+
+    def setUp(self):
+        self.cart = Cart()
+        self.cart.add(LATTE, 2)
+        self.cart.add(MOCHA)
+
+    def test_to_order_feeds_save_order(self):
+        """Test that to_order() gives a total equal to its items"""
+        total, items = self.cart.to_order(MENU)
+        self.assertEqual(total, 375.5)
+        self.assertEqual(sum(item["price"] * item["quantity"] for item in items), total)
+
+    def test_to_order_rejects_empty_cart(self):
+        """Test that an empty cart can't be ordered"""
+        with self.assertRaises(CartError):
+            Cart().to_order(MENU)
+
+    def test_to_order_rejects_stale_prices_and_removed_products(self):
+        """Test that changed prices and removed products block the order"""
+        menu = [dict(LATTE, price=125.0)]
+        with self.assertRaises(CartError) as raised:
+            self.cart.to_order(menu)
+        self.assertIn("price of Latte changed", str(raised.exception))
+        self.assertIn("Mocha is no longer available", str(raised.exception))
+
+    def test_reprice_fixes_the_cart(self):
+        """Test that reprice() updates prices, drops removed products and reports both"""
+        menu = [dict(LATTE, price=125.0), dict(CROISSANT)]
+        problems = self.cart.reprice(menu)
+        self.assertEqual(sorted((line.name, reason) for line, reason in problems),
+                         [("Latte", "price"), ("Mocha", "unavailable")])
+        self.assertEqual(self.cart.to_order(menu), (250.0, [dict(LATTE, price=125.0, quantity=2)]))
+
+    def test_to_order_against_database_catalog(self):
+        """Test a cart checked out against the database catalog and saved"""
+        temp_dir = tempfile.mkdtemp()
+        original_path = database.DB_PATH
+        database.DB_PATH = os.path.join(temp_dir, "cart.db")
+        try:
+            database.init_db()
+            database.add_product("Flat White", "Coffee", 145.0)
+            catalog = [{"id": p[0], "name": p[1], "category": p[2], "price": p[3]} for p in database.get_products()]
+            cart = Cart()
+            cart.add(next(p for p in catalog if p["name"] == "Flat White"), 3)
+            total, items = cart.to_order(catalog)
+            order_id = database.save_order("Walk-in Customer", "Dine in", total, items)
+            self.assertEqual(database.get_order_items(order_id), [("Flat White", "Coffee", 145.0, 3)])
+        finally:
+            close_pool(database.DB_PATH)
+            database.DB_PATH = original_path
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestCartProperties(unittest.TestCase):
+    """Invariants over random operation sequences, checked against a plain dict model"""
+
+    def random_cart(self, rng, max_ops=25):
+        cart, model = Cart(), {}
+        for _ in range(rng.randrange(max_ops)):
+            product = rng.choice(MENU)
+            op = rng.random()
+            if op < 0.6:
+                quantity = rng.randint(1, 5)
+                cart.add(product, quantity)
+                model[product["id"]] = model.get(product["id"], 0) + quantity
+            elif op < 0.8 and product["id"] in model:
+                quantity = rng.randint(0, 5)
+                cart.set_quantity(product["id"], quantity)
+                model[product["id"]] = quantity
+            else:
+                cart.remove(product["id"])
+                model.pop(product["id"], None)
+            model = {product_id: quantity for product_id, quantity in model.items() if quantity}
+        return cart, model
+
+    def assert_consistent(self, cart):
+        self.assertEqual(cart.total_cents, sum(line.unit_cents * line.quantity for line in cart))
+        self.assertTrue(all(line.quantity > 0 for line in cart))
+
+    def test_matches_model(self):
+        """Test that lines and totals match a plain dict model"""
+        prices = {product["id"]: to_cents(product["price"]) for product in MENU}
+        rng = random.Random(16)
+        for _ in range(EXAMPLES):
+            cart, model = self.random_cart(rng)
+            self.assert_consistent(cart)
+            self.assertEqual({line.product_id: line.quantity for line in cart}, model)
+            self.assertEqual(cart.total_cents, sum(prices[product_id] * quantity for product_id, quantity in model.items()))
+
+    def test_json_round_trip(self):
+        """Test that to_json()/from_json() round-trips any cart"""
+        rng = random.Random(17)
+        for _ in range(EXAMPLES):
+            cart, _ = self.random_cart(rng)
+            restored = Cart.from_json(cart.to_json())
+            self.assertEqual(restored, cart)
+            self.assertEqual(restored.total_cents, cart.total_cents)
+
+    def test_merge_adds_totals_and_quantities(self):
+        """Test that merging adds totals and per-product quantities"""
+        rng = random.Random(18)
+        for _ in range(EXAMPLES):
+            a, model_a = self.random_cart(rng)
+            b, model_b = self.random_cart(rng)
+            expected_total = a.total_cents + b.total_cents
+            merged = a.copy().merge(b)
+            self.assert_consistent(merged)
+            self.assertEqual(merged.total_cents, expected_total)
+            for product_id in model_a.keys() | model_b.keys():
+                self.assertEqual(merged.get(product_id).quantity, model_a.get(product_id, 0) + model_b.get(product_id, 0))
+            self.assertEqual(a.quantity + b.quantity, merged.quantity)
+
+    def test_split_then_merge_restores_cart(self):
+        """Test that splitting then merging back gives the original cart"""
+        rng = random.Random(19)
+        for _ in range(EXAMPLES):
+            cart, model = self.random_cart(rng)
+            original = cart.copy()
+            moved = {product_id: rng.randint(1, quantity) for product_id, quantity in model.items() if rng.random() < 0.5}
+            part = cart.split(moved)
+            self.assert_consistent(cart)
+            self.assert_consistent(part)
+            self.assertEqual(cart.total_cents + part.total_cents, original.total_cents)
+            self.assertEqual({line.product_id: line.quantity for line in part}, moved)
+            cart.merge(part)
+            self.assertEqual(sorted(cart, key=lambda line: line.product_id),
+                             sorted(original, key=lambda line: line.product_id))
+
+    def test_to_order_total_equals_item_sum(self):
+        """Test that the order total always equals the sum of its items"""
+        rng = random.Random(20)
+        for _ in range(EXAMPLES):
+            cart, model = self.random_cart(rng)
+            if not model:
+                continue
+            total, items = cart.to_order(MENU)
+            self.assertEqual(to_cents(total), sum(to_cents(item["price"]) * item["quantity"] for item in items))
+            self.assertEqual(len(items), len(model))
+
+
+class TestCartLine(unittest.TestCase):
+    """Test cases for CartLine"""
+
+    def test_equality_and_repr(self):
+        """Test CartLine equality, line total and repr"""
+        line = CartLine(1, "Latte", "Coffee", 12000, 2)
+        self.assertEqual(line, CartLine(1, "Latte", "Coffee", 12000, 2))
+        self.assertNotEqual(line, CartLine(1, "Latte", "Coffee", 12000, 3))
+        self.assertEqual(line.line_total, 240.0)
+        self.assertIn("Latte", repr(line))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit Tests for the product catalog cache
+=========================================
+Run tests with: python -m pytest test_catalog_cache.py -v
+"""
+
+import unittest
+
+from catalog_cache import CatalogCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCatalogCache(unittest.TestCase):
+    """Test cases for CatalogCache"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = CatalogCache(max_owners=2, ttl=60, clock=self.clock)
+        self.loads = []
+
+    def loader(self, owner, products=None):
+        def load():
+            self.loads.append(owner)
+            return products if products is not None else [(1, f"Latte {owner}", "Coffee", 160.0)]
+        return load
+
+    def test_second_get_is_a_hit(self):
+        """Test that a cached catalog is served without reloading"""
+        first = self.cache.get(1, self.loader(1))
+        second = self.cache.get(1, self.loader(1))
+        self.assertEqual(first, second)
+        self.assertEqual(self.loads, [1])
+        self.assertEqual((self.cache.stats["hits"], self.cache.stats["misses"]), (1, 1))
+
+    def test_returned_list_is_a_copy(self):
+        """Test that mutating a returned catalog does not touch the cache"""
+        self.cache.get(1, self.loader(1)).clear()
+        self.assertEqual(len(self.cache.get(1, self.loader(1))), 1)
+
+    def test_ttl_expiry_reloads(self):
+        """Test that an entry older than the TTL is reloaded"""
+        self.cache.get(1, self.loader(1))
+        self.clock.now = 61
+        self.cache.get(1, self.loader(1))
+        self.assertEqual(self.loads, [1, 1])
+
+    def test_invalidate_reloads_only_that_owner(self):
+        """Test that invalidating one owner leaves the others cached"""
+        self.cache.get(1, self.loader(1))
+        self.cache.get(2, self.loader(2))
+        self.cache.invalidate(1)
+        self.cache.get(1, self.loader(1))
+        self.cache.get(2, self.loader(2))
+        self.assertEqual(self.loads, [1, 2, 1])
+
+    def test_invalidate_all(self):
+        """Test that invalidate_all drops every owner"""
+        self.cache.get(1, self.loader(1))
+        self.cache.invalidate_all()
+        self.assertEqual(len(self.cache), 0)
+        self.cache.get(1, self.loader(1))
+        self.assertEqual(self.loads, [1, 1])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used owner is evicted past max_owners"""
+        self.cache.get(1, self.loader(1))
+        self.cache.get(2, self.loader(2))
+        self.cache.get(1, self.loader(1))   # 2 is now least recently used
+        self.cache.get(3, self.loader(3))
+        self.assertEqual(self.cache.stats["evictions"], 1)
+        self.cache.get(1, self.loader(1))
+        self.cache.get(2, self.loader(2))
+        self.assertEqual(self.loads, [1, 2, 3, 2])
+
+    def test_load_racing_with_invalidate_is_not_stored(self):
+        """Test that a catalog read before a concurrent edit is not cached"""
+        def racing_load():
+            self.cache.invalidate(1)   # product edited while the old rows were being read
+            return [(1, "Old Latte", "Coffee", 150.0)]
+
+        self.assertEqual(self.cache.get(1, racing_load)[0][1], "Old Latte")
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.get(1, self.loader(1))[0][1], "Latte 1")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -18,11 +18,15 @@ import shutil
 from database import (
     hash_password, verify_password, get_connection,
     register_user, login_user, check_username_exists,
-    add_product, get_products, update_product, delete_product,
+    add_product, get_products, update_product, delete_product, get_products_for_customer, catalog_cache,
+    search_products,
     create_customer, get_customers_for_business, delete_customer,
-    save_order, get_all_orders, get_order_items,
+    save_order, save_orders, get_all_orders, get_order_items,
+    get_order_items_bulk, get_orders_with_items, get_orders_for_business,
+    get_order_counts_for_business,
     confirm_order, complete_order, cancel_order, mark_order_paid,
     get_total_business_owners, get_total_customers, get_total_sales, get_total_orders,
+    get_order_status_distribution, get_top_selling_products, get_platform_snapshot,
     get_user_by_id, update_user, delete_user
 )
 
@@ -248,6 +252,41 @@ class TestProductManagement(unittest.TestCase):
         product_names = [p[1] for p in products]
         self.assertIn("Test Coffee", product_names)
     
+    def test_product_catalog_cache(self):
+        """Test that catalogs are cached and product writes invalidate them"""
+        add_product("Cached Coffee", "Coffee", 150.00, self.owner_id)
+        get_products(self.owner_id)
+        hits = catalog_cache.stats["hits"]
+        product_id = get_products(self.owner_id)[0][0]
+        self.assertEqual(catalog_cache.stats["hits"], hits + 1)
+
+        update_product(product_id, "Renamed Coffee", "Coffee", 155.00, self.owner_id)
+        self.assertEqual(get_products_for_customer(self.owner_id)[0][1], "Renamed Coffee")
+        delete_product(product_id, self.owner_id)
+        self.assertEqual(get_products(self.owner_id), [])
+    
+    def test_search_products_follows_edits(self):
+        """Test that product search sees adds, renames and deletes without a rebuild"""
+        add_product("Vanilla Latte", "Coffee", 170.00, self.owner_id)
+        self.assertEqual([p[1] for p in search_products(self.owner_id, "vanila")], ["Vanilla Latte"])
+
+        add_product("Hazelnut Latte", "Coffee", 170.00, self.owner_id)
+        hazelnut_id = [p[0] for p in search_products(self.owner_id, "hazel")][0]
+        update_product(hazelnut_id, "Caramel Latte", "Coffee", 175.00, self.owner_id)
+        self.assertEqual(search_products(self.owner_id, "hazel"), [])
+        self.assertEqual(len(search_products(self.owner_id, "latte")), 2)
+
+        delete_product(hazelnut_id, self.owner_id)
+        self.assertEqual([p[1] for p in search_products(self.owner_id, "latte")], ["Vanilla Latte"])
+
+    def test_delete_other_owners_product_keeps_search_index(self):
+        """Test that a delete scoped to the wrong owner leaves the product searchable"""
+        add_product("Vanilla Latte", "Coffee", 170.00, self.owner_id)
+        product_id = search_products(None, "vanilla")[0][0]
+        delete_product(product_id, 99999)
+        self.assertEqual([p[0] for p in search_products(None, "vanilla")], [product_id])
+        self.assertEqual([p[0] for p in search_products(self.owner_id, "vanilla")], [product_id])
+
     def test_add_product_with_category(self):
         """Test adding products with different categories"""
         add_product("Espresso Test", "Coffee", 120.00, self.owner_id)
@@ -436,6 +475,92 @@ class TestOrderManagement(unittest.TestCase):
         self.assertIsInstance(orders, list)
         self.assertGreater(len(orders), 0)
 
+    def test_get_order_items_bulk(self):
+        """Test fetching items for several orders in one call"""
+        first = save_order("Test Customer Bulk Items", "Dine in", self.total, self.test_items)
+        second = save_order("Test Customer Bulk Items", "Take out", 80.00, self.test_items[1:])
+        
+        grouped = get_order_items_bulk([first, second, 99999999])
+        
+        self.assertEqual(grouped[first], get_order_items(first))
+        self.assertEqual(grouped[second], get_order_items(second))
+        self.assertEqual(grouped[99999999], [])
+        self.assertEqual(get_order_items_bulk([]), {})
+    
+    def test_get_orders_with_items(self):
+        """Test that orders and their items come back together for one business"""
+        owner_id = 88888888
+        order_id = save_order("Test Customer With Items", "Dine in", self.total, self.test_items,
+                              business_owner_id=owner_id)
+        
+        orders, items_by_order = get_orders_with_items(owner_id)
+        
+        self.assertEqual([o[0] for o in orders], [order_id])
+        self.assertEqual(len(orders[0]), 8)
+        self.assertEqual(items_by_order[order_id], get_order_items(order_id))
+        self.assertEqual(get_orders_with_items(owner_id, status="pending"), ([], {}))
+    
+    def test_keyset_pagination(self):
+        """Test that paging by (order_date, id) returns every order exactly once, newest first"""
+        owner_id = 77777777
+        batch = [
+            {"customer_name": f"Test Customer Page {i}", "order_type": "Dine in", "total": 100.00,
+             "items": self.test_items[:1], "business_owner_id": owner_id,
+             "order_date": f"2024-03-{1 + i // 2:02d} 12:00:00"}  # pairs share a timestamp
+            for i in range(7)
+        ]
+        save_orders(batch)
+        everything = get_orders_for_business(owner_id)
+        
+        paged = []
+        after = None
+        while True:
+            rows = get_orders_for_business(owner_id, limit=3, after=after)
+            if not rows:
+                break
+            paged.extend(rows)
+            after = (rows[-1][6], rows[-1][0])
+        
+        self.assertEqual(len(everything), 7)
+        self.assertEqual(paged, everything)
+        self.assertEqual(everything[0][6], "2024-03-04 12:00:00")
+        
+        orders, _ = get_orders_with_items(owner_id, limit=3, after=(everything[2][6], everything[2][0]))
+        self.assertEqual(orders, everything[3:6])
+        self.assertEqual(get_order_counts_for_business(owner_id), {"confirmed": 7})
+    
+    def test_save_orders_bulk(self):
+        """Test bulk-saving orders with explicit dates across several chunks"""
+        batch = [
+            {"customer_name": f"Test Customer Bulk {i}", "order_type": "Take out", "total": self.total,
+             "items": self.test_items, "order_date": "2024-01-15 09:30:00"}
+            for i in range(5)
+        ]
+        order_ids = save_orders(batch, chunk_size=2)
+        
+        self.assertEqual(len(order_ids), 5)
+        self.assertEqual(len(set(order_ids)), 5)
+        for order_id in order_ids:
+            self.assertEqual(len(get_order_items(order_id)), 2)
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT order_date, status, payment_status FROM orders WHERE id=?", (order_ids[0],))
+        self.assertEqual(cursor.fetchone(), ("2024-01-15 09:30:00", "confirmed", "paid"))
+        conn.close()
+    
+    def test_save_order_is_atomic(self):
+        """Test that a bad line item leaves no half-written order behind"""
+        bad_items = self.test_items + [{"name": "Missing fields"}]
+        with self.assertRaises(KeyError):
+            save_order("Test Customer Atomic", "Dine in", self.total, bad_items)
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM orders WHERE customer_name = 'Test Customer Atomic'")
+        self.assertEqual(cursor.fetchone()[0], 0)
+        conn.close()
+
 
 class TestOrderStatusManagement(unittest.TestCase):
     """Test cases for order status management"""
@@ -530,6 +655,17 @@ class TestAnalyticsFunctions(unittest.TestCase):
         self.assertIsInstance(count, int)
         self.assertGreaterEqual(count, 0)
 
+    def test_get_platform_snapshot(self):
+        """Test that the dashboard snapshot agrees with the individual analytics functions"""
+        snapshot = get_platform_snapshot(days=7, months=6, top_n=5)
+        self.assertEqual(snapshot.total_owners, get_total_business_owners())
+        self.assertEqual(snapshot.total_customers, get_total_customers())
+        self.assertAlmostEqual(snapshot.total_sales, get_total_sales())
+        self.assertEqual(snapshot.total_orders, get_total_orders())
+        self.assertEqual(snapshot.status_distribution, get_order_status_distribution())
+        self.assertEqual(snapshot.top_products, get_top_selling_products(5))
+        self.assertGreaterEqual(snapshot.load_ms, 0)
+
 
 class TestUserManagement(unittest.TestCase):
     """Test cases for user management (admin functions)"""
@@ -0,0 +1,166 @@
+"""
+Unit Tests for the SQLite connection pool
+==========================================
+Run tests with: python -m pytest test_connection_pool.py -v
+"""
+
+import unittest
+import sqlite3
+import os
+import tempfile
+import shutil
+import threading
+
+from connection_pool import ConnectionPool, PooledConnection, PRAGMA_PROFILES
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test cases for pooled connection reuse and lifecycle"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "pool_test.db")
+        self.pool = ConnectionPool(self.db_path, size=2)
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def tearDown(self):
+        self.pool.close_all()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_acquire_returns_sqlite_connection(self):
+        """Test that pooled connections are real sqlite3 connections"""
+        conn = self.pool.acquire()
+        self.assertIsInstance(conn, sqlite3.Connection)
+        self.assertIsInstance(conn, PooledConnection)
+        conn.close()
+
+    def test_close_returns_connection_to_pool(self):
+        """Test that close() hands the connection back for reuse"""
+        conn = self.pool.acquire()
+        conn.close()
+        self.assertEqual(self.pool.idle_count(), 1)
+        self.assertIs(self.pool.acquire(), conn)
+        conn.close()
+
+    def test_double_close_is_harmless(self):
+        """Test that closing twice does not put the connection in the pool twice"""
+        conn = self.pool.acquire()
+        conn.close()
+        conn.close()
+        self.assertEqual(self.pool.idle_count(), 1)
+
+    def test_pool_size_limits_idle_connections(self):
+        """Test that connections beyond the pool size are really closed"""
+        conns = [self.pool.acquire() for _ in range(4)]
+        for conn in conns:
+            conn.close()
+        self.assertEqual(self.pool.idle_count(), 2)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conns[-1].execute("SELECT 1")
+
+    def test_uncommitted_work_is_rolled_back_on_release(self):
+        """Test that a released connection does not leak an open transaction"""
+        conn = self.pool.acquire()
+        conn.execute("INSERT INTO items (name) VALUES ('draft')")
+        conn.close()
+        with self.pool.connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_context_manager_commits(self):
+        """Test that the context manager commits on success"""
+        with self.pool.connection() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('latte')")
+        with self.pool.connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_context_manager_rolls_back_on_error(self):
+        """Test that the context manager rolls back when the block raises"""
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('mocha')")
+                raise ValueError("boom")
+        with self.pool.connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_health_check_discards_dead_connection(self):
+        """Test that a broken idle connection is replaced on checkout"""
+        self.pool.health_check_interval = 0
+        conn = self.pool.acquire()
+        conn.close()
+        sqlite3.Connection.close(conn)  # simulate a connection that died while idle
+        fresh = self.pool.acquire()
+        self.assertIsNot(fresh, conn)
+        self.assertEqual(self.pool.stats["discarded"], 1)
+        fresh.close()
+
+
+class TestPragmaProfiles(unittest.TestCase):
+    """Test cases for the PRAGMA profiles applied at connection setup"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "pragma_test.db")
+        self.writer_pool = ConnectionPool(self.db_path, profile="pos-durable")
+        self.reader_pool = ConnectionPool(self.db_path, profile="analytics-readonly")
+        with self.writer_pool.connection() as conn:
+            conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, total REAL)")
+            conn.execute("INSERT INTO orders (total) VALUES (100.0)")
+
+    def tearDown(self):
+        self.writer_pool.close_all()
+        self.reader_pool.close_all()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_every_profile_enables_wal(self):
+        """Test that all profiles put the database in WAL mode"""
+        for profile in PRAGMA_PROFILES:
+            pool = ConnectionPool(self.db_path, profile=profile)
+            with pool.connection() as conn:
+                mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            pool.close_all()
+            self.assertEqual(mode, "wal", profile)
+
+    def test_unknown_profile_rejected(self):
+        """Test that a typo in the profile name fails loudly"""
+        with self.assertRaises(ValueError):
+            ConnectionPool(self.db_path, profile="turbo")
+
+    def test_analytics_profile_is_read_only(self):
+        """Test that analytics connections cannot write"""
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.reader_pool.connection() as conn:
+                conn.execute("INSERT INTO orders (total) VALUES (1.0)")
+
+    def test_read_during_write(self):
+        """Test that a reader in another thread is not blocked by an open write transaction"""
+        writer = self.writer_pool.acquire()
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("INSERT INTO orders (total) VALUES (250.0)")
+
+        results = {}
+
+        def read_totals():
+            try:
+                with self.reader_pool.connection() as conn:
+                    conn.execute("PRAGMA busy_timeout = 0")
+                    results["sum"] = conn.execute("SELECT SUM(total) FROM orders").fetchone()[0]
+            except sqlite3.Error as exc:
+                results["error"] = exc
+
+        reader = threading.Thread(target=read_totals)
+        reader.start()
+        reader.join(timeout=5)
+
+        writer.commit()
+        writer.close()
+
+        self.assertNotIn("error", results)
+        self.assertEqual(results["sum"], 100.0)  # reader sees the last committed snapshot
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
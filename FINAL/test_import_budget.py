@@ -0,0 +1,142 @@
+"""
+Import-time budget tests
+=========================
+Importing the data modules must not touch the database file or print
+anything, and must stay fast; the schema is created on first use instead.
+Starting the app (everything main.py imports up front) has its own budget,
+and must leave the receipt modules to be imported on first use.
+
+Run tests with: python -m pytest test_import_budget.py -v
+"""
+
+import unittest
+import ast
+import os
+import subprocess
+import sys
+
+from lazy import lazy_import
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Generous ceiling for a cold `import <module>` in a fresh interpreter (seconds)
+IMPORT_BUDGET = 0.25
+# Ceiling for a cold import of everything main.py imports at startup, flet aside (seconds)
+STARTUP_BUDGET = 0.25
+# Only saving or exporting a receipt needs these; starting the app must not import them
+DEFERRED_MODULES = ("receipts", "receipt_store", "reportlab", "zipfile", "multiprocessing")
+
+PROBE = """
+import sqlite3, sys, time
+connects = []
+real_connect = sqlite3.connect
+sqlite3.connect = lambda *a, **k: connects.append(a) or real_connect(*a, **k)
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+sys.stderr.write(f"{elapsed} {len(connects)}")
+"""
+
+STARTUP_PROBE = """
+import sys, time
+start = time.perf_counter()
+for module in sys.argv[2:]:
+    __import__(module)
+elapsed = time.perf_counter() - start
+sys.stderr.write(" ".join([str(elapsed)] + [m for m in sys.argv[1].split(",") if m in sys.modules]))
+"""
+
+
+def main_startup_imports(path=os.path.join(HERE, "main.py")):
+    """Modules main.py imports at module level, in order, leaving out flet (the UI toolkit itself)"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return [module for module in dict.fromkeys(modules) if module.split(".")[0] != "flet"]
+
+
+class TestImportSideEffects(unittest.TestCase):
+    """Importing database modules is free of I/O"""
+
+    def probe(self, module):
+        result = subprocess.run([sys.executable, "-c", PROBE, module], cwd=HERE,
+                                capture_output=True, text=True, check=True)
+        elapsed, connects = result.stderr.split()
+        return result.stdout, float(elapsed), int(connects)
+
+    def check_module(self, module):
+        stdout, elapsed, connects = self.probe(module)
+        self.assertEqual(connects, 0, f"import {module} opened the database")
+        self.assertEqual(stdout, "", f"import {module} printed output")
+        self.assertLess(elapsed, IMPORT_BUDGET, f"import {module} took {elapsed:.3f}s")
+
+    def test_database_import(self):
+        """Test that importing database opens nothing and prints nothing"""
+        self.check_module("database")
+
+    def test_database_new_import(self):
+        """Test that importing database_new opens nothing and prints nothing"""
+        self.check_module("database_new")
+
+    def test_db_import(self):
+        """Test that importing db opens nothing and prints nothing"""
+        self.check_module("db")
+
+
+class TestStartupImports(unittest.TestCase):
+    """What starting the app imports"""
+
+    def test_startup_imports_within_budget(self):
+        """Test that startup imports stay within budget and skip the deferred modules"""
+        modules = main_startup_imports()
+        self.assertIn("database", modules)
+        result = subprocess.run([sys.executable, "-c", STARTUP_PROBE, ",".join(DEFERRED_MODULES), *modules],
+                                cwd=HERE, capture_output=True, text=True, check=True)
+        elapsed, *loaded = result.stderr.split()
+        self.assertEqual(loaded, [], "starting the app imported modules that should load on first use")
+        self.assertLess(float(elapsed), STARTUP_BUDGET, f"startup imports took {float(elapsed):.3f}s")
+
+    def test_main_imports_receipts_lazily(self):
+        """Test that main.py doesn't import the deferred modules at module level"""
+        modules = main_startup_imports()
+        self.assertFalse(set(modules) & set(DEFERRED_MODULES))
+
+    def test_app_starts_only_as_main(self):
+        """Test that ft.app() is behind the main guard, so spawned render processes don't open the app"""
+        with open(os.path.join(HERE, "main.py"), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        calls = [node for statement in tree.body if isinstance(statement, ast.Expr)
+                 for node in ast.walk(statement) if isinstance(node, ast.Call)]
+        self.assertFalse([call for call in calls if ast.unparse(call.func) == "ft.app"], "main.py starts the app on import")
+        guards = [statement for statement in tree.body if isinstance(statement, ast.If)
+                  and ast.unparse(statement.test) in ('__name__ == "__main__"', "__name__ == '__main__'")]
+        self.assertIn("ft.app(", ast.unparse(guards[-1]) if guards else "")
+
+
+class TestLazyModule(unittest.TestCase):
+    """Test cases for LazyModule"""
+
+    def test_imports_on_first_attribute(self):
+        """Test that the module is imported on first attribute access"""
+        module = lazy_import("colorsys")
+        sys.modules.pop("colorsys", None)
+        self.assertFalse(module.loaded)
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual(module.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(module.loaded)
+        self.assertIn("colorsys", sys.modules)
+
+    def test_missing_module_fails_on_use(self):
+        """Test that a missing module raises ImportError on use, not at lazy_import()"""
+        module = lazy_import("no_such_module_here")
+        with self.assertRaises(ImportError):
+            module.anything
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
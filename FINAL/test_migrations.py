@@ -0,0 +1,159 @@
+"""
+Unit Tests for schema migrations
+=================================
+Run tests with: python -m pytest test_migrations.py -v
+"""
+
+import unittest
+import sqlite3
+import os
+import tempfile
+import shutil
+
+import database
+from connection_pool import close_pool
+from migrations import get_schema_version, latest_version, run_migrations
+
+
+class TestMigrationRunner(unittest.TestCase):
+    """Test cases for the generic user_version migration runner"""
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.applied = []
+        self.migrations = [
+            (1, lambda conn: self.applied.append(1) or conn.execute("CREATE TABLE a (id INTEGER)")),
+            (2, lambda conn: self.applied.append(2) or conn.execute("CREATE TABLE b (id INTEGER)")),
+        ]
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_applies_all_pending(self):
+        """Test that a fresh database receives every migration"""
+        self.assertEqual(run_migrations(self.conn, self.migrations), 2)
+        self.assertEqual(self.applied, [1, 2])
+
+    def test_skips_applied(self):
+        """Test that migrations already recorded in user_version do not run again"""
+        run_migrations(self.conn, self.migrations[:1])
+        run_migrations(self.conn, self.migrations)
+        self.assertEqual(self.applied, [1, 2])
+
+    def test_failed_migration_rolls_back(self):
+        """Test that a failing migration leaves the previous version in place"""
+        def broken(conn):
+            conn.execute("CREATE TABLE c (id INTEGER)")
+            raise RuntimeError("boom")
+
+        run_migrations(self.conn, self.migrations)
+        with self.assertRaises(RuntimeError):
+            run_migrations(self.conn, self.migrations + [(3, broken)])
+        self.assertEqual(get_schema_version(self.conn), 2)
+        tables = {r[0] for r in self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        self.assertNotIn("c", tables)
+
+
+class TestDatabaseMigrations(unittest.TestCase):
+    """Test cases for database.py's migrations against scratch files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = database.DB_PATH
+        database.DB_PATH = os.path.join(self.temp_dir, "migrate.db")
+
+    def tearDown(self):
+        close_pool(database.DB_PATH)
+        database.DB_PATH = self.original_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fresh_database_reaches_latest_version(self):
+        """Test that init_db builds the full schema and seeds default users"""
+        self.assertEqual(database.init_db(), latest_version(database.MIGRATIONS))
+        self.assertTrue(database.check_username_exists("superadmin"))
+
+    def test_current_schema_only_reads_version(self):
+        """Test that startup on an up-to-date database runs nothing but the version check"""
+        database.init_db()
+        statements = []
+        conn = database.get_connection()
+        conn.set_trace_callback(statements.append)
+        conn.close()
+        database.init_db()
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+    def test_legacy_database_is_upgraded(self):
+        """Test that an unversioned database with the old users constraint is migrated"""
+        conn = sqlite3.connect(database.DB_PATH)
+        conn.execute("""
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                role TEXT CHECK(role IN ('owner', 'staff')) NOT NULL
+            )
+        """)
+        conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY AUTOINCREMENT, customer_name TEXT, order_type TEXT, total REAL NOT NULL, order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+        conn.execute("INSERT INTO users (username, password, role) VALUES ('legacy', 'x', 'owner')")
+        conn.commit()
+        conn.close()
+
+        database.init_db()
+
+        self.assertTrue(database.check_username_exists("legacy"))
+        success, _ = database.create_customer("legacy_customer", "pw", 1)
+        self.assertTrue(success)
+        conn = database.get_connection()
+        columns = [col[1] for col in conn.execute("PRAGMA table_info(orders)")]
+        conn.close()
+        self.assertIn("business_owner_id", columns)
+        self.assertIn("payment_status", columns)
+
+    def test_money_columns_become_centavos(self):
+        """Test that migration 7 turns REAL peso amounts into INTEGER centavos and keeps everything wired up"""
+        conn = sqlite3.connect(database.DB_PATH)
+        run_migrations(conn, database.MIGRATIONS[:6])
+        conn.execute("INSERT INTO products (name, category, price, business_owner_id) VALUES ('Flat White', 'Coffee', 145.5, 2)")
+        order_ids = []
+        for total in (255.5, 0.3, 99.99):
+            order_id = conn.execute(
+                "INSERT INTO orders (customer_name, order_type, total, status, payment_status, business_owner_id)"
+                " VALUES ('Walk-in', 'Dine in', ?, 'confirmed', 'paid', 2)", (total,)
+            ).lastrowid
+            conn.execute("INSERT INTO order_items (order_id, product_name, category, price, quantity)"
+                         " VALUES (?, 'Flat White', 'Coffee', ?, 1)", (order_id, total))
+            order_ids.append(order_id)
+        # The newest order was deleted; its id must not be handed out again
+        conn.execute("DELETE FROM order_items WHERE order_id = ?", (order_ids[-1],))
+        conn.execute("DELETE FROM orders WHERE id = ?", (order_ids[-1],))
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(database.init_db(), latest_version(database.MIGRATIONS))
+
+        conn = database.get_connection()
+        self.assertEqual(conn.execute("SELECT typeof(total), total FROM orders ORDER BY id").fetchall(),
+                         [("integer", 25550), ("integer", 30)])
+        self.assertEqual(conn.execute("SELECT typeof(price), price FROM products").fetchall(), [("integer", 14550)])
+        self.assertEqual(conn.execute("SELECT SUM(revenue) FROM daily_sales").fetchone()[0], 25580)
+        conn.close()
+        self.assertEqual(database.get_products(2), [(1, "Flat White", "Coffee", 145.5)])
+        self.assertEqual(database.get_total_sales(), 255.8)
+        self.assertEqual(database.check_sales_rollups(), [])
+
+        # Triggers and indexes are back on the rebuilt tables
+        order_id = database.save_order("Rebuilt", "Dine in", 10.1, [{"name": "Latte", "category": "Coffee", "price": 10.1, "quantity": 1}],
+                                       business_owner_id=2)
+        self.assertGreater(order_id, order_ids[-1])
+        self.assertEqual(database.get_total_sales(), 265.9)
+        self.assertEqual([order[0] for order in database.search_orders(2, "rebuilt")], [order_id])
+        self.assertEqual(database.check_sales_rollups(), [])
+        conn = database.get_connection()
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        self.assertTrue({"idx_products_owner", "idx_orders_owner_payment_total", "idx_orders_date",
+                         "idx_order_items_order", "idx_daily_sales_payment_owner"} <= indexes)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,42 @@
+"""
+Unit Tests for the money helpers
+================================
+Run tests with: python -m pytest test_money.py -v
+"""
+
+import unittest
+from decimal import Decimal
+
+from money import to_cents, from_cents
+
+
+class TestToCents(unittest.TestCase):
+    """Test cases for to_cents() and from_cents()"""
+
+    def test_amounts(self):
+        """Test converting ints, floats, strings and Decimals to centavos"""
+        self.assertEqual(to_cents(145), 14500)
+        self.assertEqual(to_cents(145.5), 14550)
+        self.assertEqual(to_cents("99.99"), 9999)
+        self.assertEqual(to_cents(Decimal("0.01")), 1)
+
+    def test_float_noise_rounds_like_a_person_would(self):
+        """Test that float noise rounds to the centavo a person would expect"""
+        self.assertEqual(to_cents(0.1 + 0.2), 30)
+        self.assertEqual(to_cents(1.005), 101)
+        self.assertEqual(to_cents(sum([0.1] * 10)), 100)
+
+    def test_rejects_non_amounts(self):
+        """Test that non-numeric amounts, booleans and NaN are rejected"""
+        for amount in ("abc", None, True, float("nan")):
+            with self.assertRaises((ValueError, TypeError)):
+                to_cents(amount)
+
+    def test_round_trip(self):
+        """Test that centavos survive a round trip through pesos"""
+        for cents in range(0, 100000, 7):
+            self.assertEqual(to_cents(from_cents(cents)), cents)
+
+
+if __name__ == "__main__":
+    unittest.main()
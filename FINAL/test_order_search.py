@@ -0,0 +1,116 @@
+"""
+Unit Tests for FTS5 order search
+=================================
+Run tests with: python -m pytest test_order_search.py -v
+"""
+
+import unittest
+import sqlite3
+import os
+import tempfile
+import shutil
+
+import database
+from connection_pool import close_pool
+from database import HIGHLIGHT_START, HIGHLIGHT_END
+
+
+def item(name, category="Coffee", price=100.0, quantity=1):
+    return {"name": name, "category": category, "price": price, "quantity": quantity}
+
+
+class TestOrderSearch(unittest.TestCase):
+    """Test cases for search_orders() against a scratch database"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = database.DB_PATH
+        database.DB_PATH = os.path.join(self.temp_dir, "search.db")
+        self.maria = database.save_order("María Santos", "Dine in", 260.0,
+                                         [item("Iced Latte", price=160.0), item("Croissant", "Pastry")],
+                                         business_owner_id=1)
+        self.john = database.save_order("John Cruz", "Take out", 160.0, [item("Iced Latte", price=160.0)],
+                                        business_owner_id=2)
+
+    def tearDown(self):
+        close_pool(database.DB_PATH)
+        database.DB_PATH = self.original_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def ids(self, *args, **kwargs):
+        return [row[0] for row in database.search_orders(*args, **kwargs)]
+
+    def test_customer_and_product_prefixes(self):
+        """Test that word prefixes of customer and product names match, accent-insensitively"""
+        self.assertEqual(self.ids(None, "maria"), [self.maria])
+        self.assertEqual(self.ids(None, "croi"), [self.maria])
+        self.assertEqual(self.ids(None, "lat"), [self.john, self.maria])
+        self.assertEqual(self.ids(None, "john latte"), [self.john])
+
+    def test_highlighting(self):
+        """Test that matched words come back wrapped in highlight marks"""
+        row = database.search_orders(None, "croissant")[0]
+        self.assertEqual(row[7], "María Santos")
+        self.assertEqual(row[8], f"Iced Latte, {HIGHLIGHT_START}Croissant{HIGHLIGHT_END}")
+
+    def test_owner_scope(self):
+        """Test that an owner only finds their own orders"""
+        self.assertEqual(self.ids(1, "latte"), [self.maria])
+        self.assertEqual(self.ids(2, "maria"), [])
+
+    def test_order_number(self):
+        """Test that '#id' finds that order, within the owner's scope"""
+        self.assertEqual(self.ids(None, f"#{self.john}"), [self.john])
+        self.assertEqual(self.ids(1, str(self.john)), [])
+
+    def test_order_number_pages(self):
+        """Test that the numbered order comes first, within the limit, and isn't repeated on later pages"""
+        # Three orders named after the first one's number, so that number is also a text match
+        table = [database.save_order(f"Table {self.john + 1}", "Dine in", 160.0, [item("Iced Latte", price=160.0)])
+                 for _ in range(3)]
+        number = str(table[0])
+        first = database.search_orders(None, number, limit=2)
+        self.assertEqual([row[0] for row in first], [table[0], table[2]])
+        after = (first[-1][4], first[-1][0])
+        self.assertEqual(self.ids(None, number, limit=2, after=after), [table[1]])
+
+    def test_paging(self):
+        """Test keyset paging over search results"""
+        first = database.search_orders(None, "latte", limit=1)
+        self.assertEqual([row[0] for row in first], [self.john])
+        after = (first[-1][4], first[-1][0])
+        self.assertEqual(self.ids(None, "latte", limit=1, after=after), [self.maria])
+
+    def test_punctuation_and_empty_queries(self):
+        """Test that FTS syntax in the query can't break the search"""
+        self.assertEqual(database.search_orders(None, "   "), [])
+        self.assertEqual(self.ids(None, 'latte" (*'), [self.john, self.maria])
+
+    def test_index_follows_writes(self):
+        """Test that renames, item changes and deletes reach the index"""
+        conn = database.get_connection()
+        conn.execute("UPDATE orders SET customer_name = 'Ana Reyes' WHERE id = ?", (self.maria,))
+        conn.execute("DELETE FROM order_items WHERE order_id = ? AND product_name = 'Croissant'", (self.maria,))
+        conn.execute("DELETE FROM orders WHERE id = ?", (self.john,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.ids(None, "ana"), [self.maria])
+        self.assertEqual(self.ids(None, "maria"), [])
+        self.assertEqual(self.ids(None, "croissant"), [])
+        self.assertEqual(self.ids(None, "latte"), [self.maria])
+
+    def test_migration_backfills_existing_orders(self):
+        """Test that upgrading a version-5 database indexes the orders it already has"""
+        close_pool(database.DB_PATH)
+        conn = sqlite3.connect(database.DB_PATH)
+        conn.executescript("""
+            DROP TABLE order_search;
+            PRAGMA user_version = 5;
+        """)
+        conn.close()
+        database.init_db()
+        self.assertEqual(self.ids(None, "croissant"), [self.maria])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
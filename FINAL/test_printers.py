@@ -0,0 +1,79 @@
+"""
+Unit Tests for printer sinks
+============================
+Run tests with: python -m pytest test_printers.py -v
+"""
+
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+from printers import FileSink, SpoolSink, SocketSink, FakePrinter, PrinterError
+from receipts import Receipt, EscPosRenderer, print_receipt
+
+
+class TestFileSinks(unittest.TestCase):
+    """Test cases for FileSink and SpoolSink"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_file_sink(self):
+        """Test that FileSink writes the bytes to the named file"""
+        path = FileSink(os.path.join(self.folder, "out")).send(b"hello", "r.txt")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"hello")
+
+    def test_spool_sink_orders_jobs_and_leaves_no_partials(self):
+        """Test that spooled jobs are numbered in order with no partial files left"""
+        sink = SpoolSink(self.folder)
+        for i in range(3):
+            sink.send(f"job {i}".encode(), f"r{i}.bin")
+        self.assertEqual(sorted(os.listdir(self.folder)), ["000001_r0.bin", "000002_r1.bin", "000003_r2.bin"])
+
+    def test_spool_sink_error(self):
+        """Test that an unwritable spool folder raises OSError"""
+        blocker = os.path.join(self.folder, "file")
+        open(blocker, "w").close()
+        with self.assertRaises(OSError):
+            SpoolSink(os.path.join(blocker, "spool")).send(b"x", "r.bin")
+
+
+class TestSocketSink(unittest.TestCase):
+    """Test cases for SocketSink against a local FakePrinter"""
+
+    def test_fake_printer_receives_jobs(self):
+        """Test that large jobs arrive whole and in order"""
+        with FakePrinter() as printer:
+            sink = SocketSink(printer.host, printer.port)
+            for i in range(5):
+                sink.send(f"job {i}".encode() * 10000, "r.bin")
+            self.assertTrue(printer.wait_for(5))
+        self.assertEqual([len(job) for job in printer.jobs], [50000] * 5)
+        self.assertEqual(printer.jobs[3][:5], b"job 3")
+
+    def test_print_receipt(self):
+        """Test that print_receipt() sends the rendered ESC/POS bytes"""
+        receipt = Receipt(9, "Ana", "Take out", "Cash", 160.0,
+                          ({"name": "Latte", "category": "Coffee", "price": 160.0, "quantity": 1},), "2025-12-05 10:00:00")
+        with FakePrinter() as printer:
+            print_receipt(receipt, SocketSink(printer.host, printer.port), EscPosRenderer())
+            self.assertTrue(printer.wait_for(1))
+        self.assertEqual(printer.jobs, [EscPosRenderer().render(receipt)])
+
+    def test_unreachable_printer(self):
+        """Test that a printer nobody listens on raises PrinterError"""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]  # nothing listens here
+        with self.assertRaises(PrinterError):
+            SocketSink("127.0.0.1", port, timeout=1).send(b"x", "r.bin")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Unit Tests for the in-memory product search index
+==================================================
+Run tests with: python -m pytest test_product_search.py -v
+"""
+
+import unittest
+
+from product_search import ProductSearchIndex, tokenize, _within_one_edit
+
+
+CATALOG = [
+    (1, "Latte", "Coffee", 160.0),
+    (2, "Iced Latte", "Coffee", 165.0),
+    (3, "Cappuccino", "Coffee", 150.0),
+    (4, "Green Tea", "Tea", 85.0),
+    (5, "Matcha Latte", "Tea", 160.0),
+    (6, "Macarons (3 pcs)", "Desserts", 130.0),
+]
+
+
+def names(rows):
+    return [row[1] for row in rows]
+
+
+class TestProductSearchIndex(unittest.TestCase):
+    """Test cases for ProductSearchIndex"""
+
+    def setUp(self):
+        self.index = ProductSearchIndex(CATALOG)
+
+    def test_tokenize(self):
+        """Test that names split into lowercase words"""
+        self.assertEqual(tokenize("Macarons (3 pcs)"), ["macarons", "3", "pcs"])
+
+    def test_within_one_edit(self):
+        """Test the one-edit check for each kind of typo"""
+        self.assertTrue(_within_one_edit("latte", "latt"))      # deletion
+        self.assertTrue(_within_one_edit("latte", "lattee"))    # insertion
+        self.assertTrue(_within_one_edit("latte", "lakte"))     # substitution
+        self.assertTrue(_within_one_edit("latte", "ltate"))     # adjacent swap
+        self.assertFalse(_within_one_edit("latte", "lxtxe"))
+
+    def test_empty_query_lists_catalog_in_order(self):
+        """Test that an empty query returns every product in catalog order"""
+        self.assertEqual(self.index.search(""), CATALOG)
+        self.assertEqual(names(self.index.search("", "Tea")), ["Green Tea", "Matcha Latte"])
+
+    def test_prefix_match_ranks_name_start_first(self):
+        """Test that names starting with the query outrank other word matches"""
+        self.assertEqual(names(self.index.search("lat")), ["Latte", "Iced Latte", "Matcha Latte"])
+
+    def test_every_word_must_match(self):
+        """Test that multi-word queries are ANDed"""
+        self.assertEqual(names(self.index.search("iced lat")), ["Iced Latte"])
+        self.assertEqual(self.index.search("iced tea"), [])
+
+    def test_typo_tolerance(self):
+        """Test that a one-character typo still finds the product, ranked below exact hits"""
+        self.assertEqual(names(self.index.search("capuccino")), ["Cappuccino"])
+        self.assertEqual(names(self.index.search("lattte")), ["Latte", "Iced Latte", "Matcha Latte"])
+        self.assertEqual(self.index.search("cx"), [])
+
+    def test_category_filter_and_facets(self):
+        """Test category-scoped search and facet counts"""
+        self.assertEqual(names(self.index.search("latte", "Tea")), ["Matcha Latte"])
+        self.assertEqual(self.index.categories(), {"Coffee": 3, "Tea": 2, "Desserts": 1})
+
+    def test_limit(self):
+        """Test that limit keeps only the best results"""
+        self.assertEqual(names(self.index.search("latte", limit=1)), ["Latte"])
+
+    def test_incremental_updates(self):
+        """Test add, update and remove keep words and facets in step"""
+        self.index.add((7, "Ube Latte", "Specialty", 180.0))
+        self.assertIn("Ube Latte", names(self.index.search("ube")))
+        self.index.update((7, "Ube Cheese Latte", "Specialty", 185.0))
+        self.assertEqual(names(self.index.search("cheese")), ["Ube Cheese Latte"])
+        self.index.remove(7)
+        self.assertEqual(self.index.search("ube"), [])
+        self.assertNotIn("Specialty", self.index.categories())
+        self.index.remove(7)   # removing twice is a no-op
+        self.assertEqual(len(self.index), len(CATALOG))
+
+    def test_edit_keeps_catalog_position(self):
+        """Test that an edited product stays where it was in listings"""
+        self.index.update((2, "Iced Mocha", "Coffee", 170.0))
+        self.assertEqual([row[0] for row in self.index.search("")], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(self.index.search("", "Coffee")[1][1], "Iced Mocha")
+
+    def test_renamed_word_is_forgotten(self):
+        """Test that a word no product uses any more stops matching, fuzzily too"""
+        self.index.update((3, "Flat White", "Coffee", 155.0))
+        self.assertEqual(self.index.search("cappuccino"), [])
+        self.assertEqual(self.index.search("capuccino"), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+"""
+Query plan regression tests
+============================
+Runs the hot per-business queries from database.py against a scratch database,
+captures the SQL they actually execute and checks with EXPLAIN QUERY PLAN that
+none of them falls back to a full table scan or a temporary sort.
+
+Run tests with: python -m pytest test_query_plans.py -v
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+
+import database
+from connection_pool import close_pool
+
+
+class TestHotQueryPlans(unittest.TestCase):
+    """Every hot screen query must be served by an index"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = database.DB_PATH
+        database.DB_PATH = os.path.join(self.temp_dir, "plans.db")
+        database.create_table()
+        database.create_products_table()
+        database.create_orders_table()
+        self.statements = []
+
+    def tearDown(self):
+        close_pool(database.DB_PATH)
+        database.DB_PATH = self.original_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def capture(self, fn, *args):
+        """Run a database function with SQL tracing on and return the statements it executed"""
+        conn = database.get_connection()
+        read_conn = database.get_read_connection()
+        for c in (conn, read_conn):
+            c.set_trace_callback(self.statements.append)
+        conn.close()
+        read_conn.close()
+        del self.statements[:]
+        fn(*args)
+        return [sql for sql in self.statements if sql.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+    def assert_uses_indexes(self, fn, *args, allow_sort=False, allowed_scans=("json_each",)):
+        statements = self.capture(fn, *args)
+        self.assertTrue(statements, f"{fn.__name__} ran no SELECT")
+        conn = database.get_connection()
+        try:
+            for sql in statements:
+                plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+                for step in plan:
+                    # Scanning a bounded CTE page or a json_each id list is fine; scanning a table is not
+                    if step.startswith("SCAN ") and step.split()[1] not in allowed_scans:
+                        self.fail(f"{fn.__name__} scans: {step}\n{sql}")
+                    if not allow_sort:
+                        self.assertNotIn("TEMP B-TREE", step, f"{fn.__name__} sorts: {step}\n{sql}")
+        finally:
+            conn.close()
+
+    def test_get_orders_for_business(self):
+        """Test that get_orders_for_business() is served by an index"""
+        self.assert_uses_indexes(database.get_orders_for_business, 1)
+
+    def test_get_orders_for_business_next_page(self):
+        """Test that get_orders_for_business() reads a later page through an index"""
+        self.assert_uses_indexes(database.get_orders_for_business, 1, 50, ("2025-01-01 10:00:00", 10))
+
+    def test_get_all_orders_next_page(self):
+        """Test that get_all_orders() reads a later page through an index"""
+        self.assert_uses_indexes(database.get_all_orders, 50, ("2025-01-01 10:00:00", 10))
+
+    def test_get_customer_orders_next_page(self):
+        """Test that get_customer_orders() reads a later page through an index"""
+        self.assert_uses_indexes(database.get_customer_orders, 1, 50, ("2025-01-01 10:00:00", 10))
+
+    def test_get_orders_with_items_page(self):
+        """Test that get_orders_with_items() reads a page through indexes"""
+        # The final sort only orders one page of joined item rows
+        self.assert_uses_indexes(database.get_orders_with_items, 1, None, 50, ("2025-01-01 10:00:00", 10),
+                                 allow_sort=True, allowed_scans=("p",))
+
+    def test_get_pending_orders_for_business(self):
+        """Test that get_pending_orders_for_business() is served by an index"""
+        self.assert_uses_indexes(database.get_pending_orders_for_business, 1)
+
+    def test_get_customer_orders(self):
+        """Test that get_customer_orders() is served by an index"""
+        self.assert_uses_indexes(database.get_customer_orders, 1)
+
+    def test_get_products_for_owner(self):
+        """Test that get_products() for one owner is served by an index"""
+        self.assert_uses_indexes(database.get_products, 1)
+
+    def test_get_products_for_customer(self):
+        """Test that get_products_for_customer() is served by an index"""
+        self.assert_uses_indexes(database.get_products_for_customer, 1)
+
+    def test_get_business_sales(self):
+        """Test that get_business_sales() is served by an index"""
+        self.assert_uses_indexes(database.get_business_sales, 1)
+
+    def test_get_order_items(self):
+        """Test that get_order_items() is served by an index"""
+        self.assert_uses_indexes(database.get_order_items, 1)
+
+    def test_get_order_items_bulk(self):
+        """Test that get_order_items_bulk() is served by an index"""
+        self.assert_uses_indexes(database.get_order_items_bulk, [1, 2, 3])
+
+    def test_get_customers_for_business(self):
+        """Test that get_customers_for_business() is served by an index"""
+        self.assert_uses_indexes(database.get_customers_for_business, 1)
+
+    def test_get_total_sales(self):
+        """Test that get_total_sales() is served by an index"""
+        self.assert_uses_indexes(database.get_total_sales)
+
+    def test_get_sales_by_date(self):
+        """Test that get_sales_by_date() is served by an index"""
+        self.assert_uses_indexes(database.get_sales_by_date, 7)
+
+    def test_get_top_business_owners(self):
+        """Test that get_top_business_owners() is served by an index"""
+        # One rollup lookup per owner; ranking the owners needs a sort
+        self.assert_uses_indexes(database.get_top_business_owners, 5, allow_sort=True, allowed_scans=("u",))
+
+    def test_get_top_selling_products(self):
+        """Test that get_top_selling_products() is served by an index"""
+        self.assert_uses_indexes(database.get_top_selling_products, 5, allow_sort=True)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,130 @@
+"""
+Unit Tests for the receipt store
+================================
+Run tests with: python -m pytest test_receipt_store.py -v
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import database
+from connection_pool import close_pool
+from receipt_store import ReceiptStore, content_hash
+from receipts import Receipt, ReceiptService, TextRenderer, EscPosRenderer
+
+ITEMS = ({"name": "Latte", "category": "Coffee", "price": 160.0, "quantity": 2},)
+
+
+def make_receipt(order_id=4, payment_method="Unpaid"):
+    return Receipt(order_id, "Walk-in", "Dine in", payment_method, 320.0, ITEMS, "2025-12-05 22:45:48",
+                   payment_label="Payment Status")
+
+
+class CountingRenderer(TextRenderer):
+    """TextRenderer that counts its renders"""
+
+    def __init__(self):
+        super().__init__()
+        self.renders = 0
+
+    def render(self, receipt):
+        self.renders += 1
+        return super().render(receipt)
+
+
+class TestReceiptStore(unittest.TestCase):
+    """Test cases for ReceiptStore against a scratch database and folder"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = database.DB_PATH
+        database.DB_PATH = os.path.join(self.temp_dir, "store.db")
+        self.store = ReceiptStore(os.path.join(self.temp_dir, "store"))
+        self.renderer = CountingRenderer()
+
+    def tearDown(self):
+        close_pool(database.DB_PATH)
+        database.DB_PATH = self.original_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def blobs(self):
+        return sorted(name for _, _, files in os.walk(self.store.folder) for name in files)
+
+    def test_default_folder_is_next_to_the_database(self):
+        """Test that the store lives next to the database file by default"""
+        self.assertEqual(ReceiptStore().folder, os.path.join(self.temp_dir, "receipt_store"))
+
+    def test_content_hash(self):
+        """Test that the hash follows the receipt's content and the renderer's layout"""
+        receipt = make_receipt()
+        self.assertEqual(content_hash(receipt, self.renderer), content_hash(make_receipt(), CountingRenderer()))
+        self.assertNotEqual(content_hash(receipt, self.renderer), content_hash(make_receipt(payment_method="Paid"), self.renderer))
+        self.assertNotEqual(content_hash(receipt, self.renderer), content_hash(receipt, TextRenderer(width=42)))
+        self.assertNotEqual(content_hash(receipt, self.renderer), content_hash(receipt, EscPosRenderer()))
+
+    def test_reprint_is_served_from_stored_bytes(self):
+        """Test that re-prints reuse the stored bytes and count prints"""
+        first, reused = self.store.get_or_render(make_receipt(), self.renderer)
+        self.assertFalse(reused)
+        for _ in range(3):
+            again, reused = self.store.get_or_render(make_receipt(), self.renderer)
+            self.assertTrue(reused)
+            self.assertEqual(again, first)
+        self.assertEqual(self.renderer.renders, 1)
+        [(fmt, _, blob, size, print_count, _, _)] = database.get_receipt_artifacts(4)
+        self.assertEqual((fmt, size, print_count), ("txt", len(first), 4))
+        self.assertEqual(self.blobs(), [blob])
+
+    def test_changed_order_gets_a_new_artifact(self):
+        """Test that a changed receipt is rendered and stored again"""
+        self.store.get_or_render(make_receipt(), self.renderer)
+        self.store.get_or_render(make_receipt(payment_method="Paid"), self.renderer)
+        self.assertEqual(self.renderer.renders, 2)
+        self.assertEqual(len(database.get_receipt_artifacts(4)), 2)
+        self.assertEqual(len(self.blobs()), 2)
+
+    def test_identical_bytes_are_kept_once(self):
+        """Test that identical renders share one blob"""
+        self.store.put(make_receipt(1), self.renderer, b"same bytes")
+        self.store.put(make_receipt(2), self.renderer, b"same bytes")
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_missing_blob_is_rendered_again(self):
+        """Test that a deleted blob is rendered again, counted as one print, not reported as missing"""
+        self.store.get_or_render(make_receipt(), self.renderer)
+        shutil.rmtree(self.store.folder)
+        data, reused = self.store.get_or_render(make_receipt(), self.renderer)
+        self.assertFalse(reused)
+        self.assertEqual(self.renderer.renders, 2)
+        [(_, _, _, _, print_count, _, _)] = database.get_receipt_artifacts(4)
+        self.assertEqual(print_count, 2)
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_rerender_with_new_bytes_drops_the_old_blob(self):
+        """Test that replacing an artifact's bytes removes the unreferenced old blob"""
+        self.store.put(make_receipt(), self.renderer, b"first render")
+        self.store.put(make_receipt(), self.renderer, b"second render")
+        self.assertEqual(len(self.blobs()), 1)
+        self.assertEqual(self.store.fetch(make_receipt(), self.renderer), b"second render")
+
+    def test_service_reprints_into_one_file(self):
+        """Test that ReceiptService re-prints write one file rendered once"""
+        folder = os.path.join(self.temp_dir, "saved")
+        service = ReceiptService(render=self.renderer, store=self.store)
+        paths = {service.submit(make_receipt(), folder).result(timeout=5) for _ in range(3)}
+        service.close()
+        self.assertEqual(len(paths), 1)
+        self.assertEqual(os.listdir(folder), [os.path.basename(paths.pop())])
+        self.assertEqual(self.renderer.renders, 1)
+        self.assertEqual(service.stats["reused"], 2)
+
+    def test_service_needs_a_renderer(self):
+        """Test that a store needs a ReceiptRenderer, not a plain function"""
+        with self.assertRaises(TypeError):
+            ReceiptService(render=lambda receipt, filepath: filepath, store=self.store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,334 @@
+"""
+Unit Tests for receipt rendering
+================================
+Run tests with: python -m pytest test_receipts.py -v
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from datetime import datetime
+
+import database
+from connection_pool import close_pool
+from receipts import (Receipt, ReceiptService, receipt_filename, render_pdf, receipt_from_order,
+                      export_receipts_zip, export_receipts_pdf, _FlowableStream,
+                      TextRenderer, EscPosRenderer, get_renderer)
+
+try:
+    import reportlab
+except ImportError:
+    reportlab = None
+
+ITEMS = (
+    {"name": "Latte", "category": "Coffee", "price": 160.0, "quantity": 2},
+    {"name": "Croissant", "category": "Pastry", "price": 0.1, "quantity": 3},
+)
+
+
+def make_receipt(order_id=7):
+    return Receipt(order_id, "Walk-in Customer", "Dine in", "Cash", 320.3, ITEMS, "2025-12-05 22:40:25")
+
+
+def write_text(receipt, filepath):
+    """Stand-in renderer: the order id, so tests can tell jobs apart"""
+    with open(filepath, "w") as f:
+        f.write(str(receipt.order_id))
+    return filepath
+
+
+def fake_pdf_bytes(receipt):
+    """Stand-in for render_pdf_bytes (module level so a process pool can pickle it)"""
+    if receipt.order_id < 0:
+        raise ValueError("bad receipt")
+    return f"receipt {receipt.order_id} {receipt.total:.2f}".encode()
+
+
+class TestReceipt(unittest.TestCase):
+    """Test cases for the Receipt record"""
+
+    def test_subtotal_is_exact(self):
+        """Test that the subtotal is summed in centavos without float drift"""
+        self.assertEqual(make_receipt().subtotal, 320.3)
+
+    def test_filename(self):
+        """Test the receipt file naming scheme"""
+        self.assertEqual(receipt_filename(12, "txt", datetime(2025, 12, 5, 22, 40, 25)),
+                         "receipt_order_12_20251205_224025.txt")
+
+
+class TestTextRenderers(unittest.TestCase):
+    """Test cases for the plain-text and ESC/POS renderers"""
+
+    def test_text_layout(self):
+        """Test that text receipts line up in 50 columns"""
+        lines = TextRenderer().render(make_receipt()).decode().splitlines()
+        self.assertEqual(lines[1].strip(), "☕ COFFEESTRY")
+        self.assertIn("  Payment: Cash", lines)
+        self.assertEqual(lines[14], "  Latte                       2   ₱160.00  ₱320.00")
+        self.assertEqual(lines[15], "  Croissant                   3     ₱0.10    ₱0.30")
+        self.assertIn("  TOTAL:                                   ₱320.30", lines)
+        self.assertTrue(all(len(line) <= 50 for line in lines))
+
+    def test_narrow_paper_truncates_names(self):
+        """Test that long item names are cut to fit narrow paper"""
+        receipt = Receipt(1, "Ana", "Dine in", "Cash", 95.0,
+                          ({"name": "Extra Large Caramel Macchiato", "category": "Coffee", "price": 95.0, "quantity": 1},),
+                          "2025-12-05 10:00:00")
+        lines = TextRenderer(width=32).render(receipt).decode().splitlines()
+        self.assertTrue(all(len(line) <= 32 for line in lines))
+        self.assertIn("  Extra  ", "\n".join(lines))
+
+    def test_escpos(self):
+        """Test that ESC/POS receipts are framed by reset and cut, in cp437"""
+        data = EscPosRenderer().render(make_receipt())
+        self.assertTrue(data.startswith(EscPosRenderer.RESET))
+        self.assertTrue(data.endswith(EscPosRenderer.FEED_AND_CUT))
+        self.assertIn(b"P320.30", data)
+        self.assertNotIn("₱".encode(), data)
+        data.decode("cp437")
+
+    def test_get_renderer(self):
+        """Test renderer lookup by name, with options and unknown names"""
+        self.assertEqual(get_renderer("text", width=42).width, 42)
+        self.assertEqual(get_renderer("escpos").extension, "bin")
+        with self.assertRaises(ValueError):
+            get_renderer("postscript")
+
+
+class TestReceiptService(unittest.TestCase):
+    """Test cases for the background ReceiptService"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_renders_every_job(self):
+        """Test that every submitted receipt is written once"""
+        service = ReceiptService(render=write_text, workers=3)
+        futures = [service.submit(make_receipt(i), self.folder, filename=f"{i}.txt") for i in range(50)]
+        paths = [future.result(timeout=5) for future in futures]
+        service.close()
+        for i, path in enumerate(paths):
+            with open(path) as f:
+                self.assertEqual(f.read(), str(i))
+        self.assertEqual(service.stats["completed"], 50)
+        self.assertEqual(service.stats["failed"], 0)
+
+    def test_submit_does_not_wait_for_rendering(self):
+        """Test that submit() returns before rendering finishes"""
+        release = threading.Event()
+
+        def slow(receipt, filepath):
+            release.wait(5)
+            return write_text(receipt, filepath)
+
+        service = ReceiptService(render=slow, workers=1)
+        start = time.perf_counter()
+        futures = [service.submit(make_receipt(i), self.folder, filename=f"{i}.txt") for i in range(5)]
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertFalse(any(future.done() for future in futures))
+        release.set()
+        service.close()
+        self.assertTrue(all(future.done() for future in futures))
+
+    def test_callback_gets_result_or_error(self):
+        """Test that on_done sees both successes and failures"""
+        def broken(receipt, filepath):
+            if receipt.order_id == 2:
+                raise OSError("disk full")
+            return write_text(receipt, filepath)
+
+        done = []
+        service = ReceiptService(render=broken)
+        for order_id in (1, 2):
+            service.submit(make_receipt(order_id), self.folder, on_done=done.append, filename=f"{order_id}.txt")
+        service.close()
+        outcomes = sorted((future.exception() is None, str(future.exception() or "")) for future in done)
+        self.assertEqual(outcomes, [(False, "disk full"), (True, "")])
+        self.assertEqual(service.stats["failed"], 1)
+
+    def test_renderer_names_the_file(self):
+        """Test that a ReceiptRenderer's extension names the file"""
+        service = ReceiptService(render=TextRenderer())
+        path = service.submit(make_receipt(), self.folder).result(timeout=5)
+        service.close()
+        self.assertTrue(path.endswith(".txt"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), TextRenderer().render(make_receipt()))
+
+    def test_closed_service_rejects_jobs(self):
+        """Test that submit() after close() raises"""
+        service = ReceiptService(render=write_text)
+        service.close()
+        with self.assertRaises(RuntimeError):
+            service.submit(make_receipt(), self.folder)
+
+    def test_close_during_submit_never_strands_a_job(self):
+        """Test that a job submit() accepts runs even if close() lands while submit() is naming the file"""
+        class ClosingRenderer:
+            # submit() reads extension while naming the file: close the service right then
+            @property
+            def extension(self):
+                service.close(wait=False)
+                return "txt"
+
+            def __call__(self, receipt, filepath):
+                return write_text(receipt, filepath)
+
+        service = ReceiptService(render=ClosingRenderer(), workers=1)
+        service.submit(make_receipt(1), self.folder, filename="1.txt").result(timeout=5)  # start the worker
+        try:
+            future = service.submit(make_receipt(2), self.folder)
+        except RuntimeError:
+            return  # refused outright is fine; accepted and never run is not
+        self.assertTrue(future.result(timeout=5).endswith(".txt"))
+
+    def test_process_pool(self):
+        """Test that jobs rendered in a process pool keep their own files"""
+        service = ReceiptService(render=write_text, workers=2, processes=2,
+                                 mp_context=multiprocessing.get_context("spawn"))
+        futures = [service.submit(make_receipt(i), self.folder, filename=f"{i}.txt") for i in range(6)]
+        self.assertEqual([os.path.basename(future.result(timeout=30)) for future in futures],
+                         [f"{i}.txt" for i in range(6)])
+        service.close()
+
+    @unittest.skipIf(reportlab is None, "reportlab is not installed")
+    def test_pdf(self):
+        """Test that the default renderer writes a PDF"""
+        service = ReceiptService()
+        path = service.submit(make_receipt(), self.folder).result(timeout=30)
+        service.close()
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(5), b"%PDF-")
+
+    @unittest.skipIf(reportlab is None, "reportlab is not installed")
+    def test_pdf_direct(self):
+        """Test rendering a PDF without the service"""
+        path = render_pdf(make_receipt(), os.path.join(self.folder, "direct.pdf"))
+        self.assertGreater(os.path.getsize(path), 0)
+
+
+class TestBatchExport(unittest.TestCase):
+    """Test cases for exporting many receipts to one file"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "receipts.zip")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def check_zip(self, count):
+        with zipfile.ZipFile(self.path) as archive:
+            self.assertEqual(archive.namelist(), [f"receipt_order_{i}.pdf" for i in range(count)])
+            self.assertEqual(archive.read("receipt_order_3.pdf"), b"receipt 3 320.30")
+
+    def test_zip_in_process(self):
+        """Test a ZIP export rendered in this process, with progress"""
+        progress = []
+        count = export_receipts_zip((make_receipt(i) for i in range(40)), self.path, processes=0,
+                                    render=fake_pdf_bytes, on_progress=progress.append)
+        self.assertEqual(count, 40)
+        self.assertEqual(progress, list(range(1, 41)))
+        self.check_zip(40)
+
+    def test_zip_in_process_pool_keeps_order(self):
+        """Test that a process-pool ZIP export keeps receipt order"""
+        count = export_receipts_zip((make_receipt(i) for i in range(100)), self.path, processes=2,
+                                    render=fake_pdf_bytes)
+        self.assertEqual(count, 100)
+        self.check_zip(100)
+
+    def test_zip_in_spawned_processes(self):
+        """Test a ZIP export whose render processes are spawned, as on Windows and macOS"""
+        count = export_receipts_zip((make_receipt(i) for i in range(40)), self.path, processes=2,
+                                    render=fake_pdf_bytes, mp_context=multiprocessing.get_context("spawn"))
+        self.assertEqual(count, 40)
+        self.check_zip(40)
+
+    def test_failed_export_leaves_no_file(self):
+        """Test that a failed export leaves no partial file behind"""
+        with self.assertRaises(ValueError):
+            export_receipts_zip([make_receipt(1), make_receipt(-1)], self.path, processes=0, render=fake_pdf_bytes)
+        self.assertEqual(os.listdir(self.folder), [])
+
+    def test_flowable_stream_refills_from_the_head(self):
+        """Test that the flowable stream pulls chunks only as build() needs them"""
+        consumed = []
+
+        def chunks():
+            for i in range(3):
+                consumed.append(i)
+                yield [f"{i}a", f"{i}b"]
+
+        stream = _FlowableStream(chunks())
+        seen = []
+        while len(stream):
+            seen.append(stream[0])
+            del stream[0]
+            # Never more than one chunk pulled ahead of what build() has taken
+            self.assertLessEqual(len(consumed), len(seen) // 2 + 1)
+        self.assertEqual(seen, ["0a", "0b", "1a", "1b", "2a", "2b"])
+
+    @unittest.skipIf(reportlab is None, "reportlab is not installed")
+    def test_pdf(self):
+        """Test a combined PDF export"""
+        path = os.path.join(self.folder, "receipts.pdf")
+        self.assertEqual(export_receipts_pdf((make_receipt(i) for i in range(5)), path), 5)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(5), b"%PDF-")
+
+
+class TestOrdersForReceipts(unittest.TestCase):
+    """Test iter_orders_for_receipts() against a scratch database"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = database.DB_PATH
+        database.DB_PATH = os.path.join(self.temp_dir, "export.db")
+        self.ids = []
+        for day in range(1, 8):
+            items = [{"name": "Latte", "category": "Coffee", "price": 160.0, "quantity": day}]
+            order_id = database.save_order(f"Customer {day}", "Dine in", 160.0 * day, items,
+                                           business_owner_id=1 if day != 4 else 2)
+            with database.connection() as conn:
+                conn.execute("UPDATE orders SET order_date = ? WHERE id = ?", (f"2025-12-0{day} 10:00:00", order_id))
+            self.ids.append(order_id)
+        database.cancel_order(self.ids[5])
+
+    def tearDown(self):
+        close_pool(database.DB_PATH)
+        database.DB_PATH = self.original_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_range_owner_and_paging(self):
+        """Test the date range, owner scope and cancelled orders across pages"""
+        orders = list(database.iter_orders_for_receipts(1, "2025-12-02", "2025-12-07", batch_size=2))
+        # Day 4 belongs to another owner, day 6 was cancelled; the end date is inclusive
+        self.assertEqual([order[0] for order, items in orders], [self.ids[i] for i in (1, 2, 4, 6)])
+        order, items = orders[1]
+        self.assertEqual(order[1:], ("Customer 3", "Dine in", 480.0, "2025-12-03 10:00:00", "paid"))
+        self.assertEqual(items, [("Latte", "Coffee", 160.0, 3)])
+
+    def test_all_owners(self):
+        """Test that no owner means every owner's orders"""
+        orders = list(database.iter_orders_for_receipts(None, "2025-12-01", "2025-12-31", batch_size=3))
+        self.assertEqual(len(orders), 6)
+
+    def test_receipt_from_order(self):
+        """Test building a Receipt from an exported order row"""
+        order, items = next(database.iter_orders_for_receipts(1, "2025-12-01", "2025-12-01"))
+        receipt = receipt_from_order(order, items)
+        self.assertEqual((receipt.order_id, receipt.payment_method, receipt.subtotal), (self.ids[0], "Paid", 160.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the route-based view router
+==========================================
+Run tests with: python -m pytest test_router.py -v
+"""
+
+import unittest
+
+from router import ViewRouter
+
+
+class Page:
+    """Stand-in for ft.Page: the route, on_route_change and go() the router uses, and a count of updates"""
+
+    def __init__(self):
+        self.route = "/"
+        self.on_route_change = None
+        self.updates = 0
+
+    def go(self, route):
+        self.route = route
+        self.on_route_change(RouteChange(route))
+
+    def update(self):
+        self.updates += 1
+
+
+class RouteChange:
+    def __init__(self, route):
+        self.route = route
+
+
+class Container:
+    def __init__(self):
+        self.content = None
+
+
+class TestViewRouter(unittest.TestCase):
+    """Test cases for ViewRouter"""
+
+    def setUp(self):
+        self.page = Page()
+        self.container = Container()
+        self.builds = []
+
+        def view(name):
+            def build():
+                self.builds.append(name)
+                # Like main.py's layouts: put the view in the container, don't return it
+                self.container.content = {"view": name, "build": len(self.builds)}
+            return build
+
+        self.views = ViewRouter(self.page, self.container, {
+            "/pos": view("pos"),
+            "/orders": view("orders"),
+            "/customers": view("customers"),
+        }, depends={"/orders": {"orders"}, "/customers": {"customers", "orders"}})
+
+    def test_attach_shows_first_route(self):
+        """Test that attach() takes over route changes and shows the default view"""
+        self.views.attach()
+        self.assertEqual(self.page.on_route_change, self.views._route_changed)
+        self.assertEqual(self.page.route, "/pos")
+        self.assertEqual(self.container.content["view"], "pos")
+
+    def test_views_are_built_on_first_visit_only(self):
+        """Test that going back to a tab reuses its controls instead of building them again"""
+        self.views.attach("/pos")
+        pos = self.container.content
+        self.views.go("/orders")
+        self.views.go("/pos")
+        self.views.go("/orders")
+        self.assertEqual(self.builds, ["pos", "orders"])
+        self.assertEqual(self.container.content["view"], "orders")
+        self.views.go("/pos")
+        self.assertIs(self.container.content, pos)
+        self.assertEqual(self.views.stats, {"built": 2, "reused": 3})
+
+    def test_keeps_view_as_last_shown(self):
+        """Test that a view redrawn in place (search, refresh) is the one shown on return"""
+        self.views.attach("/orders")
+        redrawn = {"view": "orders", "search": "latte"}
+        self.container.content = redrawn
+        self.views.go("/pos")
+        self.views.go("/orders")
+        self.assertIs(self.container.content, redrawn)
+
+    def test_going_to_current_route_keeps_it(self):
+        """Test that clicking the active tab neither rebuilds it nor needs a route change"""
+        self.views.attach("/pos")
+        self.views.go("/pos")
+        self.assertEqual(self.builds, ["pos"])
+        self.assertEqual(self.views.stats["reused"], 1)
+
+    def test_changed_rebuilds_dependent_views(self):
+        """Test that a write rebuilds the views showing its data on their next visit, and only those"""
+        self.views.attach("/orders")
+        self.views.go("/customers")
+        self.views.go("/pos")
+        self.views.changed("customers")
+        self.views.go("/orders")
+        self.views.go("/customers")
+        self.assertEqual(self.builds, ["orders", "customers", "pos", "customers"])
+        self.assertEqual(self.container.content["build"], 4)
+
+    def test_changed_leaves_current_view(self):
+        """Test that the view making the write keeps its redrawn controls"""
+        self.views.attach("/orders")
+        self.views.go("/customers")
+        self.views.changed("orders")  # e.g. an order cancelled from the customers view
+        redrawn = self.container.content
+        self.views.go("/orders")
+        self.views.go("/customers")
+        self.assertEqual(self.builds, ["orders", "customers", "orders"])
+        self.assertIs(self.container.content, redrawn)
+
+    def test_returned_view_goes_in_container(self):
+        """Test that a view function may return its root control instead"""
+        views = ViewRouter(self.page, self.container, {"/menu": lambda: "menu"})
+        updates = self.page.updates
+        views.attach()
+        self.assertEqual(self.container.content, "menu")
+        self.assertEqual(self.page.updates, updates + 1)
+
+    def test_ignores_other_routes(self):
+        """Test that unknown routes are rejected by go() and ignored from the page"""
+        self.views.attach("/pos")
+        with self.assertRaises(KeyError):
+            self.views.go("/admin")
+        self.page.on_route_change(RouteChange("/admin"))
+        self.assertEqual(self.views.current, "/pos")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Unit Tests for the keyed table row cache
+=========================================
+Run tests with: python -m pytest test_row_cache.py -v
+"""
+
+import unittest
+
+from row_cache import KeyedRowCache
+
+
+class Row:
+    """Stand-in for a table row control: just the visible flag arrange() touches"""
+
+    def __init__(self, item):
+        self.item = item
+        self.visible = None
+
+
+CATALOG = [(1, "Latte"), (2, "Mocha"), (3, "Cappuccino")]
+
+
+class TestKeyedRowCache(unittest.TestCase):
+    """Test cases for KeyedRowCache"""
+
+    def setUp(self):
+        self.cache = KeyedRowCache(Row, key=lambda item: item)
+
+    def items(self, rows, visible=True):
+        return [row.item for row in rows if (row.visible is not False) == visible]
+
+    def test_rows_are_built_once(self):
+        """Test that filtering reuses the rows built for the catalog"""
+        first = self.cache.arrange(CATALOG, CATALOG)
+        second = self.cache.arrange(CATALOG, CATALOG[:1])
+        self.assertEqual(self.cache.stats["built"], 3)
+        self.assertEqual({id(row) for row in first}, {id(row) for row in second})
+
+    def test_matches_first_in_result_order(self):
+        """Test that matches lead in result order and the rest are hidden"""
+        rows = self.cache.arrange(CATALOG, [CATALOG[2], CATALOG[0]])
+        self.assertEqual(self.items(rows), [CATALOG[2], CATALOG[0]])
+        self.assertEqual(self.items(rows, visible=False), [CATALOG[1]])
+        self.assertEqual([row.item for row in rows][:2], [CATALOG[2], CATALOG[0]])
+
+    def test_unhidden_rows_become_visible_again(self):
+        """Test that clearing the filter shows hidden rows again"""
+        self.cache.arrange(CATALOG, [])
+        rows = self.cache.arrange(CATALOG, CATALOG)
+        self.assertTrue(all(row.visible for row in rows))
+
+    def test_untouched_rows_keep_default_visibility(self):
+        """Test that rows never hidden are left alone (no flag change to send)"""
+        rows = self.cache.arrange(CATALOG, CATALOG)
+        self.assertTrue(all(row.visible is None for row in rows))
+
+    def test_edited_item_gets_a_new_row(self):
+        """Test that a changed item is rebuilt and its old row released"""
+        self.cache.arrange(CATALOG, CATALOG)
+        edited = [(1, "Iced Latte")] + CATALOG[1:]
+        rows = self.cache.arrange(edited, edited)
+        self.assertEqual(rows[0].item, (1, "Iced Latte"))
+        self.assertEqual(self.cache.stats["built"], 4)
+        self.assertEqual(self.cache.stats["dropped"], 1)
+        self.assertEqual(len(self.cache), 3)
+
+    def test_matches_outside_catalog_are_ignored(self):
+        """Test that a stale match for a deleted item is skipped"""
+        rows = self.cache.arrange(CATALOG[:2], [(3, "Cappuccino"), (1, "Latte")])
+        self.assertEqual(self.items(rows), [CATALOG[0]])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,123 @@
+"""
+Unit Tests for the daily sales rollups
+=======================================
+Run tests with: python -m pytest test_sales_rollup.py -v
+"""
+
+import unittest
+import sqlite3
+import os
+import tempfile
+import shutil
+
+import database
+from connection_pool import close_pool
+from migrations import run_migrations
+
+
+class TestSalesRollups(unittest.TestCase):
+    """Test cases for daily_sales / daily_product_sales against a scratch database"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = database.DB_PATH
+        database.DB_PATH = os.path.join(self.temp_dir, "rollup.db")
+        self.items = [
+            {"name": "Espresso", "category": "Coffee", "price": 90.0, "quantity": 2},
+            {"name": "Croissant", "category": "Pastry", "price": 75.5, "quantity": 1},
+        ]
+        self.total = 255.5
+
+    def tearDown(self):
+        close_pool(database.DB_PATH)
+        database.DB_PATH = self.original_path
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def assertRollupsConsistent(self):
+        self.assertEqual(database.check_sales_rollups(), [])
+
+    def test_save_order_updates_rollups(self):
+        """Test that saved orders show up in the totals and top products"""
+        database.save_order("Walk-in", "Dine in", self.total, self.items, business_owner_id=1)
+        database.save_order("Walk-in", "Take out", self.total, self.items, business_owner_id=1)
+        self.assertAlmostEqual(database.get_total_sales(), self.total * 2)
+        self.assertEqual(database.get_total_orders(), 2)
+        top = dict((name, sold) for name, sold, _ in database.get_top_selling_products())
+        self.assertEqual(top, {"Espresso": 4, "Croissant": 2})
+        self.assertRollupsConsistent()
+
+    def test_status_and_payment_changes_move_rollups(self):
+        """Test that paying and cancelling an order moves it between rollup rows"""
+        order_id = database.place_customer_order(5, "Customer", 1, "Take out", self.total, self.items)
+        self.assertEqual(database.get_total_sales(), 0)
+        self.assertEqual(database.get_top_selling_products(), [])
+
+        database.mark_order_paid(order_id)
+        self.assertAlmostEqual(database.get_total_sales(), self.total)
+        self.assertEqual(len(database.get_top_selling_products()), 2)
+
+        database.cancel_order(order_id)
+        self.assertEqual(dict(database.get_order_status_distribution()), {"cancelled": 1})
+        self.assertRollupsConsistent()
+
+    def test_delete_removes_rollup_rows(self):
+        """Test that deleting orders and items leaves no empty rollup rows behind"""
+        order_id = database.save_order("Walk-in", "Dine in", self.total, self.items)
+        conn = database.get_connection()
+        conn.execute("DELETE FROM order_items WHERE order_id = ?", (order_id,))
+        conn.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+        conn.commit()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM daily_sales").fetchone()[0], 0)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM daily_product_sales").fetchone()[0], 0)
+        conn.close()
+        self.assertRollupsConsistent()
+
+    def test_backdated_orders_group_by_day(self):
+        """Test that bulk-imported history lands on its own days"""
+        database.save_orders([
+            {"customer_name": "Import", "order_type": "Dine in", "total": 100.0,
+             "items": [], "order_date": "2000-01-15 09:00:00", "payment_status": "paid"},
+            {"customer_name": "Import", "order_type": "Dine in", "total": 50.0,
+             "items": [], "order_date": "2000-01-15 17:30:00", "payment_status": "paid"},
+            {"customer_name": "Import", "order_type": "Dine in", "total": 20.0,
+             "items": [], "order_date": "2000-02-01 12:00:00", "payment_status": "paid"},
+        ])
+        conn = database.get_connection()
+        rows = conn.execute("SELECT day, order_count, revenue FROM daily_sales ORDER BY day").fetchall()
+        conn.close()
+        # Revenue is stored in centavos
+        self.assertEqual(rows, [("2000-01-15", 2, 15000), ("2000-02-01", 1, 2000)])
+
+    def test_check_detects_and_repairs_drift(self):
+        """Test that check_sales_rollups reports drift and repair=True rebuilds"""
+        database.save_order("Walk-in", "Dine in", self.total, self.items)
+        conn = database.get_connection()
+        conn.execute("UPDATE daily_sales SET revenue = revenue + 1")
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(len(database.check_sales_rollups(repair=True)), 1)
+        self.assertRollupsConsistent()
+
+    def test_migration_backfills_existing_orders(self):
+        """Test that upgrading a version-3 database fills the rollups from existing orders"""
+        conn = sqlite3.connect(database.DB_PATH)
+        run_migrations(conn, database.MIGRATIONS[:3])
+        order_id = conn.execute(
+            "INSERT INTO orders (customer_name, order_type, total, status, payment_status) VALUES (?, ?, ?, ?, ?)",
+            ("Walk-in", "Dine in", self.total, "confirmed", "paid"),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO order_items (order_id, product_name, category, price, quantity) VALUES (?, ?, ?, ?, ?)",
+            [(order_id, item["name"], item["category"], item["price"], item["quantity"]) for item in self.items],
+        )
+        conn.commit()
+        conn.close()
+
+        database.init_db()
+        self.assertAlmostEqual(database.get_total_sales(), self.total)
+        self.assertRollupsConsistent()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+"""
+Unit Tests for the debounced search pipeline
+=============================================
+Run tests with: python -m pytest test_search_pipeline.py -v
+"""
+
+import threading
+import unittest
+
+from search_pipeline import DebouncedSearch
+
+
+class TestDebouncedSearch(unittest.TestCase):
+    """Test cases for DebouncedSearch"""
+
+    def setUp(self):
+        self.searched = []
+        self.rendered = []
+        self.search = DebouncedSearch(self.find, self.rendered.append, delay=60)
+
+    def find(self, query):
+        self.searched.append(query)
+        return [word for word in ("latte", "lemonade", "mocha") if word.startswith(query)]
+
+    def test_burst_runs_once(self):
+        """Test that a burst of keystrokes runs only the last query"""
+        for query in ("l", "la", "lat"):
+            self.search.submit(query)
+        self.search.flush()
+        self.assertEqual(self.searched, ["lat"])
+        self.assertEqual(self.rendered, [["latte"]])
+        self.assertEqual(self.search.stats["keystrokes"], 3)
+
+    def test_timer_fires_after_delay(self):
+        """Test that the search runs on its own once typing stops"""
+        done = threading.Event()
+        search = DebouncedSearch(self.find, lambda results: done.set(), delay=0.01)
+        search.submit("m")
+        self.assertTrue(done.wait(2))
+        self.assertEqual(self.searched, ["m"])
+
+    def test_unchanged_results_are_not_rendered(self):
+        """Test that a query with the same results as on screen skips the render"""
+        self.search.submit("lat")
+        self.search.flush()
+        self.search.submit("latt")
+        self.search.flush()
+        self.assertEqual(self.rendered, [["latte"]])
+        self.assertEqual(self.search.stats["unchanged"], 1)
+        self.search.invalidate()
+        self.search.submit("latt")
+        self.search.flush()
+        self.assertEqual(len(self.rendered), 2)
+
+    def test_stale_search_is_dropped(self):
+        """Test that a search overtaken by a newer keystroke never renders"""
+        def slow_run(query):
+            if query == "l":
+                search.submit("m")   # the user kept typing while this ran
+            return self.find(query)
+
+        search = DebouncedSearch(slow_run, self.rendered.append, delay=60)
+        search.submit("l")
+        search.flush()
+        self.assertEqual(self.rendered, [])
+        self.assertEqual(search.stats["stale"], 1)
+        search.flush()
+        self.assertEqual(self.rendered, [["mocha"]])
+
+    def test_latency_counts_every_keystroke(self):
+        """Test that each keystroke's latency runs until its burst is on screen"""
+        now = [0.0]
+        search = DebouncedSearch(self.find, self.rendered.append, delay=60, clock=lambda: now[0])
+        search.submit("l")
+        now[0] = 0.1
+        search.submit("la")
+        now[0] = 0.25
+        search.flush()
+        stats = search.latency_stats()
+        self.assertEqual(stats["count"], 2)
+        self.assertAlmostEqual(stats["max_ms"], 250.0)
+        self.assertAlmostEqual(stats["p50_ms"], 250.0)
+
+    def test_flush_without_pending_does_nothing(self):
+        """Test that flush() with nothing queued runs no search"""
+        self.search.flush()
+        self.assertEqual(self.searched, [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)